@@ -1,28 +1,129 @@
-from typing import List, Dict, Any
+from __future__ import annotations
+
 import time
+from collections import deque
+from typing import Any, Deque, Dict, List
+
+from pocket_ai.core.privacy import scrub_text
+
+# Prompt budget for conversation history when the caller does not pass one.
+DEFAULT_CONTEXT_TOKENS = 512
+SUMMARY_SNIPPET_CHARS = 80
+MAX_SUMMARY_TOKENS = 128
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English BPE vocabularies).
+    """
+    return max(1, (len(text) + 3) // 4)
+
+
+class Turn:
+    __slots__ = ("timestamp", "user", "agent", "intent", "tokens")
+
+    def __init__(self, user: str, agent: str, intent: Dict[str, Any]):
+        self.timestamp = time.time()
+        # Stored scrubbed: turns (and the summary built from them) are replayed
+        # to cloud models as context.
+        self.user = scrub_text(user)
+        self.agent = scrub_text(agent)
+        self.intent = intent
+        # Counted once here so budgeting never re-measures the text.
+        self.tokens = estimate_tokens(self.user) + estimate_tokens(self.agent)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"timestamp": self.timestamp, "user": self.user, "agent": self.agent, "intent": self.intent}
+
+    def messages(self) -> List[Dict[str, str]]:
+        return [{"role": "user", "content": self.user}, {"role": "assistant", "content": self.agent}]
+
 
 class ContextManager:
-    def __init__(self, max_turns: int = 10):
-        self.history: List[Dict[str, Any]] = []
+    """
+    Recent conversation turns, bounded by turn count and by a token budget.
+
+    Evicted turns are folded into a short rolling summary, so older context is
+    compressed rather than dropped outright. ``context_window()`` returns
+    prompt-ready messages that fit a caller's budget.
+    """
+
+    def __init__(self, max_turns: int = 10, max_tokens: int = 2048):
         self.max_turns = max_turns
+        self.max_tokens = max_tokens
+        self._turns: Deque[Turn] = deque()
+        self._total_tokens = 0
+        self._summary: Deque[str] = deque()
+        self._summary_tokens = 0
 
     def add_turn(self, user_input: str, agent_response: str, intent: Dict[str, Any]):
-        turn = {
-            "timestamp": time.time(),
-            "user": user_input,
-            "agent": agent_response,
-            "intent": intent
-        }
-        self.history.append(turn)
-        if len(self.history) > self.max_turns:
-            self.history.pop(0)
+        turn = Turn(user_input, agent_response, intent)
+        self._turns.append(turn)
+        self._total_tokens += turn.tokens
+        while self._turns and (len(self._turns) > self.max_turns or self._total_tokens > self.max_tokens):
+            self._evict()
+
+    def _evict(self):
+        turn = self._turns.popleft()
+        self._total_tokens -= turn.tokens
+        snippet = " ".join(turn.user.split())[:SUMMARY_SNIPPET_CHARS]
+        line = f"{turn.intent.get('type', 'unknown')}: {snippet}"
+        self._summary.append(line)
+        self._summary_tokens += estimate_tokens(line)
+        while len(self._summary) > 1 and self._summary_tokens > MAX_SUMMARY_TOKENS:
+            self._summary_tokens -= estimate_tokens(self._summary.popleft())
+
+    @property
+    def summary(self) -> str:
+        return "; ".join(self._summary)
+
+    @property
+    def total_tokens(self) -> int:
+        return self._total_tokens
+
+    def context_window(self, budget_tokens: int = DEFAULT_CONTEXT_TOKENS) -> List[Dict[str, str]]:
+        """
+        Newest turns that fit ``budget_tokens``, oldest first, preceded by the
+        rolling summary when there is room. Cost is O(turns returned).
+        """
+        selected: List[Turn] = []
+        remaining = budget_tokens
+        for turn in reversed(self._turns):
+            if turn.tokens > remaining:
+                break
+            selected.append(turn)
+            remaining -= turn.tokens
+
+        messages: List[Dict[str, str]] = []
+        summary = self.summary
+        if summary:
+            summary_message = f"Earlier in this conversation: {summary}"
+            if estimate_tokens(summary_message) <= remaining:
+                messages.append({"role": "system", "content": summary_message})
+        for turn in reversed(selected):
+            messages.extend(turn.messages())
+        return messages
 
     def get_context(self) -> List[Dict[str, Any]]:
-        return self.history
+        return [turn.as_dict() for turn in self._turns]
 
     def get_last_intent(self) -> Dict[str, Any]:
-        if not self.history:
+        if not self._turns:
             return {}
-        return self.history[-1].get("intent", {})
+        return self._turns[-1].intent or {}
+
+    def clear(self):
+        self._turns.clear()
+        self._total_tokens = 0
+        self._summary.clear()
+        self._summary_tokens = 0
+
+
+def render_prompt(messages: List[Dict[str, str]]) -> str:
+    """
+    Flatten chat messages into a plain prompt for completion-style local models.
+    """
+    return "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+
 
 context_manager = ContextManager()
@@ -1,5 +1,6 @@
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 from pocket_ai.core.logger import logger
+from pocket_ai.core.model_manager import ModelSpec, loader_for_path, model_manager
 from pocket_ai.ai.local_llm import local_llm
 try:
     from pocket_ai.vision.vision_offline import vision_offline
@@ -7,14 +8,26 @@ except ImportError:
     vision_offline = None
 
 class LocalInference:
-    def __init__(self):
-        self.models = {}
+    """
+    Runs local models by name. Loading, idle unloading and the memory budget
+    are handled by ``model_manager``; models load lazily on first inference.
+    """
 
-    def load_model(self, model_name: str, model_path: str):
+    def load_model(self, model_name: str, model_path: Optional[str] = None) -> float:
+        """
+        Preload ``model_name`` (registering ``model_path`` if the model is not
+        known yet). Returns the load time in ms, 0 if it was already resident.
+        """
+        if model_path and not model_manager.is_registered(model_name):
+            model_manager.register(ModelSpec(model_name, model_path, loader=loader_for_path(model_path)))
         logger.info(f"Loading local model: {model_name}")
-        # In a real scenario, we might pre-load models here.
-        # For now, LocalLLM and VisionOffline handle their own lazy loading.
-        self.models[model_name] = "ready"
+        return model_manager.load(model_name)
+
+    def unload_model(self, model_name: str) -> bool:
+        return model_manager.unload(model_name)
+
+    def model_state(self) -> Dict[str, Any]:
+        return model_manager.snapshot()
 
     def run_inference(self, model_name: str, input_data: Any) -> Any:
         logger.debug(f"Running inference on {model_name}")
@@ -0,0 +1,157 @@
+"""
+Offline intent classifier: the NLU tier between the keyword grammar and the
+LLM fallback.
+
+Utterances are featurised as signed, hashed character n-grams and scored by a
+softmax-regression model trained at first use from ``intent_examples.yaml``
+(a few hundred milliseconds, no model files). Scoring is one matrix product,
+so a batch of utterances costs about the same as one. Predictions below the
+configured confidence threshold stay ``unknown`` and still go to the LLM.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np  # type: ignore[import]
+import yaml
+
+from pocket_ai.core.config import IntentClassifierConfig, get_config
+from pocket_ai.core.logger import logger
+
+
+DEFAULT_EXAMPLES = Path(__file__).resolve().parent / "intent_examples.yaml"
+UNKNOWN = "unknown"
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+class CharNgramHasher:
+    """
+    Signed feature hashing of character n-grams over the space-padded,
+    word-normalised utterance (crc32, so features are stable across runs).
+    """
+
+    def __init__(self, dim: int = 8192, ngram_range: Tuple[int, int] = (3, 5)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        low, high = self.ngram_range
+        for row, text in enumerate(texts):
+            padded = f" {' '.join(TOKEN_RE.findall(text.lower()))} "
+            hashes = np.fromiter(
+                (
+                    zlib.crc32(padded[i:i + n].encode("utf-8"))
+                    for n in range(low, high + 1)
+                    for i in range(len(padded) - n + 1)
+                ),
+                dtype=np.uint32,
+            )
+            if not hashes.size:
+                continue
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], hashes % self.dim, signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    return scores / scores.sum(axis=1, keepdims=True)
+
+
+class IntentClassifier:
+    def __init__(
+        self,
+        examples_path: Optional[str] = None,
+        hasher: Optional[CharNgramHasher] = None,
+        epochs: int = 500,
+        learning_rate: float = 5.0,
+        l2: float = 1e-4,
+    ):
+        self.examples_path = Path(examples_path) if examples_path else None
+        self.hasher = hasher or CharNgramHasher()
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.labels: List[str] = []
+        self._weights: Optional[np.ndarray] = None
+        self._bias: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self) -> IntentClassifierConfig:
+        return get_config().intent_classifier
+
+    @property
+    def trained(self) -> bool:
+        return self._weights is not None
+
+    def load_examples(self) -> Dict[str, List[str]]:
+        path = self.examples_path or Path(self.settings.examples_path or DEFAULT_EXAMPLES)
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        return {intent: [str(text) for text in texts or []] for intent, texts in (data.get("intents") or {}).items()}
+
+    def fit(self, examples: Dict[str, List[str]]):
+        """
+        Full-batch gradient descent on the softmax cross-entropy. Deterministic:
+        weights start at zero and there is no sampling.
+        """
+        labels = sorted(examples)
+        texts = [text for label in labels for text in examples[label]]
+        targets = np.array([index for index, label in enumerate(labels) for _ in examples[label]])
+        if len(labels) < 2 or not texts:
+            raise ValueError("Intent classifier needs examples for at least two intents")
+
+        features = self.hasher.transform(texts)
+        one_hot = np.eye(len(labels), dtype=np.float32)[targets]
+        weights = np.zeros((features.shape[1], len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        scale = self.learning_rate / len(texts)
+        for _ in range(self.epochs):
+            error = _softmax(features @ weights + bias) - one_hot
+            weights -= scale * (features.T @ error) + self.learning_rate * self.l2 * weights
+            bias -= scale * error.sum(axis=0)
+
+        with self._lock:
+            self.labels = labels
+            self._weights, self._bias = weights, bias
+        logger.info(f"Intent classifier trained on {len(texts)} examples across {len(labels)} intents")
+
+    def ensure_trained(self):
+        if self._weights is None:
+            with self._lock:
+                if self._weights is not None:
+                    return
+            self.fit(self.load_examples())
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        self.ensure_trained()
+        return _softmax(self.hasher.transform(texts) @ self._weights + self._bias)
+
+    def predict(self, texts: Sequence[str], threshold: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        ``(intent, confidence)`` per text; ``unknown`` when the best class is
+        below ``threshold`` (the configured one by default).
+        """
+        if not texts:
+            return []
+        threshold = self.settings.threshold if threshold is None else threshold
+        probabilities = self.predict_proba(texts)
+        best = probabilities.argmax(axis=1)
+        results = []
+        for row, index in enumerate(best):
+            confidence = float(probabilities[row, index])
+            label = self.labels[index]
+            results.append((label if confidence >= threshold else UNKNOWN, confidence))
+        return results
+
+
+intent_classifier = IntentClassifier()
@@ -0,0 +1,264 @@
+"""
+Continuous-batching scheduler for local LLM generation.
+
+Concurrent requests (UI fallback, easy tools, MCP) share one decode loop
+instead of queueing for the model one prompt at a time. Each loop iteration
+admits waiting requests into the running batch, advances every active
+sequence by one token in a single backend step, and retires sequences that
+hit end-of-text, their ``max_tokens`` or were cancelled; the freed slots
+are refilled on the very next step.
+
+The runtime is pluggable through ``DecodeBackend``. The loop runs on the
+``llm`` compute pool, so it never overlaps other work on the same model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+from pocket_ai.core.admission import AdmissionRejected
+from pocket_ai.core.config import LLMSchedulerConfig, get_config
+from pocket_ai.core.executors import ComputeExecutors, compute_executors
+from pocket_ai.core.logger import logger
+from pocket_ai.core.tracing import tracer
+
+
+_DONE = object()
+
+
+class DecodeBackend:
+    """
+    A runtime that can advance many sequences per step. ``step`` returns the
+    next token for each sequence, or ``None`` for one that has finished.
+    """
+
+    def start(self, prompt: str) -> Any:
+        raise NotImplementedError
+
+    def step(self, sequences: List[Any]) -> List[Optional[str]]:
+        raise NotImplementedError
+
+    def stop(self, sequence: Any):
+        pass
+
+    def batch_limit(self) -> Optional[int]:
+        """
+        Most sequences the runtime can hold at once (``None``: no own limit).
+        """
+        return None
+
+
+class GeneratorBackend(DecodeBackend):
+    """
+    Adapts a per-prompt token generator: each step pulls one token from
+    every active generator. Runtimes with a single KV context must report a
+    ``batch_limit`` of 1 so their generators are never interleaved.
+    """
+
+    def __init__(self, factory: Callable[[str], Iterator[str]], batch_limit: Callable[[], Optional[int]] = lambda: None):
+        self.factory = factory
+        self._batch_limit = batch_limit
+
+    def start(self, prompt: str) -> Iterator[str]:
+        return iter(self.factory(prompt))
+
+    def step(self, sequences: List[Iterator[str]]) -> List[Optional[str]]:
+        return [next(sequence, None) for sequence in sequences]
+
+    def stop(self, sequence: Iterator[str]):
+        close = getattr(sequence, "close", None)
+        if close is not None:
+            close()
+
+    def batch_limit(self) -> Optional[int]:
+        return self._batch_limit()
+
+
+class _Request:
+    __slots__ = (
+        "prompt", "max_tokens", "loop", "queue", "submitted_at", "admitted_at",
+        "sequence", "generated", "cancelled",
+    )
+
+    def __init__(self, prompt: str, max_tokens: int, loop: asyncio.AbstractEventLoop):
+        self.prompt = prompt
+        self.max_tokens = max_tokens
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.submitted_at = time.perf_counter()
+        self.admitted_at: Optional[float] = None
+        self.sequence: Any = None
+        self.generated = 0
+        self.cancelled = False
+
+    def deliver(self, item: Any):
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, item)
+        except RuntimeError:  # the caller's loop is gone
+            self.cancelled = True
+
+
+class LLMScheduler:
+    def __init__(self, backend: DecodeBackend, executors: ComputeExecutors = compute_executors):
+        self.backend = backend
+        self.executors = executors
+        self._pending: Deque[_Request] = deque()
+        self._active_count = 0
+        self._running = False
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.steps = 0
+        self.tokens = 0
+        self._batched = 0
+        self._busy_s = 0.0
+        self.peak_batch = 0
+
+    @property
+    def settings(self) -> LLMSchedulerConfig:
+        return get_config().llm_scheduler
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Yield this request's tokens as the shared decode loop produces them.
+        Closing the iterator (or cancelling the consumer) frees its batch slot.
+        """
+        request = self._enqueue(prompt, max_tokens or self.settings.max_new_tokens)
+        try:
+            while True:
+                item = await request.queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            request.cancelled = True
+
+    async def generate(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        return "".join([token async for token in self.stream(prompt, max_tokens)])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "active": self._active_count,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "steps": self.steps,
+            "tokens": self.tokens,
+            "avg_batch_size": round(self._batched / self.steps, 2) if self.steps else 0.0,
+            "peak_batch_size": self.peak_batch,
+            "tokens_per_s": round(self.tokens / self._busy_s, 1) if self._busy_s else 0.0,
+        }
+
+    def _enqueue(self, prompt: str, max_tokens: int) -> _Request:
+        request = _Request(prompt, max_tokens, asyncio.get_running_loop())
+        with self._lock:
+            if len(self._pending) >= self.settings.max_pending:
+                raise AdmissionRejected("llm", "generation queue full", retry_after=1.0)
+            self._pending.append(request)
+            start = not self._running
+            self._running = True
+        if start:
+            self.executors.submit("llm", self._decode_loop)
+        return request
+
+    def _batch_size(self) -> int:
+        limit = self.backend.batch_limit()
+        size = self.settings.max_batch_size
+        return max(1, size if limit is None else min(size, limit))
+
+    def _decode_loop(self):
+        active: List[_Request] = []
+        try:
+            while True:
+                admitted: List[_Request] = []
+                with self._lock:
+                    capacity = self._batch_size() - len(active)
+                    while self._pending and len(admitted) < capacity:
+                        admitted.append(self._pending.popleft())
+                    if not active and not admitted:
+                        self._running = False
+                        self._active_count = 0
+                        return
+                for request in admitted:
+                    if self._admit(request):
+                        active.append(request)
+                active = self._step([request for request in active if not self._dropped(request)])
+                self._active_count = len(active)
+        except BaseException as exc:
+            logger.error(f"LLM decode loop crashed: {exc}")
+            with self._lock:
+                stranded = active + list(self._pending)
+                self._pending.clear()
+                self._running = False
+                self._active_count = 0
+            for request in stranded:
+                self._fail(request, exc)
+            raise
+
+    def _admit(self, request: _Request) -> bool:
+        if request.cancelled:
+            self.cancelled += 1
+            return False
+        request.admitted_at = time.perf_counter()
+        tracer.record("llm_queue_wait", (request.admitted_at - request.submitted_at) * 1000)
+        try:
+            request.sequence = self.backend.start(request.prompt)
+        except Exception as exc:
+            self._fail(request, exc)
+            return False
+        return True
+
+    def _dropped(self, request: _Request) -> bool:
+        if not request.cancelled:
+            return False
+        self.backend.stop(request.sequence)
+        self.cancelled += 1
+        return True
+
+    def _step(self, active: List[_Request]) -> List[_Request]:
+        if not active:
+            return active
+        start = time.perf_counter()
+        try:
+            outputs = self.backend.step([request.sequence for request in active])
+        except Exception as exc:
+            for request in active:
+                self.backend.stop(request.sequence)
+                self._fail(request, exc)
+            return []
+        self._busy_s += time.perf_counter() - start
+        self.steps += 1
+        self._batched += len(active)
+        self.peak_batch = max(self.peak_batch, len(active))
+
+        running = []
+        for request, token in zip(active, outputs):
+            if token is not None:
+                request.generated += 1
+                self.tokens += 1
+                request.deliver(token)
+            if token is None or request.generated >= request.max_tokens:
+                self._finish(request)
+            else:
+                running.append(request)
+        return running
+
+    def _finish(self, request: _Request):
+        self.backend.stop(request.sequence)
+        self.completed += 1
+        tracer.record("llm_request", (time.perf_counter() - request.submitted_at) * 1000)
+        request.deliver(_DONE)
+
+    def _fail(self, request: _Request, exc: BaseException):
+        self.failed += 1
+        request.deliver(exc if isinstance(exc, Exception) else RuntimeError(str(exc)))
@@ -1,23 +1,127 @@
-from typing import Optional
+import importlib.util
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from pocket_ai.ai.llm_scheduler import GeneratorBackend, LLMScheduler
+from pocket_ai.ai.prefix_cache import prefix_cache
+from pocket_ai.ai.streaming import stub_tokens
+from pocket_ai.core.config import get_config
 from pocket_ai.core.logger import logger
 from pocket_ai.core.compute_backends import compute_backends, BackendType
+from pocket_ai.core.executors import compute_executors
+from pocket_ai.core.model_manager import MappedModel, ModelSpec, ModelUnavailable, load_gguf, model_manager
+
+LLM_WEIGHTS = "phi-2.Q4_K_M.gguf"
+MAX_NEW_TOKENS = 256
 
 class LocalLLM:
     def __init__(self):
-        self.model_loaded = False
-        # In a real implementation, we would load llama_cpp here
-        # self.llm = Llama(model_path="models/phi-2.gguf")
+        self.model_name = "phi-2"
+        # Loaded (memory-mapped) on first generate(), unloaded when idle or
+        # when another model needs the RAM; see core/model_manager.py.
+        model_manager.register(
+            ModelSpec(
+                self.model_name,
+                LLM_WEIGHTS,
+                loader=load_gguf,
+                unloader=self._unload,
+                workload="llm",
+                warmup=self._warm_up,
+            )
+        )
+        self._has_llama_cpp = importlib.util.find_spec("llama_cpp") is not None
+        # Concurrent stream() calls share one decode loop; see ai/llm_scheduler.py.
+        self.scheduler = LLMScheduler(GeneratorBackend(self.generate_stream, self._batch_limit))
+
+    @staticmethod
+    def _warm_up(llm):
+        if isinstance(llm, MappedModel):
+            llm.prefetch()
+        else:
+            llm("Hello", max_tokens=1)  # builds the KV cache and compute graphs
+
+    def _unload(self, llm):
+        # Saved prefix states are as large as the KV cache; free them with the model.
+        prefix_cache.invalidate(self.model_name)
+        if hasattr(llm, "close"):
+            llm.close()
+
+    def _resume_prefix(self, llm, prompt: str):
+        """
+        Restore the saved state for the prompt's cached static prefix, so
+        llama.cpp only evaluates the tokens after it.
+        """
+        prefix = prefix_cache.match(prompt)
+        if prefix is None:
+            return
+        state, hit = prefix_cache.get_or_build(self.model_name, prefix, lambda: self._eval_prefix(llm, prefix))
+        if hit:
+            llm.load_state(state)
+
+    @staticmethod
+    def _eval_prefix(llm, prefix: str):
+        llm.reset()
+        llm.eval(llm.tokenize(prefix.encode("utf-8")))
+        return llm.save_state()
+
+    def _batch_limit(self) -> Optional[int]:
+        # llama-cpp's Llama holds a single KV context, so its generators must
+        # not be interleaved. Any sequence can fail over from the GPU server to
+        # local weights, so the cap holds whichever backend is preferred now.
+        if self._has_llama_cpp and model_manager.is_available(self.model_name):
+            return 1
+        return None
+
+    @property
+    def model_loaded(self) -> bool:
+        return model_manager.is_loaded(self.model_name)
 
     def generate(self, prompt: str) -> str:
-        backend = compute_backends.get_backend_for_task("llm")
-        logger.info(f"Local LLM generating response using {backend.value}...")
-        
-        if backend == BackendType.GPU_SERVER:
-            # Call remote GPU server
-            return f"Remote GPU Response to: {prompt[:20]}..."
-            
-        # Default CPU/TPU (TPU doesn't run LLMs usually, so CPU)
-        return f"Local Phi-2 Response to: {prompt[:20]}..."
+        return "".join(self.generate_stream(prompt)).strip()
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Blocking token generator; run it on the ``llm`` pool (see ``stream``).
+        The backend is picked by measured latency and load, failing over to
+        the on-device model if the GPU server errors before its first token.
+        """
+        return compute_backends.stream(
+            "llm",
+            {
+                BackendType.GPU_SERVER: lambda: self._remote_stream(prompt),
+                BackendType.PI_CPU: lambda: self._local_stream(prompt),
+            },
+        )
+
+    def _remote_stream(self, prompt: str) -> Iterator[str]:
+        logger.info("Local LLM generating response using GPU_SERVER...")
+        yield from stub_tokens(f"Remote GPU Response to: {prompt[:20]}...")
+
+    def _local_stream(self, prompt: str) -> Iterator[str]:
+        logger.info("Local LLM generating response using PI_CPU...")
+        try:
+            with model_manager.use(self.model_name) as llm:
+                if not isinstance(llm, MappedModel):
+                    self._resume_prefix(llm, prompt)
+                    for chunk in llm(prompt, max_tokens=MAX_NEW_TOKENS, stream=True):
+                        yield chunk["choices"][0]["text"]
+                    return
+        except ModelUnavailable as exc:
+            logger.debug(f"Local LLM weights unavailable: {exc}")
+        # Stub backend: streams its canned answer word by word, deterministically.
+        yield from stub_tokens(f"Local Phi-2 Response to: {prompt[:20]}...")
+
+    async def stream(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Yield tokens as the model produces them, without blocking the event loop.
+        """
+        if get_config().llm_scheduler.enabled:
+            tokens = self.scheduler.stream(prompt, max_tokens)
+        else:
+            tokens = compute_executors.stream("llm", self.generate_stream, prompt)
+        async for token in tokens:
+            yield token
+
+    def stats(self) -> Dict[str, Any]:
+        return {"scheduler": self.scheduler.stats(), "prefix_cache": prefix_cache.stats()}
 
     def is_available(self) -> bool:
         return True
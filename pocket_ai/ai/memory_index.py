@@ -0,0 +1,477 @@
+"""
+Offline semantic memory over notes and recent transcripts.
+
+Records stored through ``DataLifecycleManager`` are embedded on a
+background thread shortly after they are written (so indexing never adds to
+request latency) and kept in a memory-mapped matrix (float16, or int8 with per-row
+scales), so recall is one vectorized similarity pass instead of decrypting
+every note. Large corpora switch to an IVF layout that only scores the
+closest partitions.
+
+Only vectors and record keys are kept here; text stays in encrypted storage.
+The embedder is the bundled all-MiniLM-L6-v2 ONNX model when it and its
+runtime are installed, otherwise a deterministic hashing embedder.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np  # type: ignore[import]
+
+from pocket_ai.core.config import get_config
+from pocket_ai.core.logger import logger
+from pocket_ai.core.storage import DataLifecycleManager, storage
+
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+EMBEDDING_MODEL = MODELS_DIR / "all-MiniLM-L6-v2.onnx"
+EMBEDDING_TOKENIZER = MODELS_DIR / "all-MiniLM-L6-v2-tokenizer.json"
+
+INDEXED_CATEGORIES = ("user_notes", "transcripts_temp")
+INITIAL_CAPACITY = 256
+SEARCH_BLOCK_ROWS = 65536
+IVF_MIN_ROWS = 4096
+IVF_NPROBE = 4
+# Storage events folded into one batch (one embed call, one meta write).
+MAX_EVENT_BATCH = 64
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """
+    Signed feature hashing over words, word bigrams and character trigrams.
+    Deterministic across processes (crc32, not ``hash()``), no model needed.
+    """
+
+    name = "hashing-v1"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = TOKEN_RE.findall(text.lower())
+        features = list(words)
+        features.extend(f"{left} {right}" for left, right in zip(words, words[1:]))
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode("utf-8")) for feature in self._features(text)), dtype=np.uint32
+            )
+            if not hashes.size:
+                continue
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], hashes % self.dim, signs)
+        return _normalise(matrix)
+
+
+class OnnxEmbedder:
+    """
+    all-MiniLM-L6-v2 via onnxruntime with mean pooling (needs ``tokenizers``).
+    """
+
+    name = "all-MiniLM-L6-v2"
+    dim = 384
+
+    def __init__(self, model_path: Path = EMBEDDING_MODEL, tokenizer_path: Path = EMBEDDING_TOKENIZER):
+        import onnxruntime as ort  # type: ignore[import]
+        from tokenizers import Tokenizer  # type: ignore[import]
+
+        self.session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+        self.input_names = {item.name for item in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(str(tokenizer_path))
+        self.tokenizer.enable_truncation(max_length=256)
+        self.tokenizer.enable_padding()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(list(texts))
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        hidden = self.session.run(None, feeds)[0]
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1.0, None)
+        return _normalise(pooled.astype(np.float32))
+
+
+def default_embedder():
+    if EMBEDDING_MODEL.exists() and EMBEDDING_TOKENIZER.exists():
+        try:
+            return OnnxEmbedder()
+        except Exception as exc:  # runtime missing or model unreadable
+            logger.warning(f"Embedding model unavailable, using hashing embedder: {exc}")
+    return HashingEmbedder()
+
+
+def _normalise(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.clip(norms, 1e-12, None)
+
+
+def _record_text(data: Any) -> str:
+    if isinstance(data, dict):
+        value = data.get("content") or data.get("text") or ""
+        return value if isinstance(value, str) else ""
+    return data if isinstance(data, str) else ""
+
+
+class MemoryIndex:
+    def __init__(self, root: Path, embedder=None, dtype: str = "float16"):
+        if dtype not in ("float16", "int8"):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        self.root = Path(root)
+        self.embedder = embedder or default_embedder()
+        self.dtype = dtype
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._meta_dirty = False
+        self._events: "queue.Queue[Tuple[str, str, str]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._load()
+
+    # -- persistence -----------------------------------------------------
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.root / "meta.json"
+
+    def _matrix_path(self, name: str) -> Path:
+        return self.root / f"{name}.npy"
+
+    def _load(self):
+        self._keys: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._ivf: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+        self.needs_backfill = True
+        try:
+            meta = json.loads(self._meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (meta.get("embedder"), meta.get("dim"), meta.get("dtype")) != (
+            self.embedder.name,
+            self.embedder.dim,
+            self.dtype,
+        ):
+            logger.info("Memory index built with a different embedder; rebuilding.")
+            return
+        try:
+            self._vectors = np.load(self._matrix_path("vectors"), mmap_mode="r+")
+            self._scales = np.load(self._matrix_path("scales"), mmap_mode="r+")
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Memory index unreadable, rebuilding: {exc}")
+            self._vectors = self._scales = None
+            return
+        self._keys = list(meta.get("keys", []))
+        self._positions = {key: index for index, key in enumerate(self._keys)}
+        self.needs_backfill = False
+
+    def _save_meta(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "dtype": self.dtype,
+            "keys": self._keys,
+        }
+        tmp_path = self._meta_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_path, self._meta_path)
+        self._meta_dirty = False
+
+    def _touch_meta(self):
+        # Inside a batch the key list is written once, when the batch ends.
+        if self._batch_depth:
+            self._meta_dirty = True
+        else:
+            self._save_meta()
+
+    @contextmanager
+    def _batch(self):
+        # The lock is not held in between, so searches are not blocked while
+        # a batch is being embedded.
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._meta_dirty:
+                    self._save_meta()
+
+    def _ensure_capacity(self, needed: int):
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        # Grow by doubling into fresh memmaps, then swap them into place.
+        self.root.mkdir(parents=True, exist_ok=True)
+        new_capacity = max(INITIAL_CAPACITY, capacity * 2, needed)
+        count = len(self._keys)
+        vectors = np.lib.format.open_memmap(
+            self._matrix_path("vectors.tmp"), mode="w+", dtype=self.dtype, shape=(new_capacity, self.embedder.dim)
+        )
+        scales = np.lib.format.open_memmap(
+            self._matrix_path("scales.tmp"), mode="w+", dtype=np.float32, shape=(new_capacity,)
+        )
+        if count:
+            vectors[:count] = self._vectors[:count]
+            scales[:count] = self._scales[:count]
+        vectors.flush()
+        scales.flush()
+        os.replace(self._matrix_path("vectors.tmp"), self._matrix_path("vectors"))
+        os.replace(self._matrix_path("scales.tmp"), self._matrix_path("scales"))
+        self._vectors, self._scales = vectors, scales
+
+    def _encode(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.dtype == "int8":
+            scales = np.clip(np.abs(vectors).max(axis=1), 1e-12, None) / 127.0
+            return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+
+    # -- updates ---------------------------------------------------------
+
+    def add(self, doc_id: str, text: str):
+        self.add_many([(doc_id, text)])
+
+    def add_many(self, items: Iterable[Tuple[str, str]]):
+        items = [(doc_id, text) for doc_id, text in items if text and text.strip()]
+        if not items:
+            return
+        encoded, scales = self._encode(self.embedder.embed([text for _, text in items]))
+        with self._lock:
+            new_ids = [doc_id for doc_id, _ in items if doc_id not in self._positions]
+            self._ensure_capacity(len(self._keys) + len(new_ids))
+            for (doc_id, _), row, scale in zip(items, encoded, scales):
+                position = self._positions.get(doc_id)
+                if position is None:
+                    position = len(self._keys)
+                    self._keys.append(doc_id)
+                    self._positions[doc_id] = position
+                self._vectors[position] = row
+                self._scales[position] = scale
+                self._assign_partition(position)
+            self._vectors.flush()
+            self._scales.flush()
+            self._touch_meta()
+
+    def delete(self, doc_id: str) -> bool:
+        with self._lock:
+            position = self._positions.pop(doc_id, None)
+            if position is None:
+                return False
+            last = len(self._keys) - 1
+            if position != last:
+                # Swap the last row into the hole so rows stay contiguous.
+                moved = self._keys[last]
+                self._vectors[position] = self._vectors[last]
+                self._scales[position] = self._scales[last]
+                self._keys[position] = moved
+                self._positions[moved] = position
+                if self._ivf is not None:
+                    self._ivf[1][position] = self._ivf[1][last]
+            self._keys.pop()
+            self._touch_meta()
+            return True
+
+    def delete_prefix(self, prefix: str):
+        with self._lock, self._batch():
+            for doc_id in [key for key in self._keys if key.startswith(prefix)]:
+                self.delete(doc_id)
+
+    def reset(self):
+        with self._lock:
+            for name in ("vectors", "scales"):
+                self._matrix_path(name).unlink(missing_ok=True)
+            self._meta_path.unlink(missing_ok=True)
+            self._meta_dirty = False
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # -- search ----------------------------------------------------------
+
+    def search(self, query: str, k: int = 5, prefix: Optional[str] = None) -> List[Tuple[str, float]]:
+        if not query.strip() or k <= 0:
+            return []
+        vector = self.embedder.embed([query])[0].astype(np.float32)
+        with self._lock:
+            count = len(self._keys)
+            if not count:
+                return []
+            rows = self._candidate_rows(vector, count)
+            scores = self._score(vector, rows, count)
+            if prefix is not None:
+                keys = self._keys if rows is None else [self._keys[row] for row in rows]
+                keep = np.fromiter((key.startswith(prefix) for key in keys), dtype=bool, count=len(keys))
+                scores = np.where(keep, scores, -np.inf)
+            top = min(k, len(scores))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best])]
+            results = []
+            for index in best:
+                if not np.isfinite(scores[index]):
+                    continue
+                row = index if rows is None else rows[index]
+                results.append((self._keys[row], float(scores[index])))
+            return results
+
+    def _score(self, vector: np.ndarray, rows: Optional[np.ndarray], count: int) -> np.ndarray:
+        if rows is not None:
+            return (self._vectors[rows].astype(np.float32) @ vector) * self._scales[rows]
+        # Blocked so int8/float16 rows are widened a slice at a time.
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SEARCH_BLOCK_ROWS):
+            stop = min(count, start + SEARCH_BLOCK_ROWS)
+            scores[start:stop] = (self._vectors[start:stop].astype(np.float32) @ vector) * self._scales[start:stop]
+        return scores
+
+    def _candidate_rows(self, vector: np.ndarray, count: int) -> Optional[np.ndarray]:
+        if count < IVF_MIN_ROWS:
+            self._ivf = None
+            return None
+        if self._ivf is None or not (self._ivf[2] / 2 <= count <= self._ivf[2] * 2):
+            self._build_ivf(count)
+        centroids, assignments, _ = self._ivf
+        probe = np.argpartition(-(centroids @ vector), min(IVF_NPROBE, len(centroids)) - 1)[:IVF_NPROBE]
+        return np.flatnonzero(np.isin(assignments[:count], probe))
+
+    def _build_ivf(self, count: int, iterations: int = 8):
+        """
+        Coarse k-means (sqrt(n) lists) over the stored vectors.
+        """
+        data = self._vectors[:count].astype(np.float32) * self._scales[:count, None]
+        nlist = max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(count, nlist, replace=False)]
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = data[assignments == cluster]
+                if len(members):
+                    centroids[cluster] = members.mean(axis=0)
+            centroids = _normalise(centroids)
+        capacity = self._vectors.shape[0]
+        full = np.zeros(capacity, dtype=np.int32)
+        full[:count] = np.argmax(data @ centroids.T, axis=1)
+        self._ivf = (centroids, full, count)
+
+    def _assign_partition(self, position: int):
+        if self._ivf is None:
+            return
+        centroids, assignments, built_for = self._ivf
+        if position >= len(assignments):
+            grown = np.zeros(self._vectors.shape[0], dtype=np.int32)
+            grown[: len(assignments)] = assignments
+            assignments = grown
+            self._ivf = (centroids, assignments, built_for)
+        vector = self._vectors[position].astype(np.float32) * self._scales[position]
+        assignments[position] = int(np.argmax(centroids @ vector))
+
+    # -- storage sync ----------------------------------------------------
+
+    def on_storage_event(self, event: str, category: str, key: str, data: Any):
+        """
+        Storage listener. Runs on the caller's thread (often the event loop),
+        so it only queues the change; ``flush()`` waits for it to be applied.
+        """
+        if event == "reset":
+            self._enqueue("reset", "", "")
+        elif category not in INDEXED_CATEGORIES:
+            return
+        elif event == "store":
+            self._enqueue("store", f"{category}/{key}", _record_text(data))
+        elif event == "delete":
+            self._enqueue("delete", f"{category}/{key}", "")
+        elif event == "clear":
+            self._enqueue("clear", f"{category}/", "")
+
+    def flush(self):
+        """
+        Block until every queued storage event has been applied.
+        """
+        self._events.join()
+
+    def _enqueue(self, event: str, target: str, text: str):
+        self._events.put((event, target, text))
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._drain, name="pocket-memory-index", daemon=True)
+                    self._worker.start()
+
+    def _drain(self):
+        while True:
+            batch = [self._events.get()]
+            while len(batch) < MAX_EVENT_BATCH:
+                try:
+                    batch.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._apply(batch)
+            except Exception as exc:
+                logger.warning(f"Memory index update failed: {exc}")
+            finally:
+                for _ in batch:
+                    self._events.task_done()
+
+    def _apply(self, batch: List[Tuple[str, str, str]]):
+        """
+        Apply events in order; runs of stores are embedded together.
+        """
+        adds: List[Tuple[str, str]] = []
+        with self._batch():
+            for event, target, text in batch:
+                if event == "store" and text:
+                    adds.append((target, text))
+                    continue
+                self.add_many(adds)
+                adds = []
+                if event == "reset":
+                    self.reset()
+                elif event in ("store", "delete"):
+                    self.delete(target)
+                elif event == "clear":
+                    self.delete_prefix(target)
+            self.add_many(adds)
+
+    def backfill(self, store: DataLifecycleManager = storage):
+        """
+        Index records written before the index existed (or by another embedder).
+        """
+        items = []
+        for category in INDEXED_CATEGORIES:
+            for key in store.list_keys(category):
+                doc_id = f"{category}/{key}"
+                if doc_id not in self._positions:
+                    try:
+                        items.append((doc_id, _record_text(store.retrieve(category, key))))
+                    except Exception as exc:
+                        logger.warning(f"Skipping unreadable record {doc_id}: {exc}")
+        self.add_many(items)
+        self.needs_backfill = False
+
+
+memory_index = MemoryIndex(Path(get_config().storage_path) / "memory_index")
+if get_config().feature_flags.get("semantic_memory", True):
+    storage.add_listener(memory_index.on_storage_event)
@@ -1,50 +1,317 @@
 import re
-from typing import Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Match, Optional, Sequence, Tuple
+from pocket_ai.ai.intent_classifier import UNKNOWN, IntentClassifier, intent_classifier
+from pocket_ai.core.config import get_config
 from pocket_ai.core.logger import logger
 
+NLU_CACHE_SIZE = 1024
+
+# Connectives that may join two commands; the captured separator lets a split
+# be undone when the right-hand side is not a command on its own.
+CLAUSE_SPLIT_RE = re.compile(r"(\s*;\s*(?:then\s+)?|,?\s+(?:and then|and also|and|then|also)\s+)")
+# After a free-text clause (task or note content), a conjunction only starts
+# a new command when the next clause opens with a command verb: "save a note:
+# buy lunch and dinner" is one note, "... and block 2 hours" is two commands.
+COMMAND_START_RE = re.compile(
+    r"^(?:please\s+)?(?:add|create|make|new|remind|save|take|jot|write|block|draft|compose|order|log|ate|had)\b"
+)
+
+# Keyword classes the grammar is built from. Each becomes one named group in a
+# single combined pattern, so an utterance is scanned once however many
+# intents exist. Patterns must only use non-capturing groups, and a phrase
+# that shares a word with a later class (e.g. "log lunch" vs "lunch") has to
+# be listed first. Alternatives that start with a plain letter let the
+# compiled pattern skip words that cannot begin any keyword.
+INTENT_KEYWORDS: Dict[str, str] = {
+    "task": r"tasks?|to-?dos?|remind me",
+    "note": r"notes?",
+    "note_verb": r"save|take|jot|write",
+    "block": r"block",
+    "span": r"hours?|hrs?|minutes?|mins?|time",
+    "draft": r"draft|compose",
+    "email": r"e-?mails?",
+    "meal": r"ate|log (?:my |a )?(?:meal|breakfast|lunch|dinner|snack)|had (?:my |a )?(?:breakfast|lunch|dinner|snack)",
+    "food": r"food|dinner|lunch|breakfast|order",
+}
+
+# Intents in priority order: the first rule whose keyword classes all occur
+# wins. ``anchor`` is the class that content is read from.
+INTENT_GRAMMAR: List[Dict[str, Any]] = [
+    {"type": "create_task", "requires": ("task",), "slots": ("content",), "anchor": "task"},
+    {"type": "create_note", "requires": ("note", "note_verb"), "slots": ("content",), "anchor": "note"},
+    {"type": "block_time", "requires": ("block", "span"), "slots": ("duration_minutes",)},
+    {"type": "draft_email", "requires": ("draft", "email")},
+    # Meals before food so "log lunch" / "I ate lunch" are not food orders.
+    {"type": "log_meal", "requires": ("meal",)},
+    {"type": "order_food", "requires": ("food",), "slots": ("budget",)},
+]
+
+CONTENT_LEAD_RE = re.compile(r"^[\s:,-]*(?:(?:to|that|about)\s+)?")
+CONTENT_VERBS_RE = re.compile(r"^(?:(?:please|add|create|make|new|a|an)\s+)*")
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(hours?|hrs?|h|minutes?|mins?|m)\b")
+BUDGET_RE = re.compile(
+    r"(?:under|below|within|budget(?: of)?|max(?:imum)?|up ?to|less than)\s*(?:rs\.?|inr|₹)?\s*(\d+)"
+    r"|₹\s*(\d+)"
+    r"|(\d+)\s*(?:rs|rupees|inr)\b"
+)
+
+
+def _content_slot(text: str, hits: Dict[str, Match], rule: Dict[str, Any]) -> str:
+    anchor = hits.get(rule["anchor"])
+    if anchor is None:
+        # Intent recognised without its keyword (classifier tier): keep the utterance.
+        return text[CONTENT_VERBS_RE.match(text).end():].strip()
+    tail = text[anchor.end():]
+    content = tail[CONTENT_LEAD_RE.match(tail).end():].strip()
+    if content:
+        return content
+    # "buy milk todo": the content precedes the keyword.
+    head = text[:anchor.start()].strip()
+    return head[CONTENT_VERBS_RE.match(head).end():].strip()
+
+
+def _duration_slot(text: str, hits: Dict[str, Match], rule: Dict[str, Any]) -> Optional[int]:
+    match = DURATION_RE.search(text)
+    if not match:
+        return None
+    amount = float(match.group(1))
+    minutes = amount if match.group(2).startswith("m") else amount * 60
+    return max(1, int(minutes))
+
+
+def _budget_slot(text: str, hits: Dict[str, Match], rule: Dict[str, Any]) -> Optional[int]:
+    match = BUDGET_RE.search(text)
+    if not match:
+        return None
+    return int(next(group for group in match.groups() if group))
+
+
+def _leading_chars(patterns: Sequence[str]) -> Optional[str]:
+    """
+    First character of every top-level alternative, or ``None`` when one of
+    them does not start with a literal letter or digit.
+    """
+    chars = set()
+    for pattern in patterns:
+        depth, start = 0, 0
+        for index, char in enumerate(pattern + "|"):
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif char == "|" and depth == 0:
+                alternative = pattern[start:index]
+                if not alternative or not alternative[0].isalnum() or alternative[1:2] in ("?", "*", "{"):
+                    return None
+                chars.add(alternative[0])
+                start = index + 1
+    return "".join(sorted(chars))
+
+
+SLOT_EXTRACTORS: Dict[str, Callable[[str, Dict[str, Match], Dict[str, Any]], Any]] = {
+    "content": _content_slot,
+    "duration_minutes": _duration_slot,
+    "budget": _budget_slot,
+}
+
+
+class IntentGrammar:
+    """
+    ``INTENT_KEYWORDS`` / ``INTENT_GRAMMAR`` compiled into one regex plus an
+    ordered rule table. Matching is a single ``finditer`` pass followed by a
+    set lookup per rule.
+    """
+
+    def __init__(
+        self,
+        keywords: Dict[str, str] = INTENT_KEYWORDS,
+        rules: Sequence[Dict[str, Any]] = INTENT_GRAMMAR,
+    ):
+        for rule in rules:
+            missing = [name for name in rule["requires"] if name not in keywords]
+            missing += [slot for slot in rule.get("slots", ()) if slot not in SLOT_EXTRACTORS]
+            if missing:
+                raise ValueError(f"Intent rule {rule['type']} references unknown names: {missing}")
+        alternatives = "|".join(f"(?P<{name}>{pattern})" for name, pattern in keywords.items())
+        leading = _leading_chars(list(keywords.values()))
+        guard = f"(?=[{re.escape(leading)}])" if leading else ""
+        self.pattern = re.compile(rf"\b{guard}(?:{alternatives})\b")
+        self.rules = [
+            (rule, frozenset(rule["requires"]), [(slot, SLOT_EXTRACTORS[slot]) for slot in rule.get("slots", ())])
+            for rule in rules
+        ]
+        self._by_type = {entry[0]["type"]: entry for entry in self.rules}
+
+    @property
+    def intent_types(self) -> List[str]:
+        return list(self._by_type)
+
+    def scan(self, text: str) -> Dict[str, Match]:
+        hits: Dict[str, Match] = {}
+        for found in self.pattern.finditer(text):
+            hits.setdefault(found.lastgroup, found)
+        return hits
+
+    def match(self, text: str, hits: Optional[Dict[str, Match]] = None) -> Dict[str, Any]:
+        if hits is None:
+            hits = self.scan(text)
+        if hits:
+            for entry in self.rules:
+                if entry[1].issubset(hits):
+                    return self._build(entry, text, hits)
+        return {"type": "unknown", "raw": text}
+
+    def build(self, intent_type: str, text: str, hits: Optional[Dict[str, Match]] = None) -> Dict[str, Any]:
+        """
+        Intent dict for ``intent_type`` decided elsewhere, with whatever slots
+        can be read from ``text``.
+        """
+        return self._build(self._by_type[intent_type], text, self.scan(text) if hits is None else hits)
+
+    def _build(self, entry, text: str, hits: Dict[str, Match]) -> Dict[str, Any]:
+        rule, _, slots = entry
+        intent: Dict[str, Any] = {"type": rule["type"]}
+        for slot, extract in slots:
+            intent[slot] = extract(text, hits, rule)
+        intent["raw"] = text
+        return intent
+
+
+def normalise_utterance(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
 class LocalNLU:
-    def __init__(self):
-        pass
+    """
+    Two offline tiers: the keyword grammar, then the intent classifier for
+    paraphrases the grammar misses. Only what both reject reaches the LLM.
+
+    Results are kept in a bounded LRU keyed on the normalised utterance, so
+    repeated phrases ("what's next", "daily review") are parsed once.
+    """
+
+    def __init__(
+        self,
+        grammar: Optional[IntentGrammar] = None,
+        classifier: IntentClassifier = intent_classifier,
+        cache_size: int = NLU_CACHE_SIZE,
+    ):
+        self.grammar = grammar or IntentGrammar()
+        self.classifier = classifier
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, bool, float], Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def parse_intent(self, text: str) -> Dict[str, Any]:
-        text = text.lower()
-        logger.debug(f"NLU parsing: {text}")
-
-        # 1. Task Creation
-        # "Add task to buy milk" / "Remind me to call mom"
-        if "task" in text or "todo" in text or "remind me" in text:
-            content = re.sub(r"(add|create|make|a)?\s*(task|todo|note)?\s*(to|that)?\s*", "", text).strip()
-            return {"type": "create_task", "content": content, "raw": text}
-
-        # 2. Note Taking
-        # "Save a note: ideas for project"
-        elif "note" in text and "save" in text:
-            content = text.split("note", 1)[1].strip(": ").strip()
-            return {"type": "create_note", "content": content, "raw": text}
-
-        # 3. Calendar / Time Blocking
-        # "Block 2 hours for deep work"
-        elif "block" in text and ("hour" in text or "time" in text):
-            return {"type": "block_time", "raw": text}
-
-        # 4. Email
-        # "Draft email to manager"
-        elif "draft" in text and "email" in text:
-            return {"type": "draft_email", "raw": text}
-
-        # 5. Food
-        # "Order food" / "Find dinner"
-        elif "food" in text or "dinner" in text or "lunch" in text or "order" in text:
-            return {"type": "order_food", "raw": text}
-
-        # 6. Wellness (Meal)
-        # "I ate pizza" / "Log lunch"
-        elif "ate" in text or "log meal" in text:
-            return {"type": "log_meal", "raw": text}
+        return self.parse_batch([text])[0]
 
-        return {"type": "unknown", "raw": text}
+    def parse_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Parse many utterances at once: each distinct text is normalised and
+        matched once, cache misses go through the grammar in one loop, and the
+        leftovers are scored by the classifier in a single batch.
+        """
+        settings = get_config().intent_classifier
+        tier = (settings.enabled, settings.threshold)
+        normalised = [normalise_utterance(text) for text in texts]
+        found: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+        with self._cache_lock:
+            for text in normalised:
+                if text in found:
+                    self.cache_hits += 1
+                    continue
+                cached = self._cache.get((text, *tier))
+                if cached is None:
+                    self.cache_misses += 1
+                    found[text] = cached  # placeholder, filled below
+                    pending.append(text)
+                else:
+                    self._cache.move_to_end((text, *tier))
+                    self.cache_hits += 1
+                    found[text] = cached
+
+        if pending:
+            fresh = self._parse_uncached(pending, settings.enabled)
+            with self._cache_lock:
+                for text, intent in zip(pending, fresh):
+                    found[text] = intent
+                    self._cache[(text, *tier)] = intent
+                while len(self._cache) > max(0, self.cache_size):
+                    self._cache.popitem(last=False)
+        # Copies, so a caller annotating its intent cannot corrupt the cache.
+        return [dict(found[text]) for text in normalised]
+
+    def _parse_uncached(self, texts: List[str], use_classifier: bool) -> List[Dict[str, Any]]:
+        # "Add task to buy milk", "Save a note: ideas", "Block 2 hours for deep work",
+        # "Draft email to manager", "I ate pizza", "Order dinner under 300"
+        scans = []
+        intents = []
+        for text in texts:
+            logger.debug(f"NLU parsing: {text}")
+            hits = self.grammar.scan(text)
+            scans.append(hits)
+            intents.append(self.grammar.match(text, hits))
+
+        unknown = [index for index, intent in enumerate(intents) if intent["type"] == UNKNOWN and texts[index]]
+        if not unknown or not use_classifier:
+            return intents
+        try:
+            predictions = self.classifier.predict([texts[index] for index in unknown])
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Intent classifier unavailable: {exc}")
+            return intents
+        for index, (label, confidence) in zip(unknown, predictions):
+            if label == UNKNOWN or label not in self.grammar.intent_types:
+                continue
+            intent = self.grammar.build(label, texts[index], scans[index])
+            intent["confidence"] = round(confidence, 3)
+            intents[index] = intent
+        return intents
+
+    def cache_stats(self) -> Dict[str, Any]:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "entries": len(self._cache),
+            "capacity": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
 
     def parse(self, text: str) -> Dict[str, Any]:
         return self.parse_intent(text)
 
+    def parse_intents(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Split a compound command ("add a task to call mom and block 2 hours")
+        into one intent per clause. A clause that is not a command by itself
+        ("... call mom and dad") stays attached to the clause before it.
+        """
+        parts = CLAUSE_SPLIT_RE.split(text.strip())
+        clauses: List[str] = []
+        intents: List[Dict[str, Any]] = []
+        for index, intent in zip(range(0, len(parts), 2), self.parse_batch(parts[0::2])):
+            clause = parts[index]
+            if clauses and (intent["type"] == "unknown" or self._continues_content(intents[-1], clause)):
+                clauses[-1] = f"{clauses[-1]}{parts[index - 1]}{clause}"
+                intents[-1] = self.parse_intent(clauses[-1])
+                continue
+            clauses.append(clause)
+            intents.append(intent)
+        return intents
+
+    @staticmethod
+    def _continues_content(previous: Dict[str, Any], clause: str) -> bool:
+        return "content" in previous and not COMMAND_START_RE.match(clause.lower())
+
+
 nlu_engine = LocalNLU()
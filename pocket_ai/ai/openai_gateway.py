@@ -1,34 +1,168 @@
-from typing import Dict, Any, Optional
-from pocket_ai.core.config import get_config
+import base64
+import json
+from typing import AsyncIterator, Dict, Any, Optional
+
+import httpx
+
+from pocket_ai.ai.context_manager import estimate_tokens
+from pocket_ai.core.config import OpenAIGatewayConfig, get_config
+from pocket_ai.core.http_client import PooledHTTPClient
+from pocket_ai.core.rate_limiter import cloud_rate_limiter
 from pocket_ai.core.policy_engine import policy_engine
+from pocket_ai.core.privacy import scrub_text
 from pocket_ai.core.secrets_manager import secrets_manager
 from pocket_ai.core.logger import logger
 
+PROVIDER = "openai"
+# Rate-limit charge for one image at default detail.
+IMAGE_TOKENS = 765
+
+
+class StreamIncomplete(Exception):
+    """
+    A streamed completion failed after some tokens were already yielded.
+    """
+
+
+def message_tokens(messages: list) -> int:
+    total = 0
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        total += estimate_tokens(str(content))
+    return total
+
+
+def sse_delta(line: str) -> Optional[str]:
+    """
+    The content delta carried by one ``data:`` line of a streamed completion.
+    """
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    choices = json.loads(data).get("choices") or [{}]
+    return (choices[0].get("delta") or {}).get("content")
+
+
 class OpenAIGateway:
     def __init__(self):
         self.api_key = secrets_manager.get_secret("OPENAI_API_KEY")
+        # Shared by chat, streaming chat and vision, so they reuse connections.
+        self.http = PooledHTTPClient("OpenAI", lambda: self.settings.http)
+
+    @property
+    def settings(self) -> OpenAIGatewayConfig:
+        return get_config().openai
 
     async def chat_completion(self, messages: list, model: str = "gpt-4") -> Optional[str]:
+        if not self._chat_allowed():
+            return None
+        if not self.api_key:
+            logger.warning("No OpenAI API key found")
+            return None
+
+        logger.info(f"Calling OpenAI {model}...")
+        return await self._completion({"model": model, "messages": messages}, message_tokens(messages))
+
+    async def chat_completion_stream(self, messages: list, model: str = "gpt-4") -> AsyncIterator[str]:
+        """
+        Yield completion tokens as they arrive. Yields nothing when policy
+        blocks cloud chat, so callers can fall back to the local model.
+        """
+        if not self._chat_allowed():
+            return
+        async for token in self._stream_chat(messages, model):
+            yield token
+
+    def _chat_allowed(self) -> bool:
         if not policy_engine.can_use_cloud("chat_completion"):
             logger.warning("Cloud chat blocked by policy")
-            return None
+            return False
+        return True
 
+    async def _stream_chat(self, messages: list, model: str) -> AsyncIterator[str]:
         if not self.api_key:
+            # Yield nothing (never error text, which would be cached as an answer).
             logger.warning("No OpenAI API key found")
-            return "Error: No API key."
+            return
 
         logger.info(f"Calling OpenAI {model}...")
-        # Mock call for prototype
-        return f"Mock response from {model}"
+        payload = {"model": model, "messages": messages, "stream": True}
+        prompt_tokens = message_tokens(messages)
+        streamed = []
+        try:
+            async with cloud_rate_limiter.acquire(PROVIDER, model, prompt_tokens) as lease:
+                try:
+                    async with self.http.stream(
+                        "POST", self._url("chat/completions"), headers=self._headers(), json=payload
+                    ) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            token = sse_delta(line)
+                            if token:
+                                streamed.append(token)
+                                yield token
+                finally:
+                    # Also on errors and early close: charge what was actually streamed.
+                    lease.settle(prompt_tokens + estimate_tokens("".join(streamed)))
+        except (httpx.HTTPError, ValueError) as exc:
+            if streamed:
+                # The caller already has part of an answer; it must not pass for a whole one.
+                raise StreamIncomplete(f"OpenAI stream cut off after {len(streamed)} tokens: {exc}") from exc
+            # Nothing was streamed; callers fall back locally.
+            logger.warning(f"OpenAI stream failed: {exc}")
 
     async def vision_query(self, image_bytes: bytes, prompt: str) -> Optional[str]:
         if not policy_engine.can_use_cloud("vision_query"):
             logger.warning("Cloud vision blocked by policy")
             return None
-            
-        # TODO: Apply privacy filter here
-        
+
+        if not self.api_key:
+            logger.warning("No OpenAI API key found")
+            return None
+
+        # Emails and phone numbers in the prompt never leave the device.
+        prompt = scrub_text(prompt)
         logger.info("Calling OpenAI Vision...")
-        return "Mock vision response: I see a coffee cup."
+        image_url = "data:image/jpeg;base64," + base64.b64encode(image_bytes).decode("ascii")
+        content = [{"type": "text", "text": prompt}, {"type": "image_url", "image_url": {"url": image_url}}]
+        return await self._completion(
+            {"model": self.settings.vision_model, "messages": [{"role": "user", "content": content}]},
+            estimate_tokens(prompt) + IMAGE_TOKENS,
+        )
+
+    async def _completion(self, payload: Dict[str, Any], prompt_tokens: int) -> Optional[str]:
+        """
+        One buffered completion, queued behind the model's rate limits.
+        """
+        try:
+            async with cloud_rate_limiter.acquire(PROVIDER, payload["model"], prompt_tokens) as lease:
+                response = await self.http.request(
+                    "POST", self._url("chat/completions"), headers=self._headers(), json=payload
+                )
+                response.raise_for_status()
+                body = response.json()
+                text = body["choices"][0]["message"]["content"]
+                usage = (body.get("usage") or {}).get("total_tokens")
+                lease.settle(usage if usage is not None else prompt_tokens + estimate_tokens(text or ""))
+            return text
+        except (httpx.HTTPError, ValueError, KeyError, IndexError) as exc:
+            logger.warning(f"OpenAI request failed: {exc}")
+            return None
+
+    def _url(self, path: str) -> str:
+        return f"{self.settings.base_url.rstrip('/')}/{path}"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+    def stats(self) -> Dict[str, Any]:
+        return self.http.stats()
+
+    async def aclose(self):
+        await self.http.aclose()
 
 openai_gateway = OpenAIGateway()
@@ -1,61 +1,163 @@
 from __future__ import annotations
 
+import asyncio
 import re
 import time
 import uuid
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from pocket_ai.ai.context_manager import context_manager
+from pocket_ai.ai.context_manager import context_manager, render_prompt
 from pocket_ai.ai.local_llm import local_llm
-from pocket_ai.ai.nlu import nlu_engine
-from pocket_ai.ai.openai_gateway import openai_gateway
+from pocket_ai.ai.nlu import nlu_engine, normalise_utterance
+from pocket_ai.ai.openai_gateway import StreamIncomplete, openai_gateway
+from pocket_ai.ai.response_cache import response_cache
+from pocket_ai.ai.streaming import FirstTokenTimer
 from pocket_ai.audio.speech_offline import speech_offline
 from pocket_ai.audio.speech_online import speech_online
 from pocket_ai.audio.tts_engine import tts_engine
+from pocket_ai.core.admission import admission_controller
+from pocket_ai.core.coalescing import SingleFlight
 from pocket_ai.core.config import get_config
+from pocket_ai.core.deadlines import DeadlineExceeded, deadline_scope, run_with_deadline
+from pocket_ai.core.executors import compute_executors
 from pocket_ai.core.logger import logger
 from pocket_ai.core.privacy import scrub_text, summarize_for_log
 from pocket_ai.core.policy_engine import policy_engine
 from pocket_ai.core.storage import storage
+from pocket_ai.core.tracing import tracer
 from pocket_ai.tools.dev_plugins.plugin_base import ToolContext
 from pocket_ai.tools.easy_tools_runtime import easy_tools
 from pocket_ai.tools.tool_registry import tool_registry
 from pocket_ai.wellness.meals import meal_logger
 
 
+EventSink = Callable[[Dict[str, Any]], None]
+
+# Set only while a streaming request runs; tasks spawned for it inherit the sink.
+_event_sink: ContextVar[Optional[EventSink]] = ContextVar("orchestrator_event_sink", default=None)
+_STREAM_DONE: Dict[str, Any] = {"event": "done"}
+
+CLOUD_MODEL = "gpt-4"  # openai_gateway.chat_completion default
+
+# Intents that write somewhere; duplicate commands containing one always run.
+SIDE_EFFECT_INTENTS = {"create_task", "create_note", "block_time", "draft_email", "log_meal"}
+
+
+def emit_event(event: str, **data: Any):
+    """
+    Publish a pipeline event to the current streaming client, if any.
+    """
+    sink = _event_sink.get()
+    if sink is not None:
+        sink({"event": event, **data})
+
+
 class AIOrchestrator:
     def __init__(self):
         self.config = get_config()
+        self._command_flight = SingleFlight("commands")
 
     async def process_voice_command(self, audio_data: bytes) -> Dict[str, Any]:
-        transcript = speech_offline.transcribe(audio_data)
-        if not transcript:
-            transcript = speech_online.transcribe(audio_data)
-        if not transcript:
-            return {"status": "error", "message": "Unable to transcribe audio"}
-        return await self.process_text_command(transcript)
+        # Voice comes from the device itself, so it is admitted here at top priority.
+        async with admission_controller.slot("voice"):
+            return await self._run_voice_command(audio_data)
+
+    async def _run_voice_command(self, audio_data: bytes) -> Dict[str, Any]:
+        with tracer.trace("voice_command"), deadline_scope(get_config().timeouts.request_s):
+            with tracer.span("asr"):
+                transcript = await compute_executors.run("asr", speech_offline.transcribe, audio_data)
+                if not transcript:
+                    transcript = await speech_online.transcribe(audio_data)
+            if not transcript:
+                return {"status": "error", "message": "Unable to transcribe audio"}
+            return await self._run_text_command(transcript)
 
     async def process_text_command(self, text: str) -> Dict[str, Any]:
+        # Parsed once here (before the trace starts); the pipeline reuses the intents.
+        start = time.perf_counter()
+        intents = nlu_engine.parse_intents(text)
+        tracer.record("nlu_parse", (time.perf_counter() - start) * 1000)
+        if any(intent["type"] in SIDE_EFFECT_INTENTS for intent in intents):
+            return await self._run_text_command(text, intents)
+        # Identical read-only commands already in flight share one pipeline run.
+        key = normalise_utterance(text)
+        return await self._command_flight.run(key, lambda: self._run_text_command(text, intents))
+
+    def parse_commands(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Intents for many utterances in one NLU batch (automation, replays);
+        nothing is executed.
+        """
+        return nlu_engine.parse_batch(texts)
+
+    async def stream_text_command(self, text: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a command and yield pipeline events as they happen.
+
+        Events: ``transcript``, ``intent``, ``plugin_started``, ``plugin_finished``,
+        ``llm_token``, ``llm_reset`` (discard the tokens streamed so far),
+        ``result``. Closing the iterator early cancels the command.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        sink_token = _event_sink.set(queue.put_nowait)
+        try:
+            task = asyncio.ensure_future(self._run_text_command(text))
+        finally:
+            _event_sink.reset(sink_token)
+        task.add_done_callback(lambda _: queue.put_nowait(_STREAM_DONE))
+
+        try:
+            while True:
+                event = await queue.get()
+                if event is _STREAM_DONE:
+                    break
+                yield event
+            task.result()  # surface pipeline errors to the consumer
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def _run_text_command(self, text: str, intents: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        with tracer.trace("text_command"), deadline_scope(get_config().timeouts.request_s):
+            return await self._run_traced_command(text, intents)
+
+    async def _run_traced_command(self, text: str, intents: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         logger.info(f"Processing command: {summarize_for_log(text)}")
         self.config = get_config()  # pick up runtime changes
 
-        storage_key = f"{int(time.time() * 1000)}_{uuid.uuid4().hex[:6]}"
-        storage.store("transcripts_temp", storage_key, {"text": scrub_text(text)})
+        with tracer.span("transcript_store"):
+            storage_key = f"{int(time.time() * 1000)}_{uuid.uuid4().hex[:6]}"
+            storage.store("transcripts_temp", storage_key, {"text": scrub_text(text)})
+        emit_event("transcript", text=text)
 
-        intent = nlu_engine.parse(text)
-        result = await self._execute_intent(intent)
+        if intents is None:
+            with tracer.span("nlu_parse"):
+                intents = nlu_engine.parse_intents(text)
+        intent = intents[0] if len(intents) == 1 else {"type": "multi", "intents": intents, "raw": text.lower()}
+        emit_event("intent", intent=intent)
+        with tracer.span("dispatch"):
+            try:
+                result = await run_with_deadline(self._execute_intent(intent), "dispatch")
+            except DeadlineExceeded as exc:
+                logger.warning(f"Command abandoned: {exc}")
+                result = {"status": "error", "response_text": "That took too long, please try again."}
         response_text = result.get("response_text", "Done.")
 
-        context_manager.add_turn(text, response_text, intent)
-        tts_engine.speak(response_text)
-
-        return {
+        with tracer.span("context_update"):
+            context_manager.add_turn(text, response_text, intent)
+        payload = {
             "transcript": text,
             "intent": intent,
             "result": result,
             "response_text": response_text,
         }
+        # The client can render the answer while the device is still speaking it.
+        emit_event("result", **payload)
+        with tracer.span("tts"):
+            await compute_executors.run("tts", tts_engine.speak, response_text)
+        return payload
 
     async def _execute_intent(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         intent_type = intent.get("type")
@@ -67,13 +169,38 @@ class AIOrchestrator:
             "draft_email": self._handle_email,
             "order_food": self._handle_food,
             "log_meal": self._handle_meal,
+            "multi": self._handle_multi,
         }
 
         if handler := handlers.get(intent_type):
             return await handler(intent)
 
-        response_text = await self._llm_fallback(intent.get("raw", ""))
-        return {"status": "success", "response_text": response_text}
+        response_text, first_token_ms = await self._llm_fallback(intent.get("raw", ""))
+        return {"status": "success", "response_text": response_text, "first_token_ms": first_token_ms}
+
+    async def _handle_multi(self, intent: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the clauses of a compound command concurrently, so it costs about as
+        much as its slowest clause. Plugin concurrency limits still apply.
+        """
+        intents = intent["intents"]
+        outcomes = await asyncio.gather(*(self._execute_intent(sub) for sub in intents), return_exceptions=True)
+        results = []
+        for sub, outcome in zip(intents, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"{sub.get('type')} clause failed: {outcome}")
+                outcome = {"status": "error", "response_text": "Part of that request failed."}
+            results.append({"intent": sub.get("type"), **outcome})
+
+        statuses = {result.get("status") for result in results}
+        if statuses == {"success"}:
+            status = "success"
+        elif "success" in statuses:
+            status = "partial"
+        else:
+            status = "error"
+        response_text = " ".join(result.get("response_text", "Done.") for result in results)
+        return {"status": status, "response_text": response_text, "results": results}
 
     async def _handle_task(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         plugin_name = self.config.plugin_for_intent("create_task") or "notes"
@@ -98,7 +225,7 @@ class AIOrchestrator:
         plugin_name = self.config.plugin_for_intent("block_time")
         if not plugin_name:
             return {"status": "error", "response_text": "No calendar integration configured."}
-        start, end = self._parse_time_block(intent.get("raw", "block 2 hours"))
+        start, end = self._parse_time_block(intent.get("raw", "block 2 hours"), intent.get("duration_minutes"))
         payload = {
             "action": "block_time",
             "summary": "Focus block",
@@ -118,7 +245,9 @@ class AIOrchestrator:
         plugin_name = self.config.plugin_for_intent("order_food")
         if not plugin_name:
             return {"status": "error", "response_text": "No food integration configured."}
-        budget = self._extract_budget(intent.get("raw", ""))
+        # The NLU budget slot only reads amounts introduced as a budget ("under 300"),
+        # so "dinner for 2" no longer becomes a ₹2 limit; fall back for other intent sources.
+        budget = intent["budget"] if "budget" in intent else self._extract_budget(intent.get("raw", ""))
         payload = {
             "action": "search_food",
             "query": intent.get("raw", "dinner"),
@@ -150,28 +279,70 @@ class AIOrchestrator:
         if not tool or tool["type"] != "dev":
             return {"status": "error", "message": f"Plugin {plugin_name} unavailable"}
 
+        emit_event("plugin_started", plugin=plugin_name, action=payload.get("action"))
         try:
-            return await tool_registry.execute_dev_plugin(plugin_name, payload, ToolContext())
+            with tracer.span(f"plugin:{plugin_name}"):
+                result = await tool_registry.execute_dev_plugin(plugin_name, payload, ToolContext())
         except Exception as exc:
             logger.error(f"Plugin {plugin_name} failed: {exc}")
-            return {"status": "error", "message": str(exc)}
+            result = {"status": "error", "message": str(exc)}
+        status = result.get("status", "success") if isinstance(result, dict) else "success"
+        emit_event("plugin_finished", plugin=plugin_name, status=status)
+        return result
+
+    async def _llm_fallback(self, text: str) -> Tuple[str, Optional[float]]:
+        """
+        Stream the LLM answer to the client token by token; returns the full
+        text and the time to its first token (also recorded as ``llm_first_token``).
+        """
+        timer = FirstTokenTimer("llm")
+        with tracer.span("llm_fallback"):
+            response = await run_with_deadline(
+                self._llm_answer(text, timer), "llm_fallback", budget=self.config.timeouts.llm_s
+            )
+        return response, timer.first_token_ms
+
+    @staticmethod
+    async def _emit_tokens(tokens: AsyncIterator[str]) -> str:
+        parts = []
+        async for token in tokens:
+            parts.append(token)
+            emit_event("llm_token", token=token)
+        return "".join(parts).strip()
 
-    async def _llm_fallback(self, text: str) -> str:
+    async def _llm_answer(self, text: str, timer: FirstTokenTimer) -> str:
+        # Recent turns (within budget) give the model conversational context.
+        messages = context_manager.context_window() + [{"role": "user", "content": text}]
+        prompt = render_prompt(messages)
         if policy_engine.can_use_cloud("assistant_query"):
-            response = await openai_gateway.chat_completion([{"role": "user", "content": text}])
+            try:
+                response = await self._emit_tokens(
+                    timer.wrap(
+                        response_cache.stream_or_generate(
+                            CLOUD_MODEL, prompt, lambda: openai_gateway.chat_completion_stream(messages)
+                        )
+                    )
+                )
+            except StreamIncomplete as exc:
+                logger.warning(f"{exc}; answering locally instead")
+                # Clients discard the partial cloud tokens they have shown.
+                emit_event("llm_reset")
+                response = ""
             if response:
                 return response
         logger.info("Falling back to local LLM")
-        return local_llm.generate(text)
+        local = response_cache.stream_or_generate(local_llm.model_name, prompt, lambda: local_llm.stream(prompt))
+        return await self._emit_tokens(timer.wrap(local))
 
-    def _parse_time_block(self, text: str) -> tuple[datetime, datetime]:
-        duration_hours = 2
-        match = re.search(r"(\d+)\s*hour", text)
-        if match:
-            duration_hours = max(1, int(match.group(1)))
+    def _parse_time_block(self, text: str, duration_minutes: Optional[int] = None) -> tuple[datetime, datetime]:
+        if duration_minutes is None:
+            duration_minutes = 120
+            match = re.search(r"(\d+)\s*hour", text)
+            if match:
+                duration_minutes = max(1, int(match.group(1))) * 60
 
         start = datetime.now() + timedelta(hours=1)
-        end = start + timedelta(hours=duration_hours)
+        end = start + timedelta(minutes=duration_minutes)
         return start, end
 
     def _extract_budget(self, text: str) -> Optional[int]:
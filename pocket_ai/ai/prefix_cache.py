@@ -0,0 +1,124 @@
+"""
+Evaluated prompt-prefix cache for the local LLM.
+
+Easy tool templates start with a long fixed instruction block; re-evaluating
+it on every call costs a full prefill. Callers ``register()`` such static
+prefixes once. On each generation, the local LLM looks up the longest
+registered prefix of its prompt, restores the model state saved right after
+evaluating that prefix (llama.cpp ``save_state``/``load_state``), and only
+evaluates the remainder.
+
+States are kept per model in an LRU bounded by entry count and bytes, and
+are dropped when their model is unloaded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pocket_ai.core.config import PrefixCacheConfig, get_config
+from pocket_ai.core.logger import logger
+from pocket_ai.core.model_manager import MB
+from pocket_ai.core.tracing import tracer
+
+
+def static_prefix(template: str) -> str:
+    """
+    The part of a ``{{placeholder}}`` template before its first placeholder.
+    """
+    return template.split("{{", 1)[0]
+
+
+def state_size(state: Any) -> int:
+    return int(getattr(state, "llama_state_size", 0) or 0)
+
+
+class PrefixCache:
+    def __init__(self):
+        self._prefixes: List[str] = []
+        self._states: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def settings(self) -> PrefixCacheConfig:
+        return get_config().prefix_cache
+
+    def register(self, prefix: str) -> bool:
+        """
+        Remember a static prompt prefix worth caching; short ones are ignored.
+        """
+        if len(prefix) < self.settings.min_prefix_chars:
+            return False
+        with self._lock:
+            if prefix not in self._prefixes:
+                self._prefixes.append(prefix)
+                self._prefixes.sort(key=len, reverse=True)
+        return True
+
+    def match(self, prompt: str) -> Optional[str]:
+        if not self.settings.enabled:
+            return None
+        for prefix in self._prefixes:  # longest first
+            if prompt.startswith(prefix):
+                return prefix
+        return None
+
+    def get_or_build(self, model: str, prefix: str, build: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Return ``(state, hit)``. On a miss ``build()`` evaluates the prefix and
+        its state is cached. Callers run on the model's compute pool, so builds
+        for one model never race.
+        """
+        key = (model, prefix)
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+                self.hits += 1
+                return state, True
+            self.misses += 1
+
+        start = time.perf_counter()
+        state = build()
+        tracer.record("llm_prefix_eval", (time.perf_counter() - start) * 1000)
+        with self._lock:
+            self._states[key] = state
+            self._bytes += state_size(state)
+            self._evict_locked()
+        return state, False
+
+    def invalidate(self, model: str):
+        with self._lock:
+            for key in [key for key in self._states if key[0] == model]:
+                self._bytes -= state_size(self._states.pop(key))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "prefixes": len(self._prefixes),
+            "entries": len(self._states),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _evict_locked(self):
+        settings = self.settings
+        budget = settings.max_mb * MB
+        while self._states and (len(self._states) > settings.max_entries or self._bytes > budget):
+            (model, _), state = self._states.popitem(last=False)
+            self._bytes -= state_size(state)
+            self.evictions += 1
+            logger.debug(f"Evicted cached prompt prefix for {model}")
+
+
+prefix_cache = PrefixCache()
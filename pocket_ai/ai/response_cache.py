@@ -0,0 +1,142 @@
+"""
+Prompt -> response cache for the LLM fallback and easy tools.
+
+Entries are keyed on (privacy profile, model, normalised prompt hash), so a
+profile switch never serves an answer produced under a different policy. The
+in-memory tier is a TTL'd LRU; an optional second tier persists responses
+through ``DataLifecycleManager`` (encrypted, ``llm_cache`` category) so they
+survive restarts. Prompts themselves are never stored, only their hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from pocket_ai.core.config import ResponseCacheConfig, get_config
+from pocket_ai.core.logger import logger
+from pocket_ai.core.storage import DataLifecycleManager, storage
+
+
+CACHE_CATEGORY = "llm_cache"
+
+
+def normalise_prompt(prompt: str) -> str:
+    return " ".join(prompt.split())
+
+
+class ResponseCache:
+    def __init__(self, store: DataLifecycleManager = storage):
+        self.store = store
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def settings(self) -> ResponseCacheConfig:
+        return get_config().llm_cache
+
+    def key(self, model: str, prompt: str) -> str:
+        material = f"{get_config().profile}\0{model}\0{normalise_prompt(prompt)}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        if not self.settings.enabled:
+            return None
+        key = self.key(model, prompt)
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+            del self._entries[key]
+
+        if self.settings.persist:
+            try:
+                record = self.store.retrieve(CACHE_CATEGORY, key)
+            except Exception as exc:
+                logger.warning(f"Ignoring unreadable cached response: {exc}")
+                record = None
+            if isinstance(record, dict) and record.get("expires_at", 0) > now:
+                self._remember(key, record["expires_at"], record["response"])
+                self.hits += 1
+                return record["response"]
+        self.misses += 1
+        return None
+
+    def put(self, model: str, prompt: str, response: str, ttl_seconds: Optional[float] = None):
+        settings = self.settings
+        if not settings.enabled or not response:
+            return
+        key = self.key(model, prompt)
+        expires_at = time.time() + (settings.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        self._remember(key, expires_at, response)
+        if settings.persist:
+            try:
+                self.store.store(CACHE_CATEGORY, key, {"response": response, "expires_at": expires_at})
+            except OSError as exc:
+                logger.warning(f"Could not persist cached response: {exc}")
+
+    async def get_or_generate(
+        self,
+        model: str,
+        prompt: str,
+        generate: Callable[[], Awaitable[Optional[str]]],
+        ttl_seconds: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Return the cached response or ``await generate()``. Only a non-empty
+        result is cached; failures must raise or return ``None``, not text.
+        """
+        cached = self.get(model, prompt)
+        if cached is not None:
+            return cached
+        response = await generate()
+        if response:
+            self.put(model, prompt, response, ttl_seconds)
+        return response
+
+    async def stream_or_generate(
+        self,
+        model: str,
+        prompt: str,
+        stream: Callable[[], AsyncIterator[str]],
+        ttl_seconds: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming ``get_or_generate``: a hit is yielded as one chunk; a miss
+        yields tokens as they arrive and is cached only if the stream completes
+        (a stream that raises or is closed early stores nothing).
+        """
+        cached = self.get(model, prompt)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        async for token in stream():
+            parts.append(token)
+            yield token
+        response = "".join(parts)
+        if response:
+            self.put(model, prompt, response, ttl_seconds)
+
+    def clear(self):
+        self._entries.clear()
+        self.store.delete_category(CACHE_CATEGORY)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remember(self, key: str, expires_at: float, response: str):
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(0, self.settings.max_entries):
+            self._entries.popitem(last=False)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,41 @@
+"""
+Helpers shared by the token-streaming LLM paths.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import AsyncIterator, List, Optional
+
+from pocket_ai.core.tracing import tracer
+
+
+TOKEN_CHUNK_RE = re.compile(r"\S+\s*|\s+")
+
+
+def stub_tokens(text: str) -> List[str]:
+    """
+    Deterministic "tokens" (words with their trailing whitespace) for the
+    stub backends; joining them gives back ``text`` exactly.
+    """
+    return TOKEN_CHUNK_RE.findall(text)
+
+
+class FirstTokenTimer:
+    """
+    Wraps a token stream and records the time to its first token under
+    ``<stage>_first_token`` in the tracer.
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.first_token_ms: Optional[float] = None
+        self._start = time.perf_counter()
+
+    async def wrap(self, tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+        async for token in tokens:
+            if self.first_token_ms is None and token:
+                self.first_token_ms = round((time.perf_counter() - self._start) * 1000, 3)
+                tracer.record(f"{self.stage}_first_token", self.first_token_ms)
+            yield token
@@ -1,22 +1,55 @@
 from __future__ import annotations
 
+import json
+
 from pocket_ai.audio.noise_suppression import noise_suppressor
 from pocket_ai.core.logger import logger
+from pocket_ai.core.model_manager import ModelSpec, ModelUnavailable, model_manager
+
+VOSK_MODEL_DIR = "vosk-model-small-en-us-0.15"
+SAMPLE_RATE = 16000
+
+
+def load_vosk(path: str):
+    try:
+        from vosk import Model  # type: ignore[import]
+    except ImportError as exc:
+        raise ModelUnavailable("vosk is not installed") from exc
+    return Model(path)
 
 
 class OfflineSpeech:
     """
-    Thin wrapper that would normally drive Vosk/Whisper-tiny.
-    For now we provide a deterministic stub that still logs the audio path.
+    Thin wrapper that drives Vosk when it and its model are installed.
+    Otherwise we provide a deterministic stub that still logs the audio path.
     """
 
     def __init__(self):
         self.model_name = "vosk-small-en"
+        model_manager.register(
+            ModelSpec(self.model_name, VOSK_MODEL_DIR, loader=load_vosk, workload="asr", warmup=self._warm_up)
+        )
+
+    @staticmethod
+    def _warm_up(model):
+        from vosk import KaldiRecognizer  # type: ignore[import]
+
+        recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+        recognizer.AcceptWaveform(bytes(SAMPLE_RATE // 5))  # 100 ms of silence
+        recognizer.FinalResult()
 
     def transcribe(self, audio_data: bytes) -> str:
         cleaned = noise_suppressor.denoise(audio_data)
         logger.info(f"Offline ASR ({self.model_name}) processing {len(cleaned)} bytes")
-        # Real implementation would feed into Vosk recogniser
+        try:
+            with model_manager.use(self.model_name) as model:
+                from vosk import KaldiRecognizer  # type: ignore[import]
+
+                recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+                recognizer.AcceptWaveform(cleaned)
+                return json.loads(recognizer.FinalResult()).get("text", "")
+        except ModelUnavailable as exc:
+            logger.debug(f"Offline ASR model unavailable: {exc}")
         return "transcription unavailable (demo)"
 
 
@@ -1,13 +1,17 @@
 from pocket_ai.core.policy_engine import policy_engine
+from pocket_ai.core.rate_limiter import cloud_rate_limiter
 from pocket_ai.core.logger import logger
 
 class OnlineSpeech:
-    def transcribe(self, audio_data: bytes) -> str:
+    model = "whisper-1"
+
+    async def transcribe(self, audio_data: bytes) -> str:
         if not policy_engine.can_use_cloud("speech_online"):
             logger.warning("Online speech blocked")
             return ""
-        
-        logger.info("Calling Whisper API...")
-        return "Mock Whisper Transcription"
+
+        async with cloud_rate_limiter.acquire("openai", self.model):
+            logger.info("Calling Whisper API...")
+            return "Mock Whisper Transcription"
 
 speech_online = OnlineSpeech()
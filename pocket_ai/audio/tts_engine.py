@@ -1,7 +1,15 @@
 from pocket_ai.core.config import get_config
 from pocket_ai.core.logger import logger
+from pocket_ai.core.model_manager import ModelSpec, load_onnx, model_manager
+
+PIPER_VOICE = "en_US-lessac-medium.onnx"
 
 class TTSEngine:
+    def __init__(self):
+        self.model_name = "piper-lessac"
+        # Registered so the voice shows up in model state and can be preloaded.
+        model_manager.register(ModelSpec(self.model_name, PIPER_VOICE, loader=load_onnx, workload="tts"))
+
     def speak(self, text: str):
         logger.info(f"TTS Speaking: {text}")
         # Implement Piper or Coqui here
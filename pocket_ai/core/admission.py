@@ -0,0 +1,163 @@
+"""
+Admission control in front of the orchestrator.
+
+Every command takes a slot before it runs. When all slots are busy, callers
+wait in per-source queues that are drained in priority order
+(voice > ui > mcp). A full queue is rejected immediately instead of piling
+up work the device cannot finish. MCP automation is also capped below the
+total so an interactive slot is always left free.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+from pocket_ai.core.config import AdmissionConfig, get_config
+from pocket_ai.core.logger import logger
+from pocket_ai.core.tracing import tracer
+
+
+# Lower value = served first.
+PRIORITIES = {"voice": 0, "ui": 1, "mcp": 2}
+BACKGROUND_SOURCES = {"mcp"}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is turned away because the assistant is busy."""
+
+    def __init__(self, source: str, reason: str, retry_after: float = 1.0):
+        super().__init__(f"Assistant busy ({reason}) for {source} request")
+        self.source = source
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionTicket:
+    """
+    A granted slot. ``release()`` is idempotent so it can be wired to several
+    cleanup paths (e.g. stream end and response teardown).
+    """
+
+    __slots__ = ("_controller", "source", "_released")
+
+    def __init__(self, controller: "AdmissionController", source: str):
+        self._controller = controller
+        self.source = source
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._controller._release(self.source)
+
+
+class AdmissionController:
+    def __init__(self):
+        self._active: Dict[str, int] = {source: 0 for source in PRIORITIES}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {source: deque() for source in PRIORITIES}
+        self._admitted: Dict[str, int] = {source: 0 for source in PRIORITIES}
+        self._rejected: Dict[str, int] = {source: 0 for source in PRIORITIES}
+
+    @property
+    def settings(self) -> AdmissionConfig:
+        return get_config().admission
+
+    @asynccontextmanager
+    async def slot(self, source: str) -> AsyncIterator[AdmissionTicket]:
+        ticket = await self.acquire(source)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    async def acquire(self, source: str) -> AdmissionTicket:
+        if source not in PRIORITIES:
+            raise ValueError(f"Unknown request source: {source}")
+        settings = self.settings
+        started = time.perf_counter()
+
+        if self._can_start(source) and not self._has_waiters_ahead(source):
+            self._start(source)
+            return self._admit(source, started)
+
+        queue = self._waiters[source]
+        if len(queue) >= settings.queue_limits.get(source, 0):
+            self._reject(source, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=settings.queue_timeout_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we gave up: hand the slot on.
+                self._release(source)
+            elif waiter in queue:
+                queue.remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self._reject(source, "queue_timeout")
+            raise
+        return self._admit(source, started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        stages = tracer.stage_stats()
+        return {
+            "max_concurrent": self.settings.max_concurrent,
+            "active": dict(self._active),
+            "queued": {source: len(queue) for source, queue in self._waiters.items()},
+            "admitted": dict(self._admitted),
+            "rejected": dict(self._rejected),
+            "queue_wait": {
+                source: stages[f"admission_wait:{source}"]
+                for source in PRIORITIES
+                if f"admission_wait:{source}" in stages
+            },
+        }
+
+    def _admit(self, source: str, started: float) -> AdmissionTicket:
+        self._admitted[source] += 1
+        tracer.record(f"admission_wait:{source}", (time.perf_counter() - started) * 1000)
+        return AdmissionTicket(self, source)
+
+    def _reject(self, source: str, reason: str):
+        self._rejected[source] += 1
+        logger.warning(f"Admission rejected {source} request: {reason}")
+        raise AdmissionRejected(source, reason)
+
+    def _can_start(self, source: str) -> bool:
+        settings = self.settings
+        limit = max(1, settings.max_concurrent)
+        if sum(self._active.values()) >= limit:
+            return False
+        if source in BACKGROUND_SOURCES:
+            background_limit = max(1, limit - settings.reserved_interactive)
+            return sum(self._active[name] for name in BACKGROUND_SOURCES) < background_limit
+        return True
+
+    def _has_waiters_ahead(self, source: str) -> bool:
+        rank = PRIORITIES[source]
+        return any(self._waiters[name] for name, priority in PRIORITIES.items() if priority <= rank)
+
+    def _start(self, source: str):
+        self._active[source] += 1
+
+    def _release(self, source: str):
+        self._active[source] -= 1
+        self._wake()
+
+    def _wake(self):
+        for source in sorted(PRIORITIES, key=PRIORITIES.get):
+            queue = self._waiters[source]
+            while queue and self._can_start(source):
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                self._start(source)
+                waiter.set_result(None)
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,207 @@
+"""
+Latency- and load-aware routing between compute backends.
+
+For every (task, backend) pair the router keeps an exponentially weighted
+moving average of latency and error rate, plus the number of calls in
+flight. ``rank()`` orders the permissible backends by expected latency
+(EWMA scaled by queued load and inflated by recent errors), using the
+configured priors until a backend has been measured. A backend that fails
+``failure_threshold`` times in a row is skipped for ``cooldown_s`` and then
+retried (half-open), and ``call()``/``stream()`` fail over to the next
+backend automatically.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+from pocket_ai.core.config import BackendRoutingConfig, get_config
+from pocket_ai.core.logger import logger
+
+
+B = TypeVar("B", bound=Hashable)
+T = TypeVar("T")
+
+MAX_ERROR_PENALTY = 0.9
+
+
+def backend_name(backend: Any) -> str:
+    return str(getattr(backend, "value", backend))
+
+
+class BackendHealth:
+    __slots__ = ("ewma_ms", "error_rate", "in_flight", "calls", "failures", "consecutive_failures", "down_until")
+
+    def __init__(self):
+        self.ewma_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.down_until = 0.0
+
+    def as_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "ewma_ms": None if self.ewma_ms is None else round(self.ewma_ms, 2),
+            "error_rate": round(self.error_rate, 3),
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "available": self.down_until <= now,
+        }
+
+
+class BackendRouter:
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._health: Dict[Tuple[str, str], BackendHealth] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self) -> BackendRoutingConfig:
+        return get_config().backend_routing
+
+    def rank(self, task: str, candidates: List[B]) -> List[B]:
+        """
+        Candidates best-first; backends cooling down after failures go last.
+        Ties keep the caller's order.
+        """
+        now = self.clock()
+        with self._lock:
+            scored = []
+            for order, backend in enumerate(candidates):
+                health = self._health.get((task, backend_name(backend)))
+                cooling = health is not None and health.down_until > now
+                scored.append((cooling, self._expected_ms(backend, health), order, backend))
+        scored.sort(key=lambda item: item[:3])
+        return [backend for *_, backend in scored]
+
+    def choose(self, task: str, candidates: List[B]) -> B:
+        return self.rank(task, candidates)[0]
+
+    @contextmanager
+    def track(self, task: str, backend: Any) -> Iterator[None]:
+        """
+        Count a call as in flight and record its latency and outcome.
+        Abandoned calls (e.g. a closed stream) are not recorded.
+        """
+        health = self._get(task, backend)
+        self._adjust_in_flight(health, 1)
+        start = time.perf_counter()
+        ok: Optional[bool] = None
+        try:
+            yield
+            ok = True
+        except Exception:
+            ok = False
+            raise
+        finally:
+            self._adjust_in_flight(health, -1)
+            if ok is not None:
+                self.record(task, backend, (time.perf_counter() - start) * 1000, ok)
+
+    def record(self, task: str, backend: Any, elapsed_ms: float, ok: bool):
+        settings = self.settings
+        alpha = settings.ewma_alpha
+        health = self._get(task, backend)
+        with self._lock:
+            health.calls += 1
+            health.error_rate = (1 - alpha) * health.error_rate + (0.0 if ok else alpha)
+            if ok:
+                health.consecutive_failures = 0
+                health.ewma_ms = elapsed_ms if health.ewma_ms is None else (1 - alpha) * health.ewma_ms + alpha * elapsed_ms
+                return
+            health.failures += 1
+            health.consecutive_failures += 1
+            if health.consecutive_failures < settings.failure_threshold:
+                return
+            health.consecutive_failures = 0
+            health.down_until = self.clock() + settings.cooldown_s
+        logger.warning(f"{task} backend {backend_name(backend)} failing; out of rotation for {settings.cooldown_s:.0f}s")
+
+    def call(self, task: str, runners: Dict[B, Callable[[], T]]) -> T:
+        """
+        Run on the best backend, failing over to the next on an exception.
+        """
+        ranked = self.rank(task, list(runners))
+        for index, backend in enumerate(ranked):
+            try:
+                with self.track(task, backend):
+                    return runners[backend]()
+            except Exception as exc:
+                if index == len(ranked) - 1:
+                    raise
+                logger.warning(f"{task} on {backend_name(backend)} failed ({exc}); failing over")
+        raise ValueError(f"No backend available for {task}")
+
+    def stream(self, task: str, runners: Dict[B, Callable[[], Iterator[T]]]) -> Iterator[T]:
+        """
+        Like ``call`` for generators. A stream counts as in flight until it
+        ends but is scored on its time to first item, and fails over only
+        until it has produced one.
+        """
+        ranked = self.rank(task, list(runners))
+        for index, backend in enumerate(ranked):
+            health = self._get(task, backend)
+            self._adjust_in_flight(health, 1)
+            start = time.perf_counter()
+            try:
+                try:
+                    items = iter(runners[backend]())
+                    first = next(items, _END)
+                except Exception as exc:
+                    self.record(task, backend, (time.perf_counter() - start) * 1000, False)
+                    if index == len(ranked) - 1:
+                        raise
+                    logger.warning(f"{task} on {backend_name(backend)} failed ({exc}); failing over")
+                    continue
+                self.record(task, backend, (time.perf_counter() - start) * 1000, True)
+                if first is not _END:
+                    yield first
+                    yield from items
+                return
+            finally:
+                self._adjust_in_flight(health, -1)
+        raise ValueError(f"No backend available for {task}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        now = self.clock()
+        with self._lock:
+            snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for (task, name), health in self._health.items():
+                snapshot.setdefault(task, {})[name] = health.as_dict(now)
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._health.clear()
+
+    def _get(self, task: str, backend: Any) -> BackendHealth:
+        key = (task, backend_name(backend))
+        with self._lock:
+            health = self._health.get(key)
+            if health is None:
+                health = self._health[key] = BackendHealth()
+            return health
+
+    def _adjust_in_flight(self, health: BackendHealth, delta: int):
+        with self._lock:
+            health.in_flight += delta
+
+    def _expected_ms(self, backend: Any, health: Optional[BackendHealth]) -> float:
+        if health is None or health.ewma_ms is None:
+            base = self.settings.prior_ms.get(backend_name(backend), 1000.0)
+        else:
+            base = health.ewma_ms
+        if health is None:
+            return base
+        return base * (1 + health.in_flight) / (1 - min(health.error_rate, MAX_ERROR_PENALTY))
+
+
+_END = object()
+
+backend_router = BackendRouter()
@@ -0,0 +1,66 @@
+"""
+Single-flight coalescing for identical concurrent requests.
+
+UI retries and MCP clients often send the same command or tool payload while
+the first copy is still running. ``SingleFlight.run`` lets those duplicates
+await the original execution instead of repeating it (plugin network calls
+included). Only in-flight work is shared; nothing is cached after it finishes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+def request_key(*parts: Any) -> str:
+    """
+    Stable hash of JSON-like request parts (dict key order does not matter).
+    """
+    blob = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        self._waiters[task] += 1
+        try:
+            # Shielded so one caller leaving does not cancel the others' result.
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(task) == 1:
+                task.cancel()  # last interested caller is gone
+            raise
+        finally:
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        self._waiters.pop(task, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"inflight": len(self._inflight), "executed": self.executed, "coalesced": self.coalesced}
@@ -1,60 +1,183 @@
+import os
+import platform
+import threading
+import time
 from enum import Enum
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, TypeVar
+
+import httpx
+
+from pocket_ai.core.backend_router import BackendRouter, backend_router
 from pocket_ai.core.config import get_config
 from pocket_ai.core.logger import logger
 
+T = TypeVar("T")
+
+# Tasks each backend can serve; the CPU serves everything.
+TPU_TASKS = {"vision"}
+GPU_SERVER_TASKS = {"vision", "llm"}
+
 class BackendType(Enum):
     PI_CPU = "PI_CPU"
     PI_TPU = "PI_TPU"
     GPU_SERVER = "GPU_SERVER"
 
+
+def edgetpu_library() -> str:
+    return {"Linux": "libedgetpu.so.1", "Darwin": "libedgetpu.1.dylib"}.get(platform.system(), "edgetpu.dll")
+
+
 class ComputeBackends:
-    def __init__(self):
+    def __init__(self, router: BackendRouter = backend_router):
         self.config = get_config()
-        self.tpu_available = False
-        self.gpu_server_available = False
-        self._detect_hardware()
+        self.router = router
+        self._tpu_available = False
+        self._gpu_server_available = False
+        self.probes: Dict[str, Dict[str, Any]] = {}
+        # Probing loads native delegates and pings the network, so it waits
+        # for app startup (or first use) rather than running at import.
+        self._probed = False
+        self._probe_lock = threading.Lock()
+
+    @property
+    def tpu_available(self) -> bool:
+        self.ensure_probed()
+        return self._tpu_available
+
+    @tpu_available.setter
+    def tpu_available(self, value: bool):
+        self._probed = True
+        self._tpu_available = value
+
+    @property
+    def gpu_server_available(self) -> bool:
+        self.ensure_probed()
+        return self._gpu_server_available
+
+    @gpu_server_available.setter
+    def gpu_server_available(self, value: bool):
+        self._probed = True
+        self._gpu_server_available = value
+
+    def ensure_probed(self):
+        if self._probed:
+            return
+        with self._probe_lock:
+            if not self._probed:
+                self._detect_hardware()
 
     def _detect_hardware(self):
-        # 1. Detect TPU
+        self._tpu_available = self.probe_edgetpu()
+        self._gpu_server_available = self.probe_gpu_server()
+        self._probed = True
+
+    def refresh(self):
+        """
+        Re-probe the hardware, e.g. after plugging in an accelerator.
+        """
+        with self._probe_lock:
+            self._detect_hardware()
+
+    def probe_edgetpu(self) -> bool:
+        """
+        Try to load the Edge TPU delegate, which only succeeds with
+        libedgetpu installed and an accelerator attached.
+        """
+        start = time.perf_counter()
         try:
-            # Simple check: look for the library or device
-            # Real impl would check usb devices or try loading delegate
-            import platform
-            lib_name = 'libedgetpu.so.1' if platform.system() == 'Linux' else 'edgetpu.dll'
-            # We assume if we can't load it, it's not there. 
-            # For prototype, we'll just check a flag or mock it.
-            # self.tpu_available = True 
-            pass
-        except:
-            pass
-            
-        # 2. Detect GPU Server
-        # Check config for GPU server URL and ping it
-        if self.config.feature_flags.get("gpu_server_url"):
-            self.gpu_server_available = True # Mock check
+            try:
+                from tflite_runtime.interpreter import load_delegate  # type: ignore[import]
+            except ImportError:
+                from tensorflow.lite.experimental import load_delegate  # type: ignore[import]
+            load_delegate(edgetpu_library())
+            ok, error = True, None
+        except Exception as exc:  # ImportError, or ValueError/OSError from the delegate loader
+            ok, error = False, str(exc)
+        self.probes["tpu"] = {"ok": ok, "error": error, "probe_ms": round((time.perf_counter() - start) * 1000, 2)}
+        if ok:
+            logger.info("Edge TPU delegate loaded")
+        else:
+            logger.debug(f"No Edge TPU: {error}")
+        return ok
+
+    def probe_gpu_server(self) -> bool:
+        """
+        Health-ping the configured GPU inference server.
+        """
+        settings = self.config.backend_routing
+        url = settings.gpu_server_url
+        if not url:
+            self.probes["gpu_server"] = {"ok": False, "error": "not configured"}
+            return False
+        start = time.perf_counter()
+        try:
+            response = httpx.get(url.rstrip("/") + settings.health_path, timeout=settings.probe_timeout_s)
+            ok = response.status_code == 200
+            error = None if ok else f"HTTP {response.status_code}"
+        except httpx.HTTPError as exc:
+            ok, error = False, str(exc) or type(exc).__name__
+        self.probes["gpu_server"] = {
+            "ok": ok,
+            "error": error,
+            "url": url,
+            "probe_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+        if not ok:
+            logger.warning(f"GPU server {url} unavailable: {error}")
+        return ok
+
+    def candidates(self, task_type: str) -> List[BackendType]:
+        """
+        Backends permitted for a task, in static preference order.
+        """
+        # OFFLINE_ONLY never sends work to the GPU server.
+        allow_remote = self.config.profile != "OFFLINE_ONLY"
+        backends = []
+        if task_type in TPU_TASKS and self.tpu_available:
+            backends.append(BackendType.PI_TPU)
+        if task_type in GPU_SERVER_TASKS and allow_remote and self.gpu_server_available:
+            backends.append(BackendType.GPU_SERVER)
+        backends.append(BackendType.PI_CPU)
+        return backends
 
     def get_backend_for_task(self, task_type: str) -> BackendType:
         """
-        Decide which backend to use for a task (vision, stt, llm).
-        """
-        # 1. Check Profile (OFFLINE_ONLY blocks GPU_SERVER unless trusted)
-        profile = self.config.profile
-        allow_remote = (profile != "OFFLINE_ONLY")
-        
-        # 2. Task Specific Logic
-        if task_type == "vision":
-            if self.tpu_available:
-                return BackendType.PI_TPU
-            if allow_remote and self.gpu_server_available:
-                return BackendType.GPU_SERVER
-            return BackendType.PI_CPU
-            
-        elif task_type == "llm":
-            if allow_remote and self.gpu_server_available:
-                return BackendType.GPU_SERVER
-            return BackendType.PI_CPU
-            
-        return BackendType.PI_CPU
+        The backend expected to be fastest right now for a task (vision, stt, llm).
+        """
+        return self.router.choose(task_type, self.candidates(task_type))
+
+    def run(self, task_type: str, runners: Dict[BackendType, Callable[[], T]]) -> T:
+        """
+        Run on the fastest permitted backend that has a runner, failing over
+        to the others.
+        """
+        return self.router.call(task_type, self._permitted(task_type, runners))
+
+    def stream(self, task_type: str, runners: Dict[BackendType, Callable[[], Iterator[T]]]) -> Iterator[T]:
+        return self.router.stream(task_type, self._permitted(task_type, runners))
+
+    def snapshot(self) -> Dict[str, Any]:
+        self.ensure_probed()
+        return {"hardware": self.probes, "routing": self.router.snapshot()}
+
+    def _permitted(self, task_type: str, runners: Dict[BackendType, Any]) -> Dict[BackendType, Any]:
+        return {backend: runners[backend] for backend in self.candidates(task_type) if backend in runners}
+
+    def max_workers(self, task_type: str) -> int:
+        """
+        How many calls of a task type may run at once (asr, llm, tts, vision, embed).
+
+        Local models hold one interpreter/context that is not safe to share
+        across threads, so on-device work is serialized; remote backends are
+        I/O bound and can overlap. ``POCKET_<TASK>_WORKERS`` overrides this.
+        """
+        if override := os.environ.get(f"POCKET_{task_type.upper()}_WORKERS"):
+            try:
+                return max(1, int(override))
+            except ValueError:
+                logger.warning(f"Ignoring invalid worker override for {task_type}: {override}")
+        if self.get_backend_for_task(task_type) == BackendType.GPU_SERVER:
+            return 4
+        return 1
 
 compute_backends = ComputeBackends()
@@ -61,6 +61,130 @@ class MCPConfig(BaseModel):
     require_auth: bool = True
 
 
+class AdmissionConfig(BaseModel):
+    max_concurrent: int = 4
+    # Slots MCP automation may never take, so voice/UI always have room.
+    reserved_interactive: int = 1
+    queue_limits: Dict[str, int] = Field(default_factory=lambda: {"voice": 4, "ui": 16, "mcp": 8})
+    queue_timeout_s: float = 15.0
+
+
+class TimeoutConfig(BaseModel):
+    request_s: float = 30.0
+    plugin_s: float = 15.0
+    llm_s: float = 20.0
+
+
+class ResponseCacheConfig(BaseModel):
+    enabled: bool = True
+    max_entries: int = 256
+    ttl_seconds: float = 900.0
+    # Also keep responses in the encrypted ``llm_cache`` storage category.
+    persist: bool = False
+
+
+class IntentClassifierConfig(BaseModel):
+    enabled: bool = True
+    # Minimum softmax confidence before a paraphrase is trusted over the LLM.
+    threshold: float = 0.6
+    # Defaults to pocket_ai/ai/intent_examples.yaml.
+    examples_path: Optional[str] = None
+
+
+class ModelManagerConfig(BaseModel):
+    # RAM the local models may hold at once; least-recently-used ones are
+    # unloaded to make room.
+    memory_budget_mb: int = 3072
+    # Unload a model nobody has used for this long (0 disables).
+    idle_unload_s: float = 900.0
+    reaper_interval_s: float = 30.0
+    # Hot models loaded and warmed in the background at startup, in order.
+    prewarm: List[str] = Field(default_factory=lambda: ["vosk-small-en", "piper-lessac", "phi-2", "mobilenet_v2"])
+    prewarm_on_startup: bool = True
+
+
+class LLMSchedulerConfig(BaseModel):
+    enabled: bool = True
+    # Sequences decoded together per step; the runtime may allow fewer.
+    max_batch_size: int = 8
+    max_new_tokens: int = 256
+    # Requests waiting for a batch slot before new ones are turned away.
+    max_pending: int = 64
+
+
+class PrefixCacheConfig(BaseModel):
+    enabled: bool = True
+    # Saved model states kept per process, bounded by count and by size.
+    max_entries: int = 8
+    max_mb: int = 256
+    # Shorter static prefixes are cheaper to re-evaluate than to restore.
+    min_prefix_chars: int = 32
+
+
+class HTTPClientConfig(BaseModel):
+    # One pooled client per gateway; connections are kept alive between calls.
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_s: float = 30.0
+    # Needs the ``h2`` package (``httpx[http2]``); HTTP/1.1 is used without it.
+    http2: bool = True
+    connect_timeout_s: float = 5.0
+    read_timeout_s: float = 30.0
+    # Retries on 429/5xx and transport errors, with jittered exponential backoff.
+    max_retries: int = 3
+    backoff_base_s: float = 0.25
+    backoff_max_s: float = 8.0
+    # Send a duplicate of a buffered request still unanswered after this
+    # long and keep whichever answers first (None disables hedging).
+    hedge_after_s: Optional[float] = None
+
+
+class RateLimit(BaseModel):
+    requests_per_min: float = 60.0
+    # None leaves token throughput unlimited (e.g. for audio endpoints).
+    tokens_per_min: Optional[float] = None
+    max_concurrent: int = 4
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    default: RateLimit = Field(default_factory=RateLimit)
+    # Keyed "provider:model" or "provider"; the most specific entry wins.
+    limits: Dict[str, RateLimit] = Field(
+        default_factory=lambda: {
+            "openai": RateLimit(requests_per_min=500, tokens_per_min=200000, max_concurrent=8),
+            "openai:gpt-4": RateLimit(requests_per_min=500, tokens_per_min=10000, max_concurrent=4),
+            "openai:whisper-1": RateLimit(requests_per_min=50, max_concurrent=2),
+        }
+    )
+
+    def limit_for(self, provider: str, model: str) -> RateLimit:
+        return self.limits.get(f"{provider}:{model}") or self.limits.get(provider) or self.default
+
+
+class BackendRoutingConfig(BaseModel):
+    # Remote inference server; probed at startup with GET <url><health_path>.
+    gpu_server_url: Optional[str] = None
+    health_path: str = "/health"
+    probe_timeout_s: float = 1.0
+    # Weight of the newest sample in the latency and error-rate averages.
+    ewma_alpha: float = 0.2
+    # Consecutive failures that take a backend out of rotation for cooldown_s.
+    failure_threshold: int = 3
+    cooldown_s: float = 30.0
+    # Assumed latency of a backend not yet measured for a task; keeps the
+    # static preference (TPU, then GPU server, then CPU) until data arrives.
+    prior_ms: Dict[str, float] = Field(
+        default_factory=lambda: {"PI_TPU": 20.0, "GPU_SERVER": 100.0, "PI_CPU": 400.0}
+    )
+
+
+class OpenAIGatewayConfig(BaseModel):
+    base_url: str = "https://api.openai.com/v1"
+    vision_model: str = "gpt-4o-mini"
+    http: HTTPClientConfig = Field(default_factory=HTTPClientConfig)
+
+
 class Config(BaseModel):
     profile: str = "OFFLINE_ONLY"
     storage_path: str = "data"
@@ -69,6 +193,16 @@ class Config(BaseModel):
     cloud_overrides: Dict[str, bool] = Field(default_factory=dict)
     api: ApiSecurity = Field(default_factory=ApiSecurity)
     mcp: MCPConfig = Field(default_factory=MCPConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    timeouts: TimeoutConfig = Field(default_factory=TimeoutConfig)
+    llm_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
+    intent_classifier: IntentClassifierConfig = Field(default_factory=IntentClassifierConfig)
+    models: ModelManagerConfig = Field(default_factory=ModelManagerConfig)
+    llm_scheduler: LLMSchedulerConfig = Field(default_factory=LLMSchedulerConfig)
+    prefix_cache: PrefixCacheConfig = Field(default_factory=PrefixCacheConfig)
+    openai: OpenAIGatewayConfig = Field(default_factory=OpenAIGatewayConfig)
+    rate_limits: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    backend_routing: BackendRoutingConfig = Field(default_factory=BackendRoutingConfig)
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -111,6 +245,16 @@ def load_config(config_path: str = "config.yaml") -> Config:
         "cloud_overrides": {},
         "api": {},
         "mcp": {},
+        "admission": {},
+        "timeouts": {},
+        "llm_cache": {},
+        "intent_classifier": {},
+        "models": {},
+        "llm_scheduler": {},
+        "prefix_cache": {},
+        "openai": {},
+        "rate_limits": {},
+        "backend_routing": {},
     }
 
     if os.path.exists(config_path):
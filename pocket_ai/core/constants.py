@@ -62,6 +62,12 @@ DATA_CATEGORIES: Dict[str, Dict[str, object]] = {
         "ttl_seconds": 0,
         "encrypted": True,
     },
+    "llm_cache": {
+        "description": "Cached assistant/easy-tool responses (keyed by prompt hash)",
+        "storage": "disk",
+        "ttl_seconds": 60 * 60 * 24,
+        "encrypted": True,
+    },
     "user_exports": {
         "description": "Encrypted data export bundles for user download",
         "storage": "disk",
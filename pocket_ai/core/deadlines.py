@@ -0,0 +1,99 @@
+"""
+Per-request deadlines.
+
+The orchestrator opens a deadline scope for every command. The deadline lives
+in a contextvar, so anything awaited for that request (handlers, plugins, the
+LLM fallback, and tasks spawned from it) sees the same budget. ``ToolContext``
+picks it up automatically, and plugins can size their own network timeouts
+from ``context.timeout()``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage runs past its budget or the request deadline."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"{stage} timed out")
+        self.stage = stage
+
+
+class Deadline:
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("pocket_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """
+    Run the block under a deadline ``seconds`` from now. An enclosing, tighter
+    deadline always wins; ``None`` keeps whatever is already in effect.
+    """
+    outer = _current_deadline.get()
+    if seconds is None or (outer is not None and outer.remaining() <= seconds):
+        yield outer
+        return
+    token = _current_deadline.set(Deadline(seconds))
+    try:
+        yield _current_deadline.get()
+    finally:
+        _current_deadline.reset(token)
+
+
+def time_left(budget: Optional[float] = None, deadline: Optional[Deadline] = None) -> Optional[float]:
+    """
+    Seconds available to a stage: the smaller of its own budget and what is
+    left on the request deadline. ``None`` means unbounded.
+    """
+    deadline = deadline or _current_deadline.get()
+    if deadline is None:
+        return budget
+    remaining = deadline.remaining()
+    return remaining if budget is None else min(budget, remaining)
+
+
+async def run_with_deadline(
+    awaitable: Awaitable[T],
+    stage: str,
+    budget: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+) -> T:
+    """
+    Await ``awaitable``, cancelling it and raising ``DeadlineExceeded`` once
+    the stage budget or the request deadline runs out.
+    """
+    timeout = time_left(budget, deadline)
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    except DeadlineExceeded:
+        raise
+    except asyncio.TimeoutError as exc:
+        raise DeadlineExceeded(stage) from exc
@@ -0,0 +1,129 @@
+"""
+Bounded thread pools for blocking model work (ASR, LLM, TTS, vision,
+embeddings).
+
+Model calls are synchronous and can take seconds; running them on the event
+loop would stall every other request. Each workload gets its own pool so a
+long LLM generation never queues behind, or starves, speech recognition.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, TypeVar
+
+from pocket_ai.core.compute_backends import ComputeBackends, compute_backends
+from pocket_ai.core.logger import logger
+
+
+T = TypeVar("T")
+
+WORKLOADS = ("asr", "llm", "tts", "vision", "embed")
+
+
+class ComputeExecutors:
+    """
+    Lazily created per-workload pools, sized from ``compute_backends``.
+    """
+
+    def __init__(self, backends: ComputeBackends = compute_backends):
+        self.backends = backends
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, workload: str) -> ThreadPoolExecutor:
+        pool = self._pools.get(workload)
+        if pool is not None:
+            return pool
+        if workload not in WORKLOADS:
+            raise ValueError(f"Unknown compute workload: {workload}")
+        with self._lock:
+            pool = self._pools.get(workload)
+            if pool is None:
+                size = self.backends.max_workers(workload)
+                pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"pocket-{workload}")
+                self._pools[workload] = pool
+                self._sizes[workload] = size
+                logger.debug(f"Started {workload} executor with {size} worker(s)")
+        return pool
+
+    async def run(self, workload: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Await ``func(*args, **kwargs)`` on the workload's pool.
+
+        The caller's contextvars (active trace, event sink) are carried over.
+        """
+        pool = self._pool(workload)
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(pool, call)
+
+    async def stream(self, workload: str, func: Callable[..., Iterator[T]], *args: Any, **kwargs: Any) -> AsyncIterator[T]:
+        """
+        Drive the blocking generator ``func(*args, **kwargs)`` on the workload's
+        pool and yield its items as they are produced. Closing the iterator
+        stops the generator after the item it is working on.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stopped = threading.Event()
+
+        def put(item: Any):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:  # loop already closed; nobody is listening
+                stopped.set()
+
+        def produce():
+            items = None
+            try:
+                items = func(*args, **kwargs)
+                for item in items:
+                    put((False, item))
+                    if stopped.is_set():
+                        break
+            except Exception as exc:
+                put((True, exc))
+                return
+            finally:
+                close = getattr(items, "close", None)
+                if close is not None:
+                    close()
+            put((True, None))
+
+        call = functools.partial(contextvars.copy_context().run, produce)
+        loop.run_in_executor(self._pool(workload), call)
+        try:
+            while True:
+                finished, item = await queue.get()
+                if finished:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            stopped.set()
+
+    def submit(self, workload: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """
+        Queue ``func`` on the workload's pool from synchronous code (e.g. a
+        background thread); the returned future resolves with its result.
+        """
+        return self._pool(workload).submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._sizes)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pools, self._pools = self._pools, {}
+            self._sizes.clear()
+        for pool in pools.values():
+            pool.shutdown(wait=wait)
+
+
+compute_executors = ComputeExecutors()
@@ -0,0 +1,164 @@
+"""
+Shared, pooled async HTTP client for cloud gateways.
+
+One ``httpx.AsyncClient`` per gateway keeps connections alive (and uses
+HTTP/2 when ``h2`` is installed), so concurrent chat and vision calls reuse
+warm TLS connections instead of handshaking per call. Requests are retried
+on 429/5xx and transport errors with full-jitter exponential backoff
+(``Retry-After`` wins when the server sends one). Buffered requests can be
+hedged: a duplicate is sent if the first has not answered within
+``hedge_after_s`` and the first response wins.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import httpx
+
+from pocket_ai.core.config import HTTPClientConfig
+from pocket_ai.core.logger import logger
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def backoff_delay(attempt: int, settings: HTTPClientConfig, retry_after: Optional[float] = None) -> float:
+    if retry_after is not None:
+        return min(settings.backoff_max_s, retry_after)
+    ceiling = min(settings.backoff_max_s, settings.backoff_base_s * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers["retry-after"]))
+    except (KeyError, ValueError):
+        return None
+
+
+class PooledHTTPClient:
+    def __init__(self, name: str, settings: Callable[[], HTTPClientConfig]):
+        self.name = name
+        self._settings = settings
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @property
+    def settings(self) -> HTTPClientConfig:
+        return self._settings()
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        The shared client, created on first use. Connections belong to an
+        event loop, so a new loop (e.g. a test's ``asyncio.run``) gets a new pool.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            settings = self.settings
+            self._client = httpx.AsyncClient(
+                http2=settings.http2 and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=settings.max_connections,
+                    max_keepalive_connections=settings.max_keepalive_connections,
+                    keepalive_expiry=settings.keepalive_expiry_s,
+                ),
+                timeout=httpx.Timeout(settings.read_timeout_s, connect=settings.connect_timeout_s),
+            )
+            self._loop = loop
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Buffered request with retries, hedged when ``hedge_after_s`` is set.
+        """
+        hedge_after = self.settings.hedge_after_s
+        if hedge_after is None:
+            return await self._send(method, url, kwargs, stream=False)
+        return await self._hedged(hedge_after, method, url, kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        Streaming request; retried only until the response headers arrive,
+        never once the body has started.
+        """
+        response = await self._send(method, url, kwargs, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.settings.http2 and HTTP2_AVAILABLE,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    async def _send(self, method: str, url: str, kwargs: Dict[str, Any], stream: bool) -> httpx.Response:
+        settings = self.settings
+        attempt = 0
+        while True:
+            client = self.client()
+            self.requests += 1
+            try:
+                response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+            except httpx.TransportError as exc:
+                if attempt >= settings.max_retries:
+                    self.failures += 1
+                    raise
+                delay = backoff_delay(attempt, settings)
+                logger.warning(f"{self.name} request failed ({exc!r}); retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= settings.max_retries:
+                    if response.status_code in RETRY_STATUSES:
+                        self.failures += 1
+                    return response
+                await response.aclose()
+                delay = backoff_delay(attempt, settings, retry_after_seconds(response))
+                logger.warning(f"{self.name} returned {response.status_code}; retrying in {delay:.2f}s")
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _hedged(self, hedge_after: float, method: str, url: str, kwargs: Dict[str, Any]) -> httpx.Response:
+        primary = asyncio.ensure_future(self._send(method, url, kwargs, stream=False))
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done:
+                self.hedged += 1
+                attempts.append(asyncio.ensure_future(self._send(method, url, kwargs, stream=False)))
+            error: Optional[BaseException] = None
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not primary:
+                            self.hedge_wins += 1
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error  # type: ignore[misc]
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
@@ -0,0 +1,382 @@
+"""
+Lifecycle of the local models (LLM, ASR, TTS, vision).
+
+Owners register a ``ModelSpec`` at import; nothing is read from disk until
+the first ``use()``. Weights are memory-mapped (llama.cpp ``use_mmap``, the
+TFLite/ONNX runtimes' own file mapping, or a plain read-only ``mmap`` when no
+runtime is installed), so a load is cheap and pages are shared with the OS
+cache. Each resident model is charged its file size against
+``models.memory_budget_mb``; loading past the budget unloads the least
+recently used idle models first, and a reaper thread unloads models idle for
+longer than ``models.idle_unload_s``.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from pocket_ai.core.config import ModelManagerConfig, get_config
+from pocket_ai.core.logger import logger
+
+try:
+    import psutil  # type: ignore[import]
+except ImportError:  # pragma: no cover - psutil is in requirements.txt
+    psutil = None
+
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+MB = 1024 * 1024
+
+
+class ModelUnavailable(RuntimeError):
+    """The model file is missing or its runtime failed to load it."""
+
+
+class MappedModel:
+    """
+    Read-only memory map of a weights file, for formats read directly or
+    when the model's runtime is not installed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as handle:
+            self.buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def prefetch(self):
+        """
+        Ask the kernel to read the mapping ahead, so first use does not fault
+        every page in from storage.
+        """
+        if hasattr(self.buffer, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+            self.buffer.madvise(mmap.MADV_WILLNEED)
+
+    def close(self):
+        self.buffer.close()
+
+
+def map_file(path: str) -> MappedModel:
+    return MappedModel(path)
+
+
+def load_gguf(path: str) -> Any:
+    try:
+        from llama_cpp import Llama  # type: ignore[import]
+    except ImportError:
+        return MappedModel(path)
+    return Llama(model_path=path, use_mmap=True, verbose=False)
+
+
+def load_onnx(path: str) -> Any:
+    try:
+        import onnxruntime as ort  # type: ignore[import]
+    except ImportError:
+        return MappedModel(path)
+    return ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+
+
+def loader_for_path(path: str) -> Callable[[str], Any]:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".gguf":
+        return load_gguf
+    if suffix == ".onnx":
+        return load_onnx
+    return map_file
+
+
+@dataclass
+class ModelSpec:
+    name: str
+    path: str
+    loader: Callable[[str], Any] = map_file
+    # Defaults to ``handle.close()`` when the handle has one.
+    unloader: Optional[Callable[[Any], None]] = None
+    # Overrides ``models.idle_unload_s`` for this model.
+    idle_timeout_s: Optional[float] = None
+    # Resident estimate when the file size is misleading (e.g. a directory).
+    size_bytes: Optional[int] = None
+    # Compute pool the model runs on (see core/executors.py); prewarming
+    # uses it too, so warm-up never overlaps a real inference.
+    workload: Optional[str] = None
+    # Synthetic inference run once after prewarm loads the model.
+    warmup: Optional[Callable[[Any], None]] = None
+
+    def resolved_path(self) -> Path:
+        path = Path(self.path)
+        return path if path.is_absolute() else MODELS_DIR / path
+
+
+class _Resident:
+    __slots__ = ("handle", "size_bytes", "rss_delta_bytes", "loaded_at", "last_used", "load_ms", "users", "uses")
+
+    def __init__(self, handle: Any, size_bytes: int, rss_delta_bytes: Optional[int], load_ms: float):
+        self.handle = handle
+        self.size_bytes = size_bytes
+        self.rss_delta_bytes = rss_delta_bytes
+        self.loaded_at = time.monotonic()
+        self.last_used = self.loaded_at
+        self.load_ms = load_ms
+        self.users = 0
+        self.uses = 0
+
+
+def _path_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+    return path.stat().st_size
+
+
+def _rss() -> Optional[int]:
+    if psutil is None:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+class ModelManager:
+    def __init__(self):
+        self._specs: Dict[str, ModelSpec] = {}
+        # Resident models, least recently used first.
+        self._resident: "OrderedDict[str, _Resident]" = OrderedDict()
+        self._history: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._reaper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def settings(self) -> ModelManagerConfig:
+        return get_config().models
+
+    def register(self, spec: ModelSpec):
+        with self._lock:
+            if spec.name in self._resident and self._specs[spec.name] != spec:
+                self._unload_locked(spec.name, "re-registered")
+            self._specs[spec.name] = spec
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._specs
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._resident
+
+    def is_available(self, name: str) -> bool:
+        spec = self._specs.get(name)
+        return spec is not None and spec.resolved_path().exists()
+
+    def spec(self, name: str) -> ModelSpec:
+        return self._specs[name]
+
+    def fits_budget(self, name: str) -> bool:
+        """
+        Whether ``name`` can be loaded without unloading anything.
+        """
+        spec = self._specs[name]
+        if name in self._resident:
+            return True
+        path = spec.resolved_path()
+        size = spec.size_bytes if spec.size_bytes is not None else (_path_size(path) if path.exists() else 0)
+        return self.resident_bytes() + size <= self.settings.memory_budget_mb * MB
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """
+        Yield the model's handle, loading it on first use. The model cannot be
+        unloaded (budget or idle) while a caller is inside the block.
+        """
+        entry = self._acquire(name)
+        try:
+            yield entry.handle
+        finally:
+            with self._lock:
+                entry.users -= 1
+                entry.last_used = time.monotonic()
+
+    def load(self, name: str) -> float:
+        """
+        Make ``name`` resident without using it; returns the load time in ms
+        (0 when it was already loaded).
+        """
+        already = name in self._resident
+        with self.use(name):
+            pass
+        return 0.0 if already else self._history[name]["last_load_ms"]
+
+    def unload(self, name: str, reason: str = "manual") -> bool:
+        with self._lock:
+            entry = self._resident.get(name)
+            if entry is None or entry.users:
+                return False
+            self._unload_locked(name, reason)
+            return True
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        now = time.monotonic() if now is None else now
+        evicted = []
+        with self._lock:
+            for name, entry in list(self._resident.items()):
+                timeout = self._specs[name].idle_timeout_s
+                timeout = self.settings.idle_unload_s if timeout is None else timeout
+                if timeout and not entry.users and now - entry.last_used >= timeout:
+                    self._unload_locked(name, "idle")
+                    evicted.append(name)
+        return evicted
+
+    def shutdown(self):
+        self._stop.set()
+        with self._lock:
+            for name in list(self._resident):
+                self._unload_locked(name, "shutdown")
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._resident.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        models: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for name, spec in self._specs.items():
+                entry = self._resident.get(name)
+                info: Dict[str, Any] = {"path": str(spec.resolved_path()), **self._history.get(name, {})}
+                if entry is not None:
+                    info.update(
+                        state="loaded",
+                        resident_mb=round(entry.size_bytes / MB, 1),
+                        rss_delta_mb=None if entry.rss_delta_bytes is None else round(entry.rss_delta_bytes / MB, 1),
+                        load_ms=round(entry.load_ms, 2),
+                        loaded_for_s=round(now - entry.loaded_at, 1),
+                        idle_s=round(now - entry.last_used, 1),
+                        in_use=entry.users,
+                        uses=entry.uses,
+                    )
+                else:
+                    info["state"] = "unloaded" if spec.resolved_path().exists() else "missing"
+                models[name] = info
+            resident = sum(entry.size_bytes for entry in self._resident.values())
+        return {
+            "budget_mb": self.settings.memory_budget_mb,
+            "resident_mb": round(resident / MB, 1),
+            "models": models,
+        }
+
+    def _acquire(self, name: str) -> _Resident:
+        with self._lock:
+            entry = self._resident.get(name)
+            if entry is None:
+                if name not in self._specs:
+                    raise KeyError(f"Unknown model: {name}")
+                load_lock = self._load_locks.setdefault(name, threading.Lock())
+            else:
+                return self._checkout(name, entry)
+
+        # Loads run outside the manager lock so other models stay usable; the
+        # per-model lock makes concurrent first uses share one load.
+        with load_lock:
+            with self._lock:
+                entry = self._resident.get(name)
+                if entry is not None:
+                    return self._checkout(name, entry)
+            entry = self._load(self._specs[name])
+            with self._lock:
+                self._resident[name] = entry
+                checked_out = self._checkout(name, entry)
+                self._make_room(0, keep=name)
+        self._ensure_reaper()
+        return checked_out
+
+    def _checkout(self, name: str, entry: _Resident) -> _Resident:
+        entry.users += 1
+        entry.uses += 1
+        entry.last_used = time.monotonic()
+        self._resident.move_to_end(name)
+        return entry
+
+    def _load(self, spec: ModelSpec) -> _Resident:
+        path = spec.resolved_path()
+        if not path.exists():
+            raise ModelUnavailable(f"{spec.name}: {path} not found")
+        size = spec.size_bytes if spec.size_bytes is not None else _path_size(path)
+        with self._lock:
+            self._make_room(size, keep=spec.name)
+
+        rss_before = _rss()
+        start = time.perf_counter()
+        try:
+            handle = spec.loader(str(path))
+        except ModelUnavailable:
+            raise
+        except Exception as exc:
+            raise ModelUnavailable(f"{spec.name}: {exc}") from exc
+        load_ms = (time.perf_counter() - start) * 1000
+        rss_after = _rss()
+        rss_delta = None if rss_before is None or rss_after is None else rss_after - rss_before
+
+        history = self._history.setdefault(spec.name, {"loads": 0})
+        history["loads"] += 1
+        history["last_load_ms"] = round(load_ms, 2)
+        logger.info(f"Model {spec.name} loaded in {load_ms:.1f} ms ({size / MB:.1f} MB mapped)")
+        return _Resident(handle, size, rss_delta, load_ms)
+
+    def _make_room(self, incoming: int, keep: str):
+        budget = self.settings.memory_budget_mb * MB
+        used = sum(entry.size_bytes for entry in self._resident.values())
+        for name, entry in list(self._resident.items()):
+            if used + incoming <= budget:
+                return
+            if name == keep or entry.users:
+                continue
+            used -= entry.size_bytes
+            self._unload_locked(name, "memory budget")
+        if used + incoming > budget:
+            logger.warning(
+                f"Model memory budget exceeded: {(used + incoming) / MB:.0f} MB resident, "
+                f"budget {budget / MB:.0f} MB (remaining models are in use)"
+            )
+
+    def _unload_locked(self, name: str, reason: str):
+        entry = self._resident.pop(name)
+        spec = self._specs[name]
+        start = time.perf_counter()
+        try:
+            if spec.unloader is not None:
+                spec.unloader(entry.handle)
+            elif hasattr(entry.handle, "close"):
+                entry.handle.close()
+        except Exception as exc:
+            logger.warning(f"Error while unloading model {name}: {exc}")
+        unload_ms = (time.perf_counter() - start) * 1000
+        self._history.setdefault(name, {"loads": 0}).update(
+            last_unload_reason=reason, last_unload_ms=round(unload_ms, 2)
+        )
+        logger.info(f"Model {name} unloaded ({reason})")
+
+    def _ensure_reaper(self):
+        if not self.settings.idle_unload_s:
+            return
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._stop.clear()
+            self._reaper = threading.Thread(target=self._reap_loop, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._stop.wait(max(1.0, self.settings.reaper_interval_s)):
+            try:
+                self.evict_idle()
+            except Exception as exc:
+                logger.warning(f"Idle model reaper failed: {exc}")
+
+
+model_manager = ModelManager()
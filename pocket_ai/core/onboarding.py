@@ -39,8 +39,9 @@ def run_first_boot_setup():
         "Enter trusted UI origin", default="http://localhost", interactive=interactive
     )
 
-    api_token = _provision_token("api_auth_token", "API client", interactive)
-    mcp_token = _provision_token("mcp_auth_token", "MCP client", interactive)
+    with secrets_manager.batch():
+        api_token = _provision_token("api_auth_token", "API client", interactive)
+        mcp_token = _provision_token("mcp_auth_token", "MCP client", interactive)
     setup_code = secrets.token_urlsafe(16)
 
     _persist_config(profile, allowed_origin)
@@ -0,0 +1,130 @@
+"""
+Background prewarming of the hot local models.
+
+Started from the API's lifespan hook, so uvicorn is already serving while it
+runs. Models in ``models.prewarm`` are loaded one after another in priority
+order, each on its own workload pool (so warm-up never overlaps a real
+inference), followed by a synthetic warm-up inference. A model that would
+push the set past the memory budget is skipped instead of evicting a
+higher-priority one. Per-model readiness is reported by ``readiness()``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pocket_ai.core.config import get_config
+from pocket_ai.core.executors import ComputeExecutors, compute_executors
+from pocket_ai.core.logger import logger
+from pocket_ai.core.model_manager import MappedModel, ModelManager, ModelUnavailable, model_manager
+
+
+# Terminal states; "pending", "loading" and "warming" are transient.
+FINAL_STATES = ("ready", "unavailable", "skipped", "failed")
+
+
+class ModelPrewarmer:
+    def __init__(self, manager: ModelManager = model_manager, executors: ComputeExecutors = compute_executors):
+        self.manager = manager
+        self.executors = executors
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def start(self, names: Optional[List[str]] = None) -> bool:
+        """
+        Begin prewarming in a daemon thread and return immediately. Returns
+        ``False`` if a run is already in progress.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            names = list(get_config().models.prewarm if names is None else names)
+            self._models = {name: {"state": "pending"} for name in names}
+            self._started_at, self._finished_at = time.time(), None
+            self._thread = threading.Thread(target=self._run, args=(names,), name="model-prewarm", daemon=True)
+            self._thread.start()
+        logger.info(f"Prewarming models in background: {', '.join(names) or 'none'}")
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return thread is None or not thread.is_alive()
+
+    def readiness(self) -> Dict[str, Any]:
+        with self._lock:
+            models = {name: dict(info) for name, info in self._models.items()}
+        for name, info in models.items():
+            # Later idle/budget unloads make a prewarmed model cold again.
+            if info["state"] == "ready" and not self.manager.is_loaded(name):
+                info["state"] = "unloaded"
+        if self._started_at is None:
+            phase = "idle"
+        elif self._finished_at is None:
+            phase = "running"
+        else:
+            phase = "done"
+        return {
+            "phase": phase,
+            "ready": phase == "done" and all(info["state"] != "failed" for info in models.values()),
+            "models": models,
+        }
+
+    def _run(self, names: List[str]):
+        for name in names:
+            try:
+                self._prewarm(name)
+            except Exception as exc:  # keep going: one broken model must not block the rest
+                logger.warning(f"Prewarm of {name} failed: {exc}")
+                self._set(name, state="failed", error=str(exc))
+        self._finished_at = time.time()
+        summary = ", ".join(f"{name}={info['state']}" for name, info in self._models.items())
+        logger.info(f"Model prewarm finished in {self._finished_at - self._started_at:.1f}s ({summary})")
+
+    def _prewarm(self, name: str):
+        if not self.manager.is_registered(name):
+            self._set(name, state="unavailable", error="not registered")
+            return
+        if not self.manager.is_available(name):
+            self._set(name, state="unavailable", error="model files not installed")
+            return
+        if not self.manager.fits_budget(name):
+            self._set(name, state="skipped", error="memory budget")
+            return
+
+        workload = self.manager.spec(name).workload
+        if workload:
+            self.executors.submit(workload, self._load_and_warm, name).result()
+        else:
+            self._load_and_warm(name)
+
+    def _load_and_warm(self, name: str):
+        self._set(name, state="loading")
+        try:
+            load_ms = self.manager.load(name)
+        except ModelUnavailable as exc:
+            self._set(name, state="unavailable", error=str(exc))
+            return
+
+        self._set(name, state="warming", load_ms=round(load_ms, 2))
+        warmup = self.manager.spec(name).warmup
+        start = time.perf_counter()
+        with self.manager.use(name) as handle:
+            if warmup is not None:
+                warmup(handle)
+            elif isinstance(handle, MappedModel):
+                handle.prefetch()
+        self._set(name, state="ready", warmup_ms=round((time.perf_counter() - start) * 1000, 2))
+
+    def _set(self, name: str, **fields: Any):
+        with self._lock:
+            self._models.setdefault(name, {}).update(fields)
+
+
+model_prewarmer = ModelPrewarmer()
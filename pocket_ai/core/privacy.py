@@ -1,27 +1,160 @@
 from __future__ import annotations
 
 import re
-from typing import Optional
+import string
+import sys
+from typing import Iterable, Iterator, Optional, Tuple
 
 
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"\+?\d[\d\s\-\(\)]{6,}\d")
 
+# Both patterns folded into one alternation so the payload is scanned once.
+# Email is tried first at each position, matching the old email-then-phone order.
+# The local part never contains "@", so a possessive run (3.11+) is equivalent and
+# stops the engine from backtracking through every word that is not an address.
+_LOCAL_PART = r"[A-Za-z0-9._%+-]++" if sys.version_info >= (3, 11) else r"[A-Za-z0-9._%+-]+"
+_EMAIL_FAST_RE = re.compile(rf"{_LOCAL_PART}@[A-Za-z0-9.-]+\.[A-Za-z]{{2,}}")
+PII_RE = re.compile(f"(?P<email>{_EMAIL_FAST_RE.pattern})|(?P<phone>{PHONE_RE.pattern})")
+_DIGIT_RE = re.compile(r"\d")
 
-def scrub_text(payload: Optional[str]) -> str:
+# Extra input scanned past the emitted window; covers the longest valid address (254 chars).
+SAFETY_MARGIN = 256
+# Longest unbroken email/phone-like run a StreamingScrubber holds back.
+MAX_HOLDBACK = 4 * SAFETY_MARGIN
+
+_EMAIL_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-@")
+_PHONE_PUNCT = frozenset("+-()")
+
+
+def _replace(match: re.Match) -> str:
+    return "[EMAIL]" if match.lastgroup == "email" else "[PHONE]"
+
+
+def _scrub(text: str) -> str:
+    """
+    One pass over ``text``; cheap presence checks skip the branches that cannot match.
+    """
+    has_at = "@" in text
+    has_digit = _DIGIT_RE.search(text) is not None
+    if has_at and has_digit:
+        return PII_RE.sub(_replace, text)
+    if has_at:
+        return _EMAIL_FAST_RE.sub("[EMAIL]", text)
+    if has_digit:
+        return PHONE_RE.sub("[PHONE]", text)
+    return text
+
+
+def _in_phone(ch: str) -> bool:
+    return ch.isdecimal() or ch.isspace() or ch in _PHONE_PUNCT
+
+
+def _is_safe_cut(text: str, index: int) -> bool:
+    """
+    True when no email/phone match can span text[index - 1:index + 1].
+    """
+    before, after = text[index - 1], text[index]
+    if before in _EMAIL_CHARS and after in _EMAIL_CHARS:
+        return False
+    return not (_in_phone(before) and _in_phone(after))
+
+
+def _find_safe_cut(text: str, start: int) -> int:
+    for index in range(max(start, 1), len(text)):
+        if _is_safe_cut(text, index):
+            return index
+    return len(text)
+
+
+def _scrub_bounded(payload: str, limit: int) -> Tuple[str, bool]:
+    """
+    Scrub just enough of ``payload`` to emit ``limit`` characters.
+
+    Returns the stripped, scrubbed text (possibly longer than ``limit``) and a
+    flag telling whether the full scrubbed text would have exceeded ``limit``.
+    """
+    window = limit + SAFETY_MARGIN
+    while True:
+        cut = _find_safe_cut(payload, window)
+        if cut >= len(payload):
+            text = _scrub(payload).strip()
+            return text, len(text) > limit
+        head = _scrub(payload[:cut]).strip()
+        if len(head) > limit:
+            return head, True
+        window = cut + max(window, SAFETY_MARGIN)
+
+
+def scrub_text(payload: Optional[str], max_chars: Optional[int] = None) -> str:
     """
     Best-effort redaction for text that might contain emails or phone numbers.
+
+    With ``max_chars`` the result equals ``scrub_text(payload)[:max_chars]`` but
+    only the leading part of the payload (plus a safety margin) is scanned.
     """
     if not payload:
         return ""
-    sanitized = EMAIL_RE.sub("[EMAIL]", payload)
-    sanitized = PHONE_RE.sub("[PHONE]", sanitized)
-    return sanitized.strip()
+    if max_chars is None:
+        return _scrub(payload).strip()
+    text, _ = _scrub_bounded(payload, max_chars)
+    return text[:max_chars]
 
 
 def summarize_for_log(payload: Optional[str], limit: int = 160) -> str:
-    text = scrub_text(payload)
-    if len(text) <= limit:
+    if not payload:
+        return ""
+    text, truncated = _scrub_bounded(payload, limit)
+    if not truncated:
         return text
     return f"{text[:limit]}..."
 
+
+class StreamingScrubber:
+    """
+    Incremental scrubber for chunked input (uploads, token streams).
+
+    Text is released up to the last position where no email/phone can be split,
+    so the concatenated output equals scrubbing the joined input in one go.
+    The exception is a run of email/phone characters longer than
+    ``MAX_HOLDBACK``, which is released in pieces so memory and work stay
+    bounded. Unlike ``scrub_text`` the output is not stripped.
+    """
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        if not chunk:
+            return ""
+        buffered = self._pending + chunk
+
+        # Cuts inside the held-back text were already found unsafe; only the
+        # new boundary and the new chunk need checking.
+        floor = max(1, len(self._pending))
+        cut = len(buffered) - 1
+        while cut >= floor and not _is_safe_cut(buffered, cut):
+            cut -= 1
+        if cut < floor:
+            if len(buffered) <= MAX_HOLDBACK:
+                self._pending = buffered
+                return ""
+            cut = len(buffered) - SAFETY_MARGIN
+
+        self._pending = buffered[cut:]
+        return _scrub(buffered[:cut])
+
+    def flush(self) -> str:
+        buffered, self._pending = self._pending, ""
+        return _scrub(buffered)
+
+
+def scrub_stream(chunks: Iterable[str]) -> Iterator[str]:
+    scrubber = StreamingScrubber()
+    for chunk in chunks:
+        emitted = scrubber.feed(chunk)
+        if emitted:
+            yield emitted
+    tail = scrubber.flush()
+    if tail:
+        yield tail
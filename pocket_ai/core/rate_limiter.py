@@ -0,0 +1,174 @@
+"""
+Client-side rate limits for cloud APIs.
+
+Each (provider, model) pair gets a limiter shared by every caller: a
+concurrency cap plus token buckets for requests/min and tokens/min. Callers
+wait for capacity instead of failing, so a burst is spread out locally
+rather than bounced by the provider as 429s. Buckets refill continuously
+and hand out capacity in arrival order: a caller reserves what it needs
+up front (possibly into debt) and sleeps until the debt is repaid.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from pocket_ai.core.config import RateLimit, RateLimitConfig, get_config
+from pocket_ai.core.tracing import tracer
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.level = per_minute
+        self.clock = clock
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take ``amount`` now and return the seconds to wait before using it.
+        """
+        self._refill()
+        self.level -= min(amount, self.capacity)
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+    def refund(self, amount: float):
+        """
+        Return unused capacity (a negative amount charges extra usage).
+        """
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+    def _refill(self):
+        now = self.clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class Lease:
+    """
+    A granted call. ``settle()`` corrects the token estimate once the
+    provider reports actual usage.
+    """
+
+    def __init__(self, limiter: Optional["CloudLimiter"], tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+
+    def settle(self, actual_tokens: Optional[int]):
+        if self.limiter is None or self.limiter.tokens is None or actual_tokens is None:
+            return
+        self.limiter.tokens.refund(self.tokens - actual_tokens)
+        self.tokens = actual_tokens
+
+
+class CloudLimiter:
+    def __init__(self, key: str, limit: RateLimit):
+        self.key = key
+        self.limit = limit
+        self.requests = TokenBucket(limit.requests_per_min)
+        self.tokens = TokenBucket(limit.tokens_per_min) if limit.tokens_per_min else None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.calls = 0
+        self.delayed = 0
+        self.wait_ms_total = 0.0
+        self.max_wait_ms = 0.0
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator[Lease]:
+        start = time.perf_counter()
+        semaphore = self._semaphore_for_loop()
+        self.queued += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+        try:
+            delay = self.requests.reserve(1)
+            if self.tokens is not None:
+                delay = max(delay, self.tokens.reserve(tokens))
+            if delay > 0:
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    # Never sent, so give the capacity back to the callers behind us.
+                    self.requests.refund(1)
+                    if self.tokens is not None:
+                        self.tokens.refund(tokens)
+                    raise
+            self._record_wait((time.perf_counter() - start) * 1000)
+            self.in_flight += 1
+            try:
+                yield Lease(self, tokens)
+            finally:
+                self.in_flight -= 1
+        finally:
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "calls": self.calls,
+            "delayed": self.delayed,
+            "avg_wait_ms": round(self.wait_ms_total / self.calls, 2) if self.calls else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "limit": self.limit.model_dump(),
+        }
+
+    def _semaphore_for_loop(self) -> asyncio.Semaphore:
+        # asyncio primitives belong to one event loop (tests run several).
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+    def _record_wait(self, wait_ms: float):
+        self.calls += 1
+        self.wait_ms_total += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        if wait_ms >= 1.0:
+            self.delayed += 1
+        tracer.record("cloud_rate_wait", wait_ms)
+
+
+class CloudRateLimiter:
+    def __init__(self):
+        self._limiters: Dict[str, CloudLimiter] = {}
+
+    @property
+    def settings(self) -> RateLimitConfig:
+        return get_config().rate_limits
+
+    def limiter(self, provider: str, model: str) -> CloudLimiter:
+        key = f"{provider}:{model}"
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = CloudLimiter(key, self.settings.limit_for(provider, model))
+        return limiter
+
+    @asynccontextmanager
+    async def acquire(self, provider: str, model: str, tokens: int = 0) -> AsyncIterator[Lease]:
+        """
+        Wait for a slot and rate capacity for one call of about ``tokens``
+        tokens (prompt plus expected output).
+        """
+        if not self.settings.enabled:
+            yield Lease(None, tokens)
+            return
+        async with self.limiter(provider, model).acquire(tokens) as lease:
+            yield lease
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: limiter.stats() for key, limiter in self._limiters.items()}
+
+
+cloud_rate_limiter = CloudRateLimiter()
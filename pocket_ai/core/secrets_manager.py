@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional, Tuple
 
 from cryptography.fernet import Fernet
 
@@ -11,11 +15,21 @@ from pocket_ai.core.config import get_config
 from pocket_ai.core.logger import logger
 
 
+_DELETED = object()
+
+
 class SecretsManager:
     """
     Encrypts user/API secrets at rest and offers a simple rotation API.
+
+    Reads are served from an in-memory snapshot that is reloaded only when the
+    file on disk changes (checked at most every ``reload_check_interval``
+    seconds), so a CLI and the server can share one store. Writes go through
+    immediately unless they happen inside ``batch()`` or a flush delay is set.
     """
 
+    reload_check_interval = 1.0
+
     def __init__(self):
         self.config = get_config()
         self.base_dir = Path(self.config.storage_path) / "system"
@@ -24,7 +38,16 @@ class SecretsManager:
         self._key_path = self.base_dir / "secret_master.key"
         self._secrets_path = self.base_dir / "secrets.enc"
         self._cipher = Fernet(self._load_or_create_key())
+
+        self._lock = threading.RLock()
+        self._pending: Dict[str, object] = {}
+        self._batch_depth = 0
+        self._flush_delay: Optional[float] = None
+        self._flush_timer: Optional[threading.Timer] = None
+        self._disk_signature: Optional[Tuple[int, int, int]] = None
+        self._last_reload_check = time.monotonic()
         self._secrets: Dict[str, str] = self._load_store()
+        atexit.register(self.flush)
 
     def _load_or_create_key(self) -> bytes:
         if key_override := os.environ.get("POCKET_MASTER_KEY"):
@@ -36,8 +59,16 @@ class SecretsManager:
         os.chmod(self._key_path, 0o600)
         return key
 
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self._secrets_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
     def _load_store(self) -> Dict[str, str]:
-        if not self._secrets_path.exists():
+        self._disk_signature = self._file_signature()
+        if self._disk_signature is None:
             return {}
         try:
             decrypted = self._cipher.decrypt(self._secrets_path.read_bytes())
@@ -46,29 +77,122 @@ class SecretsManager:
             logger.error(f"Failed to load secrets store: {exc}")
             return {}
 
+    def _apply_pending(self):
+        for key, value in self._pending.items():
+            if value is _DELETED:
+                self._secrets.pop(key, None)
+            else:
+                self._secrets[key] = value  # type: ignore[assignment]
+
+    def _reload_if_changed(self, force: bool = False):
+        """
+        Re-read the store if another process rewrote it, keeping unflushed local edits.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_reload_check < self.reload_check_interval:
+            return
+        self._last_reload_check = now
+        if self._file_signature() == self._disk_signature:
+            return
+        logger.debug("Secrets store changed on disk; reloading.")
+        self._secrets = self._load_store()
+        self._apply_pending()
+
     def _persist(self):
-        payload = json.dumps(self._secrets, indent=2).encode("utf-8")
-        encrypted = self._cipher.encrypt(payload)
-        self._secrets_path.write_bytes(encrypted)
-        os.chmod(self._secrets_path, 0o600)
+        with self._lock:
+            self._cancel_timer()
+            self._reload_if_changed(force=True)
+            payload = json.dumps(self._secrets, indent=2).encode("utf-8")
+            encrypted = self._cipher.encrypt(payload)
+            tmp_path = self._secrets_path.with_suffix(".enc.tmp")
+            tmp_path.write_bytes(encrypted)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self._secrets_path)
+            self._disk_signature = self._file_signature()
+            self._pending.clear()
+
+    def _schedule_persist(self):
+        if self._batch_depth:
+            return
+        if not self._flush_delay:
+            self._persist()
+            return
+        # Debounce: every write pushes the flush back by ``_flush_delay`` seconds.
+        self._cancel_timer()
+        self._flush_timer = threading.Timer(self._flush_delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _cancel_timer(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def set_flush_delay(self, seconds: Optional[float]):
+        """
+        Enable (seconds > 0) or disable (None/0) debounced background flushing.
+        """
+        with self._lock:
+            self._flush_delay = seconds or None
+            if not self._flush_delay:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._pending:
+                self._persist()
+            else:
+                self._cancel_timer()
+
+    @contextmanager
+    def batch(self) -> Iterator["SecretsManager"]:
+        """
+        Group several writes into one encrypted persist.
+
+        If the outermost block raises, its changes are rolled back and nothing
+        is written.
+        """
+        with self._lock:
+            outermost = self._batch_depth == 0
+            if outermost:
+                snapshot = (dict(self._secrets), dict(self._pending))
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if outermost:
+                    self._secrets, self._pending = snapshot
+                raise
+            finally:
+                self._batch_depth -= 1
+            if outermost and self._pending:
+                self._schedule_persist()
 
     def get_secret(self, key: str) -> Optional[str]:
         env_key = key.upper()
         if env_key in os.environ:
             return os.environ[env_key]
-        return self._secrets.get(key)
+        with self._lock:
+            self._reload_if_changed()
+            return self._secrets.get(key)
 
     def has_secret(self, key: str) -> bool:
         return self.get_secret(key) is not None
 
     def set_secret(self, key: str, value: str):
-        self._secrets[key] = value
-        self._persist()
+        with self._lock:
+            self._reload_if_changed()
+            self._secrets[key] = value
+            self._pending[key] = value
+            self._schedule_persist()
 
     def delete_secret(self, key: str):
-        if key in self._secrets:
-            del self._secrets[key]
-            self._persist()
+        with self._lock:
+            self._reload_if_changed()
+            if key in self._secrets:
+                del self._secrets[key]
+                self._pending[key] = _DELETED
+                self._schedule_persist()
 
     def rotate_secret(self, key: str, new_value: str):
         self.set_secret(key, new_value)
@@ -77,7 +201,9 @@ class SecretsManager:
         """
         Returns a masked view of which secrets are configured.
         """
-        return {key: True for key in self._secrets.keys()}
+        with self._lock:
+            self._reload_if_changed()
+            return {key: True for key in self._secrets.keys()}
 
 
 secrets_manager = SecretsManager()
@@ -6,7 +6,7 @@ import shutil
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from cryptography.fernet import Fernet
 
@@ -16,6 +16,10 @@ from pocket_ai.core.logger import logger
 from pocket_ai.core.policy_engine import policy_engine
 
 
+# (event, category, key, data) with event in {"store", "delete", "clear", "reset"}.
+StorageListener = Callable[[str, str, str, Any], None]
+
+
 class DataLifecycleManager:
     def __init__(self):
         self.config = get_config()
@@ -34,8 +38,24 @@ class DataLifecycleManager:
         self._memory_cache: Dict[str, Dict[str, Dict[str, Any]]] = {
             cat: {} for cat in self.memory_categories
         }
+        # Survives the re-init done by factory_reset().
+        self._listeners: List[StorageListener] = getattr(self, "_listeners", [])
         self._ensure_directories()
 
+    def add_listener(self, listener: StorageListener):
+        """
+        Get notified after records change (used to keep derived indexes in sync).
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def _notify(self, event: str, category: str, key: str = "", data: Any = None):
+        for listener in self._listeners:
+            try:
+                listener(event, category, key, data)
+            except Exception as exc:
+                logger.warning(f"Storage listener failed on {event} {category}: {exc}")
+
     def _load_or_create_key(self) -> bytes:
         if self._key_path.exists():
             return self._key_path.read_bytes()
@@ -65,6 +85,7 @@ class DataLifecycleManager:
                 "payload": payload,
                 "ts": time.time(),
             }
+            self._notify("store", category, key, data)
             return
 
         if not policy_engine.can_persist(category, size_kb):
@@ -76,6 +97,7 @@ class DataLifecycleManager:
         target_path.write_bytes(cipher_text)
         os.chmod(target_path, 0o600)
         logger.debug(f"Stored {category}/{key}")
+        self._notify("store", category, key, data)
 
     def retrieve(self, category: str, key: str) -> Optional[Any]:
         schema = DATA_CATEGORIES.get(category)
@@ -108,6 +130,7 @@ class DataLifecycleManager:
                 for key in list(cache.keys()):
                     if now - cache[key]["ts"] > ttl:
                         del cache[key]
+                        self._notify("delete", category, key)
                 continue
 
             cat_path = self.base_path / category
@@ -117,6 +140,7 @@ class DataLifecycleManager:
                 if file.is_file() and now - file.stat().st_mtime > ttl:
                     file.unlink(missing_ok=True)
                     logger.info(f"Purged expired file: {file}")
+                    self._notify("delete", category, file.stem)
 
     def export_user_data(self, category: Optional[str] = None, destination: Optional[str] = None) -> str:
         categories = [category] if category else list(self.disk_categories)
@@ -159,9 +183,10 @@ class DataLifecycleManager:
         schema = self._category_schema(category)
         if schema["storage"] == "memory":
             self._memory_cache[category].pop(key, None)
-            return
-        target_path = self.base_path / category / f"{key}.bin"
-        target_path.unlink(missing_ok=True)
+        else:
+            target_path = self.base_path / category / f"{key}.bin"
+            target_path.unlink(missing_ok=True)
+        self._notify("delete", category, key)
 
     def delete_category(self, category: str):
         schema = self._category_schema(category)
@@ -172,12 +197,14 @@ class DataLifecycleManager:
             if cat_path.exists():
                 for file in cat_path.glob("*.bin"):
                     file.unlink(missing_ok=True)
+        self._notify("clear", category)
 
     def factory_reset(self):
         logger.warning("FACTORY RESET REQUESTED")
         if self.base_path.exists():
             shutil.rmtree(self.base_path)
         self.__init__()
+        self._notify("reset", "")
         logger.warning("Factory reset complete")
 
     def _dump_category(self, category: str) -> Dict[str, Any]:
@@ -0,0 +1,175 @@
+"""
+Lightweight in-process latency tracing.
+
+A trace covers one request (e.g. a text command); spans time the stages
+inside it. The active trace lives in a contextvar, so spans opened in child
+asyncio tasks attach to the right request. When tracing is disabled, or no
+trace is active, ``span()`` returns a shared no-op context manager.
+
+Traces only carry stage names and timings, never user content.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from pocket_ai.core.config import get_config
+
+
+RECENT_TRACES = 200
+SAMPLES_PER_STAGE = 1024
+
+_NULL_SPAN = nullcontext()
+
+
+class Trace:
+    __slots__ = ("trace_id", "name", "started_at", "_t0", "duration_ms", "spans", "status")
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.spans: List[Dict[str, Any]] = []
+        self.status = "ok"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "spans": list(self.spans),
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("pocket_trace", default=None)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    # Nearest-rank percentile on an already sorted list.
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+class Tracer:
+    """
+    Keeps a ring buffer of recent traces and rolling per-stage latency samples.
+    """
+
+    def __init__(self):
+        self.enabled = bool(get_config().feature_flags.get("latency_tracing", True))
+        self._recent: Deque[Trace] = deque(maxlen=RECENT_TRACES)
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+
+    @contextmanager
+    def _trace(self, name: str) -> Iterator[Trace]:
+        trace = Trace(name)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        except BaseException:
+            trace.status = "error"
+            raise
+        finally:
+            _current_trace.reset(token)
+            trace.duration_ms = (time.perf_counter() - trace._t0) * 1000
+            self._recent.append(trace)
+            self._add_sample(name, trace.duration_ms)
+
+    def trace(self, name: str):
+        """
+        Start a trace, or a span if a trace is already active (e.g. voice -> text).
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        if _current_trace.get() is not None:
+            return self.span(name)
+        return self._trace(name)
+
+    def span(self, stage: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        trace = _current_trace.get()
+        if trace is None:
+            return _NULL_SPAN
+        return self._span(trace, stage)
+
+    @contextmanager
+    def _span(self, trace: Trace, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            trace.spans.append(
+                {
+                    "stage": stage,
+                    "offset_ms": round((start - trace._t0) * 1000, 3),
+                    "duration_ms": round(elapsed_ms, 3),
+                    "status": status,
+                }
+            )
+            self._add_sample(stage, elapsed_ms)
+
+    def record(self, stage: str, elapsed_ms: float):
+        """
+        Add a sample measured outside a trace (e.g. time spent queued before one starts).
+        """
+        if self.enabled:
+            self._add_sample(stage, elapsed_ms)
+
+    def _add_sample(self, stage: str, elapsed_ms: float):
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=SAMPLES_PER_STAGE)
+        samples.append(elapsed_ms)
+        self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def stage_stats(self) -> Dict[str, Dict[str, float]]:
+        stats: Dict[str, Dict[str, float]] = {}
+        for stage, samples in list(self._samples.items()):
+            ordered = sorted(samples)
+            if not ordered:
+                continue
+            stats[stage] = {
+                "count": self._counts.get(stage, len(ordered)),
+                "p50_ms": round(_percentile(ordered, 50), 3),
+                "p95_ms": round(_percentile(ordered, 95), 3),
+                "p99_ms": round(_percentile(ordered, 99), 3),
+                "max_ms": round(ordered[-1], 3),
+            }
+        return stats
+
+    def recent_traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        return [trace.as_dict() for trace in list(self._recent)[-limit:]]
+
+    def snapshot(self, limit: int = 20) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "stages": self.stage_stats(),
+            "recent": self.recent_traces(limit),
+        }
+
+    def reset(self):
+        self._recent.clear()
+        self._samples.clear()
+        self._counts.clear()
+
+
+tracer = Tracer()
@@ -5,12 +5,15 @@ import uvicorn
 from pocket_ai.core.config import get_config
 from pocket_ai.core.logger import logger
 from pocket_ai.core.onboarding import run_first_boot_setup
+from pocket_ai.core.secrets_manager import secrets_manager
 from pocket_ai.tools.dev_tools_loader import load_plugins
 from pocket_ai.ui.api import app
 
 def main():
     logger.info("Starting POCKET-AI...")
     run_first_boot_setup()
+    # Long-running server: coalesce OAuth refresh writes; atexit flushes the rest.
+    secrets_manager.set_flush_delay(0.5)
 
     # 1. Load Plugins
     load_plugins()
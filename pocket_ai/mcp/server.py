@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Hashable, Set, Tuple
 
 from pocket_ai.ai.orchestrator import orchestrator
+from pocket_ai.core.admission import AdmissionRejected, admission_controller
 from pocket_ai.core.config import get_config
+from pocket_ai.core.deadlines import deadline_scope
 from pocket_ai.core.internet_checker import internet_checker
 from pocket_ai.core.logger import logger
+from pocket_ai.core.prewarm import model_prewarmer
 from pocket_ai.core.security import verify_token
 from pocket_ai.core.storage import storage
+from pocket_ai.core.tracing import tracer
 from pocket_ai.tools.easy_tools_runtime import easy_tools
 from pocket_ai.tools.tool_registry import tool_registry
 
@@ -16,6 +21,9 @@ from pocket_ai.tools.tool_registry import tool_registry
 class MCPServer:
     def __init__(self):
         self.tools = []
+        # Keyed by (session, request id): ids are only unique per client.
+        self._inflight: Dict[Tuple[Hashable, Any], asyncio.Task] = {}
+        self._cancelled: Set[Tuple[Hashable, Any]] = set()
         self._register_tools()
 
     def _register_tools(self):
@@ -57,7 +65,7 @@ class MCPServer:
             },
             {
                 "name": "assistant_status",
-                "description": "Get current profile, connectivity, and integrations.",
+                "description": "Get current profile, connectivity, integrations, and local model readiness.",
                 "input_schema": {"type": "object", "properties": {}},
             },
             {
@@ -86,6 +94,14 @@ class MCPServer:
                     "required": ["operation"],
                 },
             },
+            {
+                "name": "assistant_latency",
+                "description": "Per-stage latency percentiles and recent request traces.",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {"limit": {"type": "integer", "minimum": 0}},
+                },
+            },
             {
                 "name": "list_tools",
                 "description": "List registered tools.",
@@ -93,7 +109,18 @@ class MCPServer:
             },
         ]
 
-    async def handle_request(self, method: str, params: Dict[str, Any]) -> Any:
+    async def handle_request(
+        self, method: str, params: Dict[str, Any], request_id: Any = None, session: Hashable = None
+    ) -> Any:
+        """
+        ``session`` identifies the client connection; a client can only
+        cancel requests it made itself.
+        """
+        if method == "notifications/cancelled":
+            self._ensure_authorized(params.get("auth_token"))
+            self.cancel(params.get("requestId"), session)
+            return None
+
         if method != "tools/call" and method != "tools/list":
             raise ValueError(f"Method not supported: {method}")
 
@@ -105,8 +132,41 @@ class MCPServer:
         self._ensure_authorized(params.get("auth_token"))
         logger.info(f"MCP Call: {tool_name}")
 
+        with deadline_scope(get_config().timeouts.request_s):
+            if request_id is None:
+                return await self._call_tool(tool_name, args)
+            # Tracked so a notifications/cancelled for this id can stop the work.
+            key = (session, request_id)
+            task = asyncio.ensure_future(self._call_tool(tool_name, args))
+            self._inflight[key] = task
+            try:
+                return await task
+            except asyncio.CancelledError:
+                if key not in self._cancelled:
+                    raise
+                return {"isError": True, "content": [{"type": "text", "text": "Request cancelled"}]}
+            finally:
+                self._inflight.pop(key, None)
+                self._cancelled.discard(key)
+
+    def cancel(self, request_id: Any, session: Hashable = None) -> bool:
+        key = (session, request_id)
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            return False
+        logger.info(f"MCP request {request_id} cancelled by client")
+        self._cancelled.add(key)
+        task.cancel()
+        return True
+
+    async def _call_tool(self, tool_name: str, args: Dict[str, Any]) -> Any:
         if tool_name == "assistant_query":
-            return await orchestrator.process_text_command(args["query"])
+            try:
+                async with admission_controller.slot("mcp"):
+                    return await orchestrator.process_text_command(args["query"])
+            except AdmissionRejected as exc:
+                busy = {"status": "busy", "reason": exc.reason, "retry_after": exc.retry_after}
+                return {"isError": True, "content": [{"type": "text", "text": json.dumps(busy)}]}
 
         if tool_name == "run_easy_tool":
             result = await easy_tools.execute_tool(args["tool_name"], args.get("payload", {}))
@@ -125,6 +185,7 @@ class MCPServer:
                 "internet": internet_checker.is_connected(),
                 "routing": cfg.routing.model_dump(),
                 "integrations": list(cfg.enabled_integrations),
+                "models": model_prewarmer.readiness(),
             }
             return {"content": [{"type": "text", "text": json.dumps(status)}]}
 
@@ -148,6 +209,10 @@ class MCPServer:
                 storage.factory_reset()
                 return {"content": [{"type": "text", "text": "Factory reset completed."}]}
 
+        if tool_name == "assistant_latency":
+            snapshot = tracer.snapshot(int(args.get("limit", 20)))
+            return {"content": [{"type": "text", "text": json.dumps(snapshot)}]}
+
         if tool_name == "list_tools":
             return {"content": [{"type": "text", "text": json.dumps(tool_registry.list_tools())}]}
 
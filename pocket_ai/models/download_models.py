@@ -51,6 +51,11 @@ MODELS = {
         "url": "https://huggingface.co/Xenova/all-MiniLM-L6-v2/resolve/main/onnx/model.onnx",
         "filename": "all-MiniLM-L6-v2.onnx"
     },
+    "embedding_tokenizer": {
+        "type": "file",
+        "url": "https://huggingface.co/Xenova/all-MiniLM-L6-v2/resolve/main/tokenizer.json",
+        "filename": "all-MiniLM-L6-v2-tokenizer.json"
+    },
 
     # 5. Vision (Offline)
     "mobilenet_cpu": {
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import base64
 import json
-from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from email.message import EmailMessage
 from typing import Any, Dict, List, Optional
@@ -11,6 +10,7 @@ import httpx  # type: ignore[import]
 
 from pocket_ai.core.logger import logger
 
+from .oauth_tokens import OAuthCredentials, OAuthTokenError, token_manager
 from .plugin_base import PluginBase, ToolContext
 
 
@@ -25,15 +25,7 @@ class GmailPluginError(Exception):
     """Raised when the Gmail plugin cannot complete the requested action."""
 
 
-@dataclass
-class GmailCredentials:
-    access_token: str
-    refresh_token: str
-    client_id: str
-    client_secret: str
-    expires_at: datetime
-    token_uri: str = OAUTH_TOKEN_ENDPOINT
-
+class GmailCredentials(OAuthCredentials):
     @classmethod
     def from_secret(cls, secret_blob: str) -> "GmailCredentials":
         try:
@@ -45,7 +37,9 @@ class GmailCredentials:
         if missing:
             raise GmailPluginError(f"Gmail token missing fields: {', '.join(sorted(missing))}")
 
-        expires_at = GmailCredentials._parse_expiry(payload.get("expires_at"))
+        expires_at = cls._parse_expiry(payload.get("expires_at")) or (
+            datetime.now(timezone.utc) - timedelta(seconds=60)
+        )
         return cls(
             access_token=payload["access_token"],
             refresh_token=payload["refresh_token"],
@@ -55,39 +49,13 @@ class GmailCredentials:
             token_uri=payload.get("token_uri", OAUTH_TOKEN_ENDPOINT),
         )
 
-    @staticmethod
-    def _parse_expiry(expires_at: Optional[str]) -> datetime:
-        if not expires_at:
-            return datetime.now(timezone.utc) - timedelta(seconds=60)
-        try:
-            normalized = expires_at.replace("Z", "+00:00") if "Z" in expires_at else expires_at
-            return datetime.fromisoformat(normalized)
-        except ValueError:
-            logger.warning("Failed to parse Gmail token expiry, forcing refresh.")
-            return datetime.now(timezone.utc) - timedelta(seconds=60)
-
-    @property
-    def is_expired(self) -> bool:
-        # Refresh slightly before actual expiry to avoid race conditions.
-        safety_window = timedelta(seconds=60)
-        return datetime.now(timezone.utc) >= (self.expires_at - safety_window)
-
-    def as_secret(self) -> str:
-        payload = {
-            "access_token": self.access_token,
-            "refresh_token": self.refresh_token,
-            "client_id": self.client_id,
-            "client_secret": self.client_secret,
-            "token_uri": self.token_uri,
-            "expires_at": self.expires_at.isoformat(),
-        }
-        return json.dumps(payload)
-
 
 class GmailPlugin(PluginBase):
     name = "gmail_helper"
     description = "Draft and search emails in Gmail"
     requires_capabilities = ["network", "secrets:gmail_token"]
+    side_effect_actions = frozenset({"draft_reply", "draft_from_last"})
+    max_concurrency = 2
 
     def __init__(self) -> None:
         self._timeout = DEFAULT_TIMEOUT
@@ -103,9 +71,8 @@ class GmailPlugin(PluginBase):
             return {"status": "error", "message": "Action is required."}
 
         try:
-            async with httpx.AsyncClient(timeout=self._timeout) as client:
-                credentials = await self._get_credentials(context, client)
-
+            credentials = await self._get_credentials(context)
+            async with httpx.AsyncClient(timeout=context.timeout(self._timeout)) as client:
                 if action == "draft_reply":
                     result = await self._draft_reply(input_data, credentials, client)
                 elif action == "search_recent":
@@ -114,7 +81,7 @@ class GmailPlugin(PluginBase):
                     result = await self._draft_from_last(input_data, credentials, client)
                 else:
                     return {"status": "error", "message": f"Unknown action '{action}'."}
-        except GmailPluginError as exc:
+        except (GmailPluginError, OAuthTokenError) as exc:
             return {"status": "error", "message": str(exc)}
         except httpx.RequestError as exc:
             logger.error(f"Gmail network failure: {exc}")
@@ -136,41 +103,10 @@ class GmailPlugin(PluginBase):
             if not context.policy.can_use_capability(capability, self.name):
                 raise GmailPluginError(f"Capability '{capability}' denied for Gmail integration.")
 
-    async def _get_credentials(self, context: ToolContext, client: httpx.AsyncClient) -> GmailCredentials:
-        secret_blob = context.secrets.get_secret(SECRET_KEY)
-        if not secret_blob:
+    async def _get_credentials(self, context: ToolContext) -> GmailCredentials:
+        if not context.secrets.get_secret(SECRET_KEY):
             raise GmailPluginError("Gmail token is not configured. Run `pocket-cli secrets add gmail_token`.")
-
-        credentials = GmailCredentials.from_secret(secret_blob)
-        if credentials.is_expired:
-            credentials = await self._refresh_credentials(credentials, context, client)
-        return credentials
-
-    async def _refresh_credentials(
-        self, credentials: GmailCredentials, context: ToolContext, client: httpx.AsyncClient
-    ) -> GmailCredentials:
-        logger.info("Refreshing Gmail access token.")
-        data = {
-            "client_id": credentials.client_id,
-            "client_secret": credentials.client_secret,
-            "refresh_token": credentials.refresh_token,
-            "grant_type": "refresh_token",
-        }
-        response = await client.post(credentials.token_uri, data=data)
-        response.raise_for_status()
-        payload = response.json()
-
-        access_token = payload.get("access_token")
-        expires_in = payload.get("expires_in")
-        if not access_token or not expires_in:
-            raise GmailPluginError("Refresh token response missing required fields.")
-
-        credentials.access_token = access_token
-        credentials.expires_at = datetime.now(timezone.utc) + timedelta(seconds=int(expires_in))
-
-        # Persist the rotated access token securely.
-        context.secrets.set_secret(SECRET_KEY, credentials.as_secret())
-        return credentials
+        return await token_manager.get_credentials(SECRET_KEY, context, GmailCredentials.from_secret)
 
     @staticmethod
     def _auth_headers(credentials: GmailCredentials) -> Dict[str, str]:
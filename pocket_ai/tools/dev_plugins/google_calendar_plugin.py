@@ -6,6 +6,7 @@ class GoogleCalendarPlugin(PluginBase):
     name = "google_calendar"
     description = "Manage Google Calendar events"
     requires_capabilities = ["network", "secrets:google_token"]
+    side_effect_actions = frozenset({"create_event", "block_time"})
 
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
         action = input_data.get("action")
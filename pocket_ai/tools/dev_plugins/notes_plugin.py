@@ -2,6 +2,8 @@ from typing import Any, Dict
 import re
 import time
 
+from pocket_ai.ai.memory_index import memory_index
+from pocket_ai.core.executors import compute_executors
 from pocket_ai.core.logger import logger
 from pocket_ai.core.storage import storage
 
@@ -15,15 +17,24 @@ class NotesPlugin(PluginBase):
     name = "notes"
     description = "Manage simple text notes offline"
     requires_capabilities = ["storage:user_notes"]
+    side_effect_actions = frozenset({"capture_note", "write", "append", "delete"})
+    default_action = "list"
 
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
-        action = input_data.get("action", "list").lower()
+        action = input_data.get("action", self.default_action).lower()
         filename = input_data.get("filename")
         content = input_data.get("content", "")
 
         if action == "list":
             return {"status": "success", "notes": storage.list_keys("user_notes")}
 
+        if action == "search":
+            query = input_data.get("query", "")
+            if not query.strip():
+                return {"status": "error", "message": "Query is required"}
+            # Waiting on the indexer, backfilling and embedding all block.
+            return await compute_executors.run("embed", self._search, query, int(input_data.get("k", 5)))
+
         if action == "capture_note":
             filename = filename or f"note_{int(time.time())}.txt"
 
@@ -53,3 +64,17 @@ class NotesPlugin(PluginBase):
 
         logger.warning("Notes plugin received unsupported action: %s", action)
         return {"status": "error", "message": "Unknown action"}
+
+    @staticmethod
+    def _search(query: str, k: int) -> Dict[str, Any]:
+        # Notes saved just before the search may still be queued for indexing.
+        memory_index.flush()
+        if memory_index.needs_backfill:
+            memory_index.backfill()
+        results = []
+        # Only the top-k hits are decrypted.
+        for doc_id, score in memory_index.search(query, k=k, prefix="user_notes/"):
+            filename = doc_id.split("/", 1)[1]
+            data = storage.retrieve("user_notes", filename) or {}
+            results.append({"filename": filename, "score": round(score, 4), "content": data.get("content", "")})
+        return {"status": "success", "results": results}
@@ -6,6 +6,7 @@ class NotionPlugin(PluginBase):
     name = "notion_integration"
     description = "Read and write to Notion pages and databases"
     requires_capabilities = ["network", "secrets:notion_token"]
+    side_effect_actions = frozenset({"create_page", "append_block", "capture_note"})
 
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
         action = input_data.get("action")
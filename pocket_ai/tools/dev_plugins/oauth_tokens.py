@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import httpx  # type: ignore[import]
+
+from pocket_ai.core.logger import logger
+
+from .plugin_base import ToolContext
+
+
+DEFAULT_TOKEN_ENDPOINT = "https://oauth2.googleapis.com/token"
+REFRESH_TIMEOUT = 10.0
+# Tokens inside this window are treated as expired and refreshed before use.
+EXPIRY_SAFETY_WINDOW = timedelta(seconds=60)
+# Tokens inside this window are still served but refreshed in the background.
+PROACTIVE_REFRESH_WINDOW = timedelta(minutes=5)
+
+
+class OAuthTokenError(Exception):
+    """Raised when an integration token is missing, corrupted, or cannot be refreshed."""
+
+
+@dataclass
+class OAuthCredentials:
+    access_token: str
+    refresh_token: str = ""
+    client_id: str = ""
+    client_secret: str = ""
+    expires_at: Optional[datetime] = None
+    token_uri: str = DEFAULT_TOKEN_ENDPOINT
+
+    @classmethod
+    def from_secret(cls, secret_blob: str) -> "OAuthCredentials":
+        """
+        Accepts either a JSON OAuth blob or a bare API token (Notion/Todoist/Slack).
+        """
+        try:
+            payload = json.loads(secret_blob)
+        except json.JSONDecodeError:
+            return cls(access_token=secret_blob.strip())
+        if not isinstance(payload, dict):
+            return cls(access_token=secret_blob.strip())
+        if "access_token" not in payload:
+            raise OAuthTokenError("OAuth token missing field: access_token")
+
+        refresh_token = payload.get("refresh_token", "")
+        expires_at = cls._parse_expiry(payload.get("expires_at"))
+        if refresh_token and expires_at is None:
+            # Unknown expiry on a refreshable token: refresh on first use.
+            expires_at = datetime.now(timezone.utc) - EXPIRY_SAFETY_WINDOW
+        return cls(
+            access_token=payload["access_token"],
+            refresh_token=refresh_token,
+            client_id=payload.get("client_id", ""),
+            client_secret=payload.get("client_secret", ""),
+            expires_at=expires_at,
+            token_uri=payload.get("token_uri", DEFAULT_TOKEN_ENDPOINT),
+        )
+
+    @staticmethod
+    def _parse_expiry(expires_at: Optional[str]) -> Optional[datetime]:
+        if not expires_at:
+            return None
+        try:
+            normalized = expires_at.replace("Z", "+00:00") if "Z" in expires_at else expires_at
+            return datetime.fromisoformat(normalized)
+        except ValueError:
+            logger.warning("Failed to parse OAuth token expiry, forcing refresh.")
+            return datetime.now(timezone.utc) - EXPIRY_SAFETY_WINDOW
+
+    @property
+    def can_refresh(self) -> bool:
+        return bool(self.refresh_token and self.client_id and self.client_secret)
+
+    def expires_within(self, window: timedelta) -> bool:
+        if self.expires_at is None:
+            return False
+        return datetime.now(timezone.utc) >= (self.expires_at - window)
+
+    @property
+    def is_expired(self) -> bool:
+        # Refresh slightly before actual expiry to avoid race conditions.
+        return self.expires_within(EXPIRY_SAFETY_WINDOW)
+
+    def as_secret(self) -> str:
+        payload = {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "token_uri": self.token_uri,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+        }
+        return json.dumps(payload)
+
+
+CredentialParser = Callable[[str], OAuthCredentials]
+
+
+class OAuthTokenManager:
+    """
+    Process-wide cache of parsed integration credentials.
+
+    Parsed credentials are reused while the stored secret is unchanged, tokens
+    close to expiry are refreshed ahead of time, and concurrent refreshes for
+    the same secret share a single token-endpoint request.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport
+        self._cache: Dict[str, Tuple[str, OAuthCredentials]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    async def get_credentials(
+        self,
+        secret_key: str,
+        context: ToolContext,
+        parser: CredentialParser = OAuthCredentials.from_secret,
+    ) -> OAuthCredentials:
+        credentials = self._cached(secret_key, context, parser)
+        if credentials.is_expired and credentials.can_refresh:
+            return await self._refresh_once(secret_key, credentials, context)
+        if credentials.can_refresh and credentials.expires_within(PROACTIVE_REFRESH_WINDOW):
+            self._refresh_in_background(secret_key, credentials, context)
+        return credentials
+
+    async def get_access_token(self, secret_key: str, context: ToolContext) -> str:
+        credentials = await self.get_credentials(secret_key, context)
+        return credentials.access_token
+
+    async def auth_headers(self, secret_key: str, context: ToolContext) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {await self.get_access_token(secret_key, context)}"}
+
+    def invalidate(self, secret_key: Optional[str] = None):
+        if secret_key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(secret_key, None)
+
+    def _cached(self, secret_key: str, context: ToolContext, parser: CredentialParser) -> OAuthCredentials:
+        secret_blob = context.secrets.get_secret(secret_key)
+        if not secret_blob:
+            self._cache.pop(secret_key, None)
+            raise OAuthTokenError(
+                f"{secret_key} is not configured. Run `python -m pocket_ai.cli.secrets set {secret_key}`."
+            )
+        cached = self._cache.get(secret_key)
+        if cached and cached[0] == secret_blob:
+            return cached[1]
+        credentials = parser(secret_blob)
+        self._cache[secret_key] = (secret_blob, credentials)
+        return credentials
+
+    async def _refresh_once(
+        self, secret_key: str, credentials: OAuthCredentials, context: ToolContext
+    ) -> OAuthCredentials:
+        task = self._live_refresh(secret_key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(secret_key, credentials, context))
+            self._inflight[secret_key] = task
+            task.add_done_callback(lambda done: self._forget(secret_key, done))
+        # Shield so one cancelled caller does not abort the refresh for everyone else.
+        return await asyncio.shield(task)
+
+    def _live_refresh(self, secret_key: str) -> Optional[asyncio.Task]:
+        task = self._inflight.get(secret_key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        return task
+
+    def _forget(self, secret_key: str, task: asyncio.Task):
+        if self._inflight.get(secret_key) is task:
+            del self._inflight[secret_key]
+
+    def _refresh_in_background(self, secret_key: str, credentials: OAuthCredentials, context: ToolContext):
+        if self._live_refresh(secret_key) is not None:
+            return
+
+        async def _run():
+            try:
+                await self._refresh_once(secret_key, credentials, context)
+            except Exception as exc:
+                logger.warning(f"Background refresh for {secret_key} failed: {exc}")
+
+        task = asyncio.ensure_future(_run())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh(
+        self, secret_key: str, credentials: OAuthCredentials, context: ToolContext
+    ) -> OAuthCredentials:
+        logger.info(f"Refreshing OAuth access token for {secret_key}.")
+        data = {
+            "client_id": credentials.client_id,
+            "client_secret": credentials.client_secret,
+            "refresh_token": credentials.refresh_token,
+            "grant_type": "refresh_token",
+        }
+        try:
+            async with httpx.AsyncClient(timeout=REFRESH_TIMEOUT, transport=self.transport) as client:
+                response = await client.post(credentials.token_uri, data=data)
+            response.raise_for_status()
+            payload = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.error(f"OAuth refresh for {secret_key} failed: {exc}")
+            raise OAuthTokenError(f"Could not refresh {secret_key}; please retry or re-link.") from exc
+
+        access_token = payload.get("access_token")
+        expires_in = payload.get("expires_in")
+        if not access_token or not expires_in:
+            raise OAuthTokenError("Refresh token response missing required fields.")
+
+        credentials.access_token = access_token
+        credentials.expires_at = datetime.now(timezone.utc) + timedelta(seconds=int(expires_in))
+        if payload.get("refresh_token"):
+            credentials.refresh_token = payload["refresh_token"]
+
+        # Persist the rotated access token securely and keep the cache in step with it.
+        secret_blob = credentials.as_secret()
+        context.secrets.set_secret(secret_key, secret_blob)
+        self._cache[secret_key] = (secret_blob, credentials)
+        return credentials
+
+
+token_manager = OAuthTokenManager()
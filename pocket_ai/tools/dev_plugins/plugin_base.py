@@ -1,25 +1,52 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from pocket_ai.core.config import get_config
+from pocket_ai.core.deadlines import Deadline, DeadlineExceeded, current_deadline, time_left
 from pocket_ai.core.policy_engine import policy_engine
 from pocket_ai.core.secrets_manager import secrets_manager
 
 
 class ToolContext:
-    def __init__(self, user_id: str = "default"):
+    def __init__(self, user_id: str = "default", deadline: Optional[Deadline] = None):
         self.user_id = user_id
         self.config = get_config()
         self.policy = policy_engine
         self.secrets = secrets_manager
+        # Inherit the running request's deadline unless one is given explicitly.
+        self.deadline = deadline or current_deadline()
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left before the request deadline, or None if unbounded.
+        """
+        return time_left(deadline=self.deadline)
+
+    def timeout(self, default: float) -> float:
+        """
+        Network timeout for one call: ``default``, capped by the deadline.
+        """
+        return time_left(default, self.deadline)  # type: ignore[return-value]
+
+    def check_deadline(self, stage: str = "plugin"):
+        if self.deadline is not None and self.deadline.expired:
+            raise DeadlineExceeded(stage)
 
 
 class PluginBase(ABC):
     name: str
     description: str
     requires_capabilities: List[str] = []
+    # Max simultaneous execute() calls (e.g. for rate-limited APIs); None = unlimited.
+    max_concurrency: Optional[int] = None
+    # Identical concurrent calls share one execution unless the action writes
+    # something; list those here (or set coalesce = False for the whole plugin).
+    coalesce: bool = True
+    side_effect_actions: FrozenSet[str] = frozenset()
+    # The action execute() assumes when the payload names none.
+    default_action: Optional[str] = None
 
     @abstractmethod
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
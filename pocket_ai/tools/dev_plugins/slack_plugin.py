@@ -11,6 +11,7 @@ class SlackBridgePlugin(PluginBase):
     name = "slack_bridge"
     description = "Summarize unread Slack threads and draft replies"
     requires_capabilities = ["network", "secrets:slack_token"]
+    side_effect_actions = frozenset({"draft_reply"})
 
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
         action = input_data.get("action")
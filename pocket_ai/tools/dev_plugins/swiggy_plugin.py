@@ -6,6 +6,7 @@ class SwiggyPlugin(PluginBase):
     name = "swiggy_connector"
     description = "Search for food and prepare orders on Swiggy"
     requires_capabilities = ["network", "location"]
+    side_effect_actions = frozenset({"prepare_cart"})
 
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
         action = input_data.get("action")
@@ -6,9 +6,11 @@ class TodoistPlugin(PluginBase):
     name = "todoist_tasks"
     description = "Manage tasks in Todoist"
     requires_capabilities = ["network", "secrets:todoist_token"]
+    side_effect_actions = frozenset({"create"})
+    default_action = "create"
 
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
-        action = input_data.get("action", "create")
+        action = input_data.get("action", self.default_action)
         content = input_data.get("content", "")
         
         logger.info(f"Todoist Plugin executing: {action} - {content}")
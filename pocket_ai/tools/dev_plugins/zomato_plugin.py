@@ -11,6 +11,7 @@ class ZomatoPlugin(PluginBase):
     name = "zomato_connector"
     description = "Query Zomato for recommendations"
     requires_capabilities = ["network", "location"]
+    side_effect_actions = frozenset({"prepare_cart"})
 
     async def execute(self, input_data: Dict[str, Any], context: ToolContext) -> Dict[str, Any]:
         action = input_data.get("action")
@@ -2,12 +2,18 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
 import yaml
 
 from pocket_ai.ai.local_llm import local_llm
-from pocket_ai.ai.openai_gateway import openai_gateway
+from pocket_ai.ai.openai_gateway import StreamIncomplete, openai_gateway
+from pocket_ai.ai.prefix_cache import prefix_cache, static_prefix
+from pocket_ai.ai.response_cache import response_cache
+from pocket_ai.ai.streaming import FirstTokenTimer
+from pocket_ai.core.coalescing import SingleFlight, request_key
+from pocket_ai.core.config import get_config
+from pocket_ai.core.deadlines import DeadlineExceeded, run_with_deadline
 from pocket_ai.core.logger import logger
 from pocket_ai.core.policy_engine import policy_engine
 from pocket_ai.tools.dev_plugins.plugin_base import ToolContext
@@ -18,6 +24,7 @@ class EasyToolsRuntime:
     def __init__(self):
         self.tools_path = os.path.join(os.path.dirname(__file__), "easy_definitions")
         self.loaded_tools: Dict[str, Dict[str, Any]] = {}
+        self._flight = SingleFlight("easy_tools")
         self._load_tools()
 
     def _load_tools(self):
@@ -33,6 +40,7 @@ class EasyToolsRuntime:
                             name = tool_def["name"]
                             self.loaded_tools[name] = tool_def
                             tool_registry.register_easy_tool(name, tool_def)
+                            prefix_cache.register(static_prefix(tool_def["prompt_template"]))
                             logger.info(f"Loaded Easy Tool: {name}")
                 except Exception as exc:
                     logger.error(f"Failed to load easy tool {filename}: {exc}")
@@ -57,11 +65,29 @@ class EasyToolsRuntime:
                 aggregated[alias] = {"error": str(exc)}
         return aggregated
 
-    async def execute_tool(self, tool_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_tool(
+        self, tool_name: str, inputs: Dict[str, Any], on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run an easy tool. ``on_token`` receives the LLM output as it streams;
+        the result reports ``first_token_ms`` either way.
+        """
         tool = self.loaded_tools.get(tool_name)
         if not tool:
             return {"status": "error", "message": f"Tool {tool_name} not found"}
-
+        # A token callback belongs to one caller, so that run is not shared.
+        if on_token is not None or not tool.get("coalesce", True):
+            return await self._run_tool(tool_name, tool, inputs, on_token)
+        key = request_key(tool_name, inputs)
+        return await self._flight.run(key, lambda: self._run_tool(tool_name, tool, inputs))
+
+    async def _run_tool(
+        self,
+        tool_name: str,
+        tool: Dict[str, Any],
+        inputs: Dict[str, Any],
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
         # Gather contextual data
         context_inputs = dict(inputs)
         context_inputs.update(await self._collect_data_sources(tool))
@@ -71,21 +97,58 @@ class EasyToolsRuntime:
             prepared = json.dumps(value, ensure_ascii=False, indent=2) if isinstance(value, (dict, list)) else value
             prompt = prompt.replace(f"{{{{{key}}}}}", str(prepared))
 
-        prefer_cloud = tool.get("uses_cloud", False)
-        response_text: str
-        if prefer_cloud and policy_engine.can_use_cloud(f"easy_tool:{tool_name}"):
-            response_text = await openai_gateway.chat_completion(
-                [{"role": "user", "content": prompt}],
-                model=tool.get("model", "gpt-4o-mini"),
-            ) or local_llm.generate(prompt)
-        else:
-            response_text = local_llm.generate(prompt)
+        timer = FirstTokenTimer("easy_tool")
+        try:
+            response_text = await run_with_deadline(
+                self._collect(timer.wrap(self._stream(tool_name, tool, prompt)), on_token),
+                f"easy_tool:{tool_name}",
+                budget=get_config().timeouts.llm_s,
+            )
+        except (DeadlineExceeded, StreamIncomplete) as exc:
+            return {"status": "error", "message": str(exc), "tool_name": tool_name}
 
         return {
             "status": "success",
             "result": response_text,
             "tool_name": tool_name,
+            "first_token_ms": timer.first_token_ms,
         }
 
+    @staticmethod
+    async def _collect(tokens: AsyncIterator[str], on_token: Optional[Callable[[str], None]]) -> str:
+        parts = []
+        async for token in tokens:
+            parts.append(token)
+            if on_token is not None:
+                on_token(token)
+        return "".join(parts).strip()
+
+    async def _stream(self, tool_name: str, tool: Dict[str, Any], prompt: str) -> AsyncIterator[str]:
+        prefer_cloud = tool.get("uses_cloud", False)
+        if prefer_cloud and policy_engine.can_use_cloud(f"easy_tool:{tool_name}"):
+            model = tool.get("model", "gpt-4o-mini")
+            streamed = False
+            async for token in self._cached(
+                tool,
+                model,
+                prompt,
+                lambda: openai_gateway.chat_completion_stream([{"role": "user", "content": prompt}], model=model),
+            ):
+                streamed = True
+                yield token
+            if streamed:
+                return
+        async for token in self._cached(tool, local_llm.model_name, prompt, lambda: local_llm.stream(prompt)):
+            yield token
+
+    @staticmethod
+    def _cached(
+        tool: Dict[str, Any], model: str, prompt: str, stream: Callable[[], AsyncIterator[str]]
+    ) -> AsyncIterator[str]:
+        # The key covers the rendered prompt, so fresh data-source results miss the cache.
+        if not tool.get("cacheable", True):
+            return stream()
+        return response_cache.stream_or_generate(model, prompt, stream, tool.get("cache_ttl_seconds"))
+
 
 easy_tools = EasyToolsRuntime()
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import weakref
+from contextlib import nullcontext
 from typing import Any, Dict
 
+from pocket_ai.core.coalescing import SingleFlight, request_key
+from pocket_ai.core.config import get_config
+from pocket_ai.core.deadlines import run_with_deadline
 from pocket_ai.core.logger import logger
 from pocket_ai.core.policy_engine import policy_engine
 from pocket_ai.tools.dev_plugins.plugin_base import ToolContext
@@ -11,6 +17,11 @@ class ToolRegistry:
     def __init__(self):
         self.easy_tools: Dict[str, Dict[str, Any]] = {}
         self.dev_plugins: Dict[str, Any] = {}
+        # asyncio semaphores belong to one loop, so limits are kept per loop.
+        self._limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._flight = SingleFlight("dev_plugins")
 
     def register_easy_tool(self, name: str, definition: Dict[str, Any]):
         self.easy_tools[name] = definition
@@ -47,7 +58,41 @@ class ToolRegistry:
             raise ValueError(f"Plugin {name} not registered")
         ctx = context or ToolContext()
         self._enforce_capabilities(plugin, ctx)
-        return await plugin.execute(payload, ctx)
+        ctx.check_deadline(f"plugin:{name}")
+        if not self._coalescable(plugin, payload):
+            return await self._execute(name, plugin, payload, ctx)
+        # Identical concurrent calls (retries, parallel MCP clients) share one run.
+        key = request_key(name, ctx.user_id, payload)
+        return await self._flight.run(key, lambda: self._execute(name, plugin, payload, ctx))
+
+    async def _execute(self, name: str, plugin: Any, payload: Dict[str, Any], ctx: ToolContext):
+        async with self._concurrency_limit(name, plugin):
+            return await run_with_deadline(
+                plugin.execute(payload, ctx),
+                f"plugin:{name}",
+                budget=get_config().timeouts.plugin_s,
+                deadline=ctx.deadline,
+            )
+
+    @staticmethod
+    def _coalescable(plugin: Any, payload: Dict[str, Any]) -> bool:
+        if not getattr(plugin, "coalesce", True):
+            return False
+        side_effects = getattr(plugin, "side_effect_actions", None) or ()
+        action = payload.get("action") or getattr(plugin, "default_action", None)
+        if action is None:
+            # Unknown action on a plugin that can write: never merge.
+            return not side_effects
+        return str(action).strip().lower() not in side_effects
+
+    def _concurrency_limit(self, name: str, plugin: Any):
+        limit = getattr(plugin, "max_concurrency", None)
+        if not limit:
+            return nullcontext()
+        limits = self._limits.setdefault(asyncio.get_running_loop(), {})
+        if name not in limits:
+            limits[name] = asyncio.Semaphore(limit)
+        return limits[name]
 
     @staticmethod
     def _enforce_capabilities(plugin: Any, context: ToolContext):
@@ -1,15 +1,44 @@
-from fastapi import Depends, FastAPI, Header, HTTPException, Form
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, TypeVar
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Form, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from html import escape
+from starlette.background import BackgroundTask
 
+from pocket_ai.ai.inference import local_inference
+from pocket_ai.ai.local_llm import local_llm
+from pocket_ai.ai.nlu import nlu_engine
+from pocket_ai.ai.openai_gateway import openai_gateway
 from pocket_ai.ai.orchestrator import orchestrator
+from pocket_ai.core.admission import AdmissionRejected, AdmissionTicket, admission_controller
+from pocket_ai.core.compute_backends import compute_backends
 from pocket_ai.core.config import get_config
 from pocket_ai.core.onboarding import acknowledge_onboarding, get_onboarding_state
+from pocket_ai.core.prewarm import model_prewarmer
+from pocket_ai.core.rate_limiter import cloud_rate_limiter
 from pocket_ai.core.security import verify_token
+from pocket_ai.core.tracing import tracer
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Runs once uvicorn is up; prewarming happens in a background thread so
+    # the server starts accepting requests immediately.
+    await asyncio.to_thread(compute_backends.ensure_probed)
+    if get_config().models.prewarm_on_startup:
+        model_prewarmer.start()
+    yield
+    await openai_gateway.aclose()
+
 
-app = FastAPI(title="Pocket AI UI")
+app = FastAPI(title="Pocket AI UI", lifespan=lifespan)
+
+T = TypeVar("T")
+DISCONNECT_POLL_INTERVAL = 0.25
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,15 +63,143 @@ class CommandRequest(BaseModel):
 
 @app.get("/")
 async def root(_: None = Depends(require_api_client)):
-    return {"status": "online", "profile": get_config().profile}
+    return {"status": "online", "profile": get_config().profile, "models": model_prewarmer.readiness()}
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(_, exc: AdmissionRejected):
+    return JSONResponse(
+        {"status": "busy", "message": str(exc), "reason": exc.reason},
+        status_code=429,
+        headers={"Retry-After": str(int(exc.retry_after) or 1)},
+    )
 
 
 @app.post("/command")
-async def send_command(cmd: CommandRequest, _: None = Depends(require_api_client)):
-    result = await orchestrator.process_text_command(cmd.text)
+async def send_command(cmd: CommandRequest, request: Request, _: None = Depends(require_api_client)):
+    async with admission_controller.slot("ui"):
+        result = await _cancel_on_disconnect(request, orchestrator.process_text_command(cmd.text))
     return result
 
 
+async def _cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await ``awaitable`` but cancel it if the HTTP client goes away first.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+@app.post("/command/stream")
+async def stream_command(cmd: CommandRequest, _: None = Depends(require_api_client)):
+    """
+    Server-Sent Events variant of /command; the client disconnecting cancels the command.
+    """
+    # Admit before streaming starts so a busy server can still answer 429.
+    ticket = await admission_controller.acquire("ui")
+    return StreamingResponse(
+        _sse_events(orchestrator.stream_text_command(cmd.text), ticket),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(ticket.release),
+    )
+
+
+async def _sse_events(events: AsyncIterator[Dict[str, Any]], ticket: AdmissionTicket) -> AsyncIterator[str]:
+    try:
+        async for event in events:
+            yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+    except Exception as exc:
+        payload = {"event": "error", "message": str(exc)}
+        yield f"event: error\ndata: {json.dumps(payload)}\n\n"
+    finally:
+        ticket.release()
+        await events.aclose()
+
+
+@app.websocket("/ws/command")
+async def command_socket(websocket: WebSocket):
+    """
+    Streams pipeline events for each {"text": ...} message. Browsers cannot set
+    custom headers on WebSockets, so the API token may also be passed as ?key=.
+    """
+    provided = websocket.headers.get("x-pocket-key") or websocket.query_params.get("key")
+    if get_config().api.require_auth and not verify_token("api_auth_token", provided):
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                cmd = CommandRequest.model_validate(await websocket.receive_json())
+            except (ValidationError, ValueError) as exc:
+                await websocket.send_json({"event": "error", "message": str(exc)})
+                continue
+            try:
+                ticket = await admission_controller.acquire("ui")
+            except AdmissionRejected as exc:
+                await websocket.send_json({"event": "error", "status": "busy", "message": str(exc)})
+                continue
+            events = orchestrator.stream_text_command(cmd.text)
+            try:
+                async for event in events:
+                    await websocket.send_text(json.dumps(event, default=str))
+            except WebSocketDisconnect:
+                raise
+            except Exception as exc:
+                await websocket.send_json({"event": "error", "message": str(exc)})
+            finally:
+                ticket.release()
+                await events.aclose()
+    except WebSocketDisconnect:
+        return
+
+
+@app.get("/metrics/latency")
+async def latency_metrics(limit: int = 20, _: None = Depends(require_api_client)):
+    return tracer.snapshot(limit)
+
+
+@app.get("/metrics/admission")
+async def admission_metrics(_: None = Depends(require_api_client)):
+    return admission_controller.snapshot()
+
+
+@app.get("/metrics/models")
+async def model_metrics(_: None = Depends(require_api_client)):
+    return local_inference.model_state()
+
+
+@app.get("/metrics/llm")
+async def llm_metrics(_: None = Depends(require_api_client)):
+    return local_llm.stats()
+
+
+@app.get("/metrics/backends")
+async def backend_metrics(_: None = Depends(require_api_client)):
+    return compute_backends.snapshot()
+
+
+@app.get("/metrics/cloud")
+async def cloud_metrics(_: None = Depends(require_api_client)):
+    return {"openai": openai_gateway.stats(), "rate_limits": cloud_rate_limiter.stats()}
+
+
+@app.get("/metrics/nlu")
+async def nlu_metrics(_: None = Depends(require_api_client)):
+    return nlu_engine.cache_stats()
+
+
 @app.get("/config")
 async def get_configuration(_: None = Depends(require_api_client)):
     return get_config().model_dump()
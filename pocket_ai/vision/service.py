@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional
 
+from pocket_ai.core.executors import compute_executors
 from pocket_ai.core.logger import logger
 from pocket_ai.vision.camera import Camera, CameraError, camera
 from pocket_ai.vision.privacy_filter import privacy_filter
@@ -56,8 +57,8 @@ class VisionService:
             logger.error("Camera capture failed: %s", exc)
             return VisionResult(status="error", reason="capture_failed")
 
-        filtered_bytes = self.privacy.process_image(frame.data)
-        offline_results = self._run_offline(filtered_bytes)
+        filtered_bytes = await compute_executors.run("vision", self.privacy.process_image, frame.data)
+        offline_results = await self._run_offline(filtered_bytes)
 
         online_summary = None
         if use_online and prompt:
@@ -72,11 +73,11 @@ class VisionService:
             online_summary=online_summary,
         )
 
-    def _run_offline(self, image_bytes: bytes) -> Optional[List[Dict[str, Any]]]:
+    async def _run_offline(self, image_bytes: bytes) -> Optional[List[Dict[str, Any]]]:
         if not self.offline:
             logger.debug("Offline vision unavailable.")
             return None
-        detections = self.offline.detect_objects(image_bytes)
+        detections = await compute_executors.run("vision", self.offline.detect_objects, image_bytes)
         if not detections:
             return []
         if Detection and detections and isinstance(detections[0], Detection):
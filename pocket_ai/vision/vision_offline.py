@@ -1,13 +1,14 @@
 import io
 import os
-import platform
 from dataclasses import dataclass
 from typing import List
 
 import numpy as np  # type: ignore[import]
 from PIL import Image  # type: ignore[import]
 
+from pocket_ai.core.compute_backends import BackendType, compute_backends, edgetpu_library
 from pocket_ai.core.logger import logger
+from pocket_ai.core.model_manager import ModelSpec, ModelUnavailable, model_manager
 
 # Try to import TFLite runtime
 try:
@@ -21,6 +22,9 @@ except ImportError:
 
 MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
 LABEL_FILE = os.path.join(MODELS_DIR, "labels_mobilenet.txt")
+TPU_MODEL_PATH = os.path.join(MODELS_DIR, "mobilenet_v2_1.0_224_quant_edgetpu.tflite")
+CPU_MODEL_PATH = os.path.join(MODELS_DIR, "mobilenet_v2_1.0_224.tflite")
+VISION_MODEL = "mobilenet_v2"
 
 
 @dataclass
@@ -29,14 +33,26 @@ class Detection:
     confidence: float
 
 
+class VisionModel:
+    __slots__ = ("interpreter", "input_details", "output_details", "backend")
+
+    def __init__(self, interpreter, backend: BackendType = BackendType.PI_CPU):
+        self.interpreter = interpreter
+        self.backend = backend
+        self.interpreter.allocate_tensors()
+        self.input_details = interpreter.get_input_details()
+        self.output_details = interpreter.get_output_details()
+
+
 class OfflineVision:
     def __init__(self):
-        self.interpreter = None
-        self.input_details = None
-        self.output_details = None
         self.labels: List[str] = self._load_labels()
         self.min_confidence = 0.35
-        self._load_model()
+        # The interpreter is created on first detection, not at import.
+        model_path = TPU_MODEL_PATH if os.path.exists(TPU_MODEL_PATH) else CPU_MODEL_PATH
+        model_manager.register(
+            ModelSpec(VISION_MODEL, model_path, loader=self._load_model, workload="vision", warmup=self._warm_up)
+        )
 
     def _load_labels(self) -> List[str]:
         if os.path.exists(LABEL_FILE):
@@ -45,52 +61,66 @@ class OfflineVision:
         # Fallback to ImageNet placeholder labels
         return [f"class_{idx}" for idx in range(1001)]
 
-    def _load_model(self):
+    def _load_model(self, model_path: str) -> VisionModel:
         if not tflite:
-            return
-
-        tpu_model_path = os.path.join(MODELS_DIR, "mobilenet_v2_1.0_224_quant_edgetpu.tflite")
-        cpu_model_path = os.path.join(MODELS_DIR, "mobilenet_v2_1.0_224.tflite")
-
-        try:
-            self.interpreter = self._try_load_edgetpu(tpu_model_path)
-        except Exception as exc:
-            logger.debug("TPU delegate unavailable: %s", exc)
-            self.interpreter = None
-
-        if not self.interpreter and os.path.exists(cpu_model_path):
+            raise ModelUnavailable("No TFLite runtime installed")
+
+        interpreter = None
+        backend = BackendType.PI_CPU
+        if model_path == TPU_MODEL_PATH:
+            try:
+                interpreter = self._try_load_edgetpu(model_path)
+                backend = BackendType.PI_TPU
+            except Exception as exc:
+                logger.debug("TPU delegate unavailable: %s", exc)
+
+        if not interpreter and os.path.exists(CPU_MODEL_PATH):
             logger.info("Vision: Falling back to CPU model.")
-            self.interpreter = tflite.Interpreter(model_path=cpu_model_path)
+            # Given a path, TFLite memory-maps the flatbuffer instead of copying it.
+            interpreter = tflite.Interpreter(model_path=CPU_MODEL_PATH)
 
-        if not self.interpreter:
+        if not interpreter:
             logger.error("Vision: No compatible models found.")
-            return
+            raise ModelUnavailable("No compatible vision model found")
 
-        self.interpreter.allocate_tensors()
-        self.input_details = self.interpreter.get_input_details()
-        self.output_details = self.interpreter.get_output_details()
-        logger.info("Vision: Offline model ready (input=%s).", self.input_details[0]["shape"])
+        model = VisionModel(interpreter, backend)
+        logger.info("Vision: Offline model ready (input=%s).", model.input_details[0]["shape"])
+        return model
+
+    @staticmethod
+    def _warm_up(model: VisionModel):
+        input_info = model.input_details[0]
+        model.interpreter.set_tensor(input_info["index"], np.zeros(input_info["shape"], dtype=input_info["dtype"]))
+        model.interpreter.invoke()
 
     def _try_load_edgetpu(self, model_path: str):
         if not os.path.exists(model_path):
             raise FileNotFoundError("TPU model missing.")
-        lib_name = "libedgetpu.so.1" if platform.system() == "Linux" else "edgetpu.dll"
-        delegate = tflite.load_delegate(lib_name)
+        delegate = tflite.load_delegate(edgetpu_library())
         logger.info("Vision: Loaded Edge TPU delegate.")
         return tflite.Interpreter(model_path=model_path, experimental_delegates=[delegate])
 
     def detect_objects(self, image_bytes: bytes) -> List[Detection]:
-        if not self.interpreter or not self.input_details or not self.output_details:
+        if not tflite:
             return []
         if not image_bytes:
             raise ValueError("Empty image payload provided to OfflineVision.")
+        try:
+            with model_manager.use(VISION_MODEL) as model:
+                # Measured per backend so routing sees real TPU/CPU latencies.
+                with compute_backends.router.track("vision", model.backend):
+                    return self._detect(model, image_bytes)
+        except ModelUnavailable as exc:
+            logger.debug("Vision model unavailable: %s", exc)
+            return []
 
-        tensor = self._preprocess(image_bytes)
-        self.interpreter.set_tensor(self.input_details[0]["index"], tensor)
-        self.interpreter.invoke()
+    def _detect(self, model: VisionModel, image_bytes: bytes) -> List[Detection]:
+        tensor = self._preprocess(model, image_bytes)
+        model.interpreter.set_tensor(model.input_details[0]["index"], tensor)
+        model.interpreter.invoke()
 
-        output = self.interpreter.get_tensor(self.output_details[0]["index"])
-        output = self._dequantize(output, self.output_details[0])
+        output = model.interpreter.get_tensor(model.output_details[0]["index"])
+        output = self._dequantize(output, model.output_details[0])
         scores = output.squeeze()
 
         top_indices = scores.argsort()[-5:][::-1]
@@ -104,9 +134,9 @@ class OfflineVision:
 
         return detections
 
-    def _preprocess(self, image_bytes: bytes):
+    def _preprocess(self, model: VisionModel, image_bytes: bytes):
         image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        input_info = self.input_details[0]
+        input_info = model.input_details[0]
         height, width = input_info["shape"][1:3]
         image = image.resize((width, height))
         array = np.asarray(image)
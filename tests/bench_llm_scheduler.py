@@ -0,0 +1,75 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pocket_ai.ai.llm_scheduler import DecodeBackend, LLMScheduler
+from pocket_ai.core.config import get_config
+from pocket_ai.core.executors import ComputeExecutors
+
+STEP_BASE_S = 0.004      # fixed cost of one forward pass (weights read once)
+STEP_PER_SEQ_S = 0.0005  # extra cost per sequence in the batch
+CONCURRENCY = 16
+LENGTHS = [8, 64]        # a mix of short tool answers and long fallbacks
+
+
+class SimulatedBatchBackend(DecodeBackend):
+    """
+    A decode step costs ``STEP_BASE_S + STEP_PER_SEQ_S * batch`` — roughly how
+    memory-bound CPU decoding scales, since the weights are read once per step.
+    """
+
+    def start(self, prompt):
+        return [int(prompt), 0]
+
+    def step(self, sequences):
+        time.sleep(STEP_BASE_S + STEP_PER_SEQ_S * len(sequences))
+        outputs = []
+        for sequence in sequences:
+            sequence[1] += 1
+            outputs.append("tok " if sequence[1] <= sequence[0] else None)
+        return outputs
+
+
+async def run_load(batch_size: int):
+    get_config().llm_scheduler.max_batch_size = batch_size
+    executors = ComputeExecutors()
+    scheduler = LLMScheduler(SimulatedBatchBackend(), executors)
+
+    async def request(length):
+        start = time.perf_counter()
+        await scheduler.generate(str(length))
+        return length, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(request(LENGTHS[i % len(LENGTHS)]) for i in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+    executors.shutdown()
+    latencies = sorted(ms for _, ms in results)
+    short = [ms for length, ms in results if length == min(LENGTHS)]
+    return {
+        "tokens_per_s": scheduler.stats()["tokens"] / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+        "short_p50_ms": statistics.median(short),
+        "avg_batch": scheduler.stats()["avg_batch_size"],
+    }
+
+
+def main():
+    print(f"{CONCURRENCY} concurrent requests, {LENGTHS} tokens each (alternating)")
+    print(f"{'max batch':>10} {'tok/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'short p50':>10} {'avg batch':>10}")
+    for batch_size in (1, 4, 8, 16):
+        r = asyncio.run(run_load(batch_size))
+        print(
+            f"{batch_size:>10} {r['tokens_per_s']:>8.0f} {r['p50_ms']:>9.0f} {r['p95_ms']:>9.0f} "
+            f"{r['short_p50_ms']:>10.0f} {r['avg_batch']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
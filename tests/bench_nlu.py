@@ -0,0 +1,116 @@
+import os
+import random
+import re
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pocket_ai.ai.nlu import nlu_engine
+from pocket_ai.core.logger import logger
+
+
+def legacy_parse(text: str) -> dict:
+    text = text.lower()
+    logger.debug(f"NLU parsing: {text}")
+    if "task" in text or "todo" in text or "remind me" in text:
+        content = re.sub(r"(add|create|make|a)?\s*(task|todo|note)?\s*(to|that)?\s*", "", text).strip()
+        return {"type": "create_task", "content": content, "raw": text}
+    elif "note" in text and "save" in text:
+        content = text.split("note", 1)[1].strip(": ").strip()
+        return {"type": "create_note", "content": content, "raw": text}
+    elif "block" in text and ("hour" in text or "time" in text):
+        return {"type": "block_time", "raw": text}
+    elif "draft" in text and "email" in text:
+        return {"type": "draft_email", "raw": text}
+    elif "food" in text or "dinner" in text or "lunch" in text or "order" in text:
+        return {"type": "order_food", "raw": text}
+    elif "ate" in text or "log meal" in text:
+        return {"type": "log_meal", "raw": text}
+    return {"type": "unknown", "raw": text}
+
+
+TEMPLATES = [
+    "Add a task to {thing}",
+    "Remind me to {thing} tomorrow",
+    "Save a note: {thing}",
+    "Block {n} hours for deep work",
+    "Block {n} minutes to {thing}",
+    "Draft email to {person} about {thing}",
+    "Order dinner under {price}",
+    "Find lunch for {n} people",
+    "I ate {food} for lunch",
+    "Log meal {food}",
+    "What's the weather like in {place}?",
+    "Tell me a joke about {thing}",
+    "Update the project plan and {thing}",
+]
+FILLERS = {
+    "thing": ["call mom", "renew the passport", "review the quarterly deck", "water the plants", "book a cab"],
+    "person": ["my manager", "ravi", "the landlord"],
+    "food": ["pizza", "a bowl of dal", "two idlis", "a salad"],
+    "place": ["Bangalore", "Pune", "Chennai"],
+    "price": ["300", "₹450", "250 rs"],
+    "n": ["1", "2", "3", "90"],
+}
+
+
+def build_corpus(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        template = rng.choice(TEMPLATES)
+        corpus.append(template.format(**{key: rng.choice(values) for key, values in FILLERS.items()}))
+    return corpus
+
+
+def measure(label: str, func, corpus: list, rounds: int = 5):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    per_call_us = best / len(corpus) * 1e6
+    print(f"{label:<28} {per_call_us:8.2f} us/utterance {len(corpus) / best:12.0f} utt/s")
+
+
+def main():
+    print("=== NLU MATCHER BENCHMARK ===")
+    for size in (1000, 10000):
+        corpus = build_corpus(size)
+        print(f"\n--- {size} utterances ---")
+        measure("legacy substring chain", legacy_parse, corpus)
+        measure("compiled grammar", lambda text: nlu_engine.grammar.match(text.lower()), corpus)
+        nlu_engine.clear_cache()
+        measure("cached parse_intent", nlu_engine.parse_intent, corpus)
+        measure("compound split", nlu_engine.parse_intents, corpus)
+        unique = list(dict.fromkeys(corpus))
+        nlu_engine.clear_cache()
+        start = time.perf_counter()
+        nlu_engine.parse_batch(unique)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for text in unique:
+            nlu_engine.clear_cache()
+            nlu_engine.parse_intent(text)
+        single = time.perf_counter() - start
+        print(f"{'parse_batch (cold, unique)':<28} {cold / len(unique) * 1e6:8.2f} us/utterance"
+              f"  vs one-by-one {single / len(unique) * 1e6:.2f} us ({len(unique)} unique)")
+        print(f"{'cache stats':<28} {nlu_engine.cache_stats()}")
+
+    corpus = build_corpus(10000)
+    changed = {}
+    for text in corpus:
+        old, new = legacy_parse(text)["type"], nlu_engine.parse_intent(text)["type"]
+        if old != new:
+            changed.setdefault((old, new), text)
+    print(f"\nIntent changes vs legacy ({len(changed)} kinds, mostly precedence/word-boundary fixes):")
+    for (old, new), example in sorted(changed.items()):
+        print(f"  {old:<12} -> {new:<12} e.g. {example!r}")
+    print("\n=== BENCHMARK COMPLETE ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Accuracy and throughput of LocalNLU on the labelled corpus in nlu_corpus.yaml.
+
+    python tests/bench_nlu_corpus.py                 # table
+    python tests/bench_nlu_corpus.py --json out.json # also write JSON for trend tracking
+
+Runs fully offline. Each tier is measured with a cold cache so throughput
+reflects parsing, not LRU hits.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import yaml
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pocket_ai.ai.nlu import LocalNLU
+from pocket_ai.core.config import get_config
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "nlu_corpus.yaml")
+ROUNDS = 5
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[Tuple[str, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return [(str(text), label) for label, texts in data.items() for text in texts or []]
+
+
+def score(labels: List[str], predictions: List[str]) -> Dict[str, Dict[str, float]]:
+    report: Dict[str, Dict[str, float]] = {}
+    for intent in sorted(set(labels) | set(predictions)):
+        tp = sum(1 for gold, pred in zip(labels, predictions) if gold == intent and pred == intent)
+        fp = sum(1 for gold, pred in zip(labels, predictions) if gold != intent and pred == intent)
+        fn = sum(1 for gold, pred in zip(labels, predictions) if gold == intent and pred != intent)
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        report[intent] = {
+            "support": tp + fn,
+            "precision": round(precision, 4),
+            "recall": round(recall, 4),
+            "f1": round(f1, 4),
+        }
+    return report
+
+
+def evaluate(corpus: List[Tuple[str, str]], use_classifier: bool = True) -> Dict:
+    settings = get_config().intent_classifier
+    previous = settings.enabled
+    settings.enabled = use_classifier
+    try:
+        texts = [text for text, _ in corpus]
+        labels = [label for _, label in corpus]
+        nlu = LocalNLU(cache_size=0)
+        nlu.parse_batch(texts[:1])  # train the classifier outside the timed loop
+
+        best_single = best_batch = float("inf")
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            predictions = [nlu.parse_intent(text)["type"] for text in texts]
+            best_single = min(best_single, time.perf_counter() - start)
+            start = time.perf_counter()
+            nlu.parse_batch(texts)
+            best_batch = min(best_batch, time.perf_counter() - start)
+    finally:
+        settings.enabled = previous
+
+    per_intent = score(labels, predictions)
+    known = [intent for intent in per_intent if intent != "unknown" and per_intent[intent]["support"]]
+    return {
+        "accuracy": round(sum(g == p for g, p in zip(labels, predictions)) / len(labels), 4),
+        "macro_f1": round(sum(per_intent[intent]["f1"] for intent in known) / len(known), 4),
+        "llm_fallback_rate": round(predictions.count("unknown") / len(predictions), 4),
+        "utterances_per_second": round(len(texts) / best_single, 1),
+        "batch_utterances_per_second": round(len(texts) / best_batch, 1),
+        "per_intent": per_intent,
+        "errors": [
+            {"text": text, "expected": gold, "predicted": pred}
+            for (text, gold), pred in zip(corpus, predictions)
+            if gold != pred
+        ],
+    }
+
+
+def run(corpus_path: str = CORPUS_PATH) -> Dict:
+    corpus = load_corpus(corpus_path)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "corpus": os.path.basename(corpus_path),
+        "utterances": len(corpus),
+        "tiers": {
+            "grammar": evaluate(corpus, use_classifier=False),
+            "grammar+classifier": evaluate(corpus, use_classifier=True),
+        },
+    }
+
+
+def print_report(report: Dict):
+    print(f"=== NLU CORPUS BENCHMARK ({report['utterances']} utterances) ===")
+    for tier, result in report["tiers"].items():
+        print(f"\n--- {tier} ---")
+        print(f"{'intent':<14} {'support':>7} {'precision':>9} {'recall':>7} {'f1':>6}")
+        for intent, row in result["per_intent"].items():
+            print(f"{intent:<14} {row['support']:>7} {row['precision']:>9.3f} {row['recall']:>7.3f} {row['f1']:>6.3f}")
+        print(
+            f"accuracy {result['accuracy']:.3f}  macro-F1 {result['macro_f1']:.3f}  "
+            f"LLM fallback {result['llm_fallback_rate']:.1%}  "
+            f"{result['utterances_per_second']:.0f} utt/s single, {result['batch_utterances_per_second']:.0f} utt/s batch"
+        )
+        for error in result["errors"]:
+            print(f"  miss: {error['text']!r} expected {error['expected']}, got {error['predicted']}")
+    print("\n=== BENCHMARK COMPLETE ===")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--json", dest="json_path", help="also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = run(args.corpus)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
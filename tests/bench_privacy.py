@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pocket_ai.core.privacy import EMAIL_RE, PHONE_RE, scrub_stream, scrub_text, summarize_for_log
+
+
+def legacy_scrub(payload: str) -> str:
+    sanitized = EMAIL_RE.sub("[EMAIL]", payload)
+    sanitized = PHONE_RE.sub("[PHONE]", sanitized)
+    return sanitized.strip()
+
+
+def legacy_summary(payload: str, limit: int = 160) -> str:
+    text = legacy_scrub(payload)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}..."
+
+
+def build_document(size_kb: int, with_pii: bool = True) -> str:
+    paragraph = (
+        "Quarterly planning notes. Ping ravi.k@example.com about the invoice and call "
+        "+91 98450 12345 before Friday. Budget review moved to 3pm; agenda attached.\n"
+    )
+    if not with_pii:
+        paragraph = "Quarterly planning notes. Budget review moved to the afternoon; agenda attached.\n"
+    repeats = (size_kb * 1024) // len(paragraph) + 1
+    return (paragraph * repeats)[: size_kb * 1024]
+
+
+def measure(label: str, func, payload: str, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(payload)
+    elapsed = time.perf_counter() - start
+    mb = len(payload) * rounds / (1024 * 1024)
+    print(f"{label:<28} {elapsed / rounds * 1000:9.3f} ms/call {mb / elapsed:9.1f} MB/s")
+
+
+def main():
+    print("=== PII SCRUBBER BENCHMARK ===")
+    for size_kb, with_pii in ((4, True), (64, True), (1024, True), (1024, False)):
+        doc = build_document(size_kb, with_pii)
+        rounds = max(3, 2048 // size_kb)
+        kind = "with PII" if with_pii else "plain prose"
+        print(f"\n--- {size_kb} KB payload ({kind}), {rounds} rounds ---")
+        measure("legacy two-pass scrub", legacy_scrub, doc, rounds)
+        measure("single-pass scrub", scrub_text, doc, rounds)
+        measure("legacy summarize_for_log", legacy_summary, doc, rounds)
+        measure("bounded summarize_for_log", summarize_for_log, doc, rounds)
+        chunks = [doc[i:i + 512] for i in range(0, len(doc), 512)]
+        measure("streaming scrub (512B)", lambda _, chunks=chunks: "".join(scrub_stream(chunks)), doc, rounds)
+        assert scrub_text(doc) == legacy_scrub(doc)
+        assert summarize_for_log(doc) == legacy_summary(doc)
+    print("\n=== BENCHMARK COMPLETE ===")
+
+
+if __name__ == "__main__":
+    main()
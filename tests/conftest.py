@@ -0,0 +1,37 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Storage singletons read the path at import, so point them away from the
+# real ``data/`` directory before anything from pocket_ai is imported.
+if "POCKET_STORAGE_PATH" not in os.environ:
+    _storage_dir = tempfile.mkdtemp(prefix="pocket-ai-tests-")
+    os.environ["POCKET_STORAGE_PATH"] = _storage_dir
+    atexit.register(shutil.rmtree, _storage_dir, ignore_errors=True)
+
+import pytest  # noqa: E402
+
+from openai_standin import StandInServer  # noqa: E402
+from pocket_ai.ai.openai_gateway import openai_gateway  # noqa: E402
+from pocket_ai.core.config import get_config  # noqa: E402
+
+
+@pytest.fixture
+def openai_standin(monkeypatch):
+    """Points ``openai_gateway`` at a local stand-in server with fast retries."""
+    server = StandInServer().start()
+    monkeypatch.setattr(get_config().openai, "base_url", server.url)
+    monkeypatch.setattr(get_config().openai.http, "backoff_base_s", 0.01)
+    monkeypatch.setattr(openai_gateway, "api_key", "test-key")
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def gpu_standin(monkeypatch):
+    """A stand-in GPU inference server configured as ``backend_routing.gpu_server_url``."""
+    server = StandInServer().start()
+    monkeypatch.setattr(get_config().backend_routing, "gpu_server_url", server.root_url)
+    yield server
+    server.stop()
@@ -0,0 +1,87 @@
+"""
+A local stand-in for the OpenAI chat completions API, served by uvicorn on
+an ephemeral port. ``script`` queues per-request behaviour: an int answers
+with that HTTP status, a float delays the answer by that many seconds, and
+``"cut"`` drops a streamed answer after its first token.
+It also answers ``GET /health`` like the GPU inference server (503 once
+``healthy`` is cleared).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def reply_for(body: dict) -> str:
+    content = body["messages"][-1]["content"] if body.get("messages") else ""
+    if isinstance(content, list):
+        content = " ".join(part.get("text", "") for part in content if part.get("type") == "text")
+    return f"Stand-in {body.get('model')} reply to: {content}"
+
+
+class StandInServer:
+    def __init__(self):
+        self.script = deque()
+        self.requests = 0
+        self.connections = set()
+        self.healthy = True
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self._chat)
+        self.app.get("/health")(self._health)
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=0, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def root_url(self) -> str:
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    @property
+    def url(self) -> str:
+        return f"{self.root_url}/v1"
+
+    def start(self) -> "StandInServer":
+        self._thread.start()
+        deadline = time.time() + 5
+        while not self._server.started and time.time() < deadline:
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join(5)
+
+    async def _health(self):
+        if not self.healthy:
+            return JSONResponse({"status": "unavailable"}, status_code=503)
+        return {"status": "ok"}
+
+    async def _chat(self, request: Request):
+        self.requests += 1
+        self.connections.add(request.client.port)
+        action = self.script.popleft() if self.script else None
+        if isinstance(action, int):
+            return JSONResponse({"error": {"message": "scripted failure"}}, status_code=action, headers={"Retry-After": "0"})
+        if isinstance(action, float):
+            await asyncio.sleep(action)
+
+        body = await request.json()
+        text = reply_for(body)
+        if not body.get("stream"):
+            return {"choices": [{"message": {"role": "assistant", "content": text}}]}
+
+        async def events():
+            for word in text.split(" "):
+                chunk = {"choices": [{"delta": {"content": word + " "}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if action == "cut":
+                    raise ConnectionResetError("scripted disconnect")  # drops the connection mid-body
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
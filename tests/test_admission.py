@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from pocket_ai.core.admission import AdmissionController, AdmissionRejected, admission_controller
+from pocket_ai.core.config import get_config
+from pocket_ai.ui.api import app
+
+
+@pytest.fixture
+def admission_settings():
+    settings = get_config().admission
+    saved = settings.model_copy(deep=True)
+    yield settings
+    for field in ("max_concurrent", "reserved_interactive", "queue_limits", "queue_timeout_s"):
+        setattr(settings, field, getattr(saved, field))
+
+
+def test_waiters_are_served_by_priority(admission_settings):
+    admission_settings.max_concurrent = 1
+    controller = AdmissionController()
+    order = []
+
+    async def request(source):
+        async with controller.slot(source):
+            order.append(source)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        holder = await controller.acquire("ui")
+        tasks = [asyncio.ensure_future(request(source)) for source in ("mcp", "ui", "voice")]
+        await asyncio.sleep(0.01)
+        holder.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert order == ["voice", "ui", "mcp"]
+    assert controller.snapshot()["active"] == {"voice": 0, "ui": 0, "mcp": 0}
+
+
+def test_mcp_cannot_take_reserved_slot_and_full_queue_rejects(admission_settings):
+    admission_settings.max_concurrent = 2
+    admission_settings.queue_limits = {"voice": 1, "ui": 1, "mcp": 1}
+    controller = AdmissionController()
+
+    async def scenario():
+        first = await controller.acquire("mcp")
+        queued = asyncio.ensure_future(controller.acquire("mcp"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire("mcp")
+        # The reserved slot is still free for interactive traffic.
+        interactive = await controller.acquire("ui")
+        first.release()
+        second = await queued
+        interactive.release()
+        second.release()
+
+    asyncio.run(scenario())
+    snapshot = controller.snapshot()
+    assert snapshot["rejected"]["mcp"] == 1
+    assert snapshot["admitted"] == {"voice": 0, "ui": 1, "mcp": 2}
+
+
+def test_queue_timeout_gives_up_cleanly(admission_settings):
+    admission_settings.max_concurrent = 1
+    admission_settings.queue_timeout_s = 0.02
+    controller = AdmissionController()
+
+    async def scenario():
+        holder = await controller.acquire("voice")
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire("ui")
+        holder.release()
+
+    asyncio.run(scenario())
+    assert controller.snapshot()["queued"]["ui"] == 0
+
+
+def test_api_returns_429_when_busy(admission_settings):
+    get_config().api.require_auth = False
+    admission_settings.max_concurrent = 1
+    admission_settings.queue_limits = {"voice": 0, "ui": 0, "mcp": 0}
+    admission_controller._active["voice"] += 1
+    try:
+        response = TestClient(app).post("/command", json={"text": "hello"})
+    finally:
+        admission_controller._release("voice")
+    assert response.status_code == 429
+    assert response.json()["status"] == "busy"
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,107 @@
+import pytest
+
+from pocket_ai.ai.local_llm import local_llm
+from pocket_ai.core import compute_backends as backends_module
+from pocket_ai.core.backend_router import BackendRouter
+from pocket_ai.core.compute_backends import BackendType, ComputeBackends
+from pocket_ai.core.config import get_config
+from pocket_ai.core.model_manager import model_manager
+
+GPU, CPU = BackendType.GPU_SERVER, BackendType.PI_CPU
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_probes_ping_the_gpu_server_and_try_the_tpu_delegate(gpu_standin, monkeypatch):
+    monkeypatch.setattr(get_config(), "profile", "HYBRID")
+    backends = ComputeBackends(BackendRouter())
+    assert backends.probes == {}  # nothing is probed until first use
+    assert backends.gpu_server_available and backends.probes["gpu_server"]["ok"]
+    assert backends.tpu_available is False and backends.probes["tpu"]["error"]
+    assert backends.candidates("llm") == [GPU, CPU]
+    assert backends.candidates("tts") == [CPU]
+
+    gpu_standin.healthy = False
+    backends.refresh()
+    assert not backends.gpu_server_available and backends.probes["gpu_server"]["error"] == "HTTP 503"
+    assert backends.candidates("llm") == [CPU]
+
+
+def test_offline_profile_never_routes_to_the_gpu_server(gpu_standin):
+    backends = ComputeBackends(BackendRouter())
+    assert backends.gpu_server_available and backends.candidates("llm") == [CPU]
+
+
+def test_routes_by_measured_latency_and_load():
+    router = BackendRouter()
+    assert router.choose("llm", [GPU, CPU]) == GPU  # priors keep the static preference
+    for _ in range(10):
+        router.record("llm", GPU, 900.0, ok=True)
+        router.record("llm", CPU, 300.0, ok=True)
+    assert router.choose("llm", [GPU, CPU]) == CPU
+
+    with router.track("llm", CPU), router.track("llm", CPU), router.track("llm", CPU):
+        assert router.choose("llm", [GPU, CPU]) == GPU  # CPU is busy
+    assert router.snapshot()["llm"]["PI_CPU"]["in_flight"] == 0
+
+
+def test_fails_over_and_cools_down_a_failing_backend():
+    clock = FakeClock()
+    router = BackendRouter(clock=clock)
+
+    def broken():
+        raise ConnectionError("gpu down")
+
+    router.record("llm", GPU, 50.0, ok=True)
+    router.record("llm", CPU, 400.0, ok=True)
+    runners = {GPU: broken, CPU: lambda: "cpu answer"}
+    threshold = get_config().backend_routing.failure_threshold
+    for _ in range(threshold):
+        assert router.call("llm", runners) == "cpu answer"
+        router.record("llm", CPU, 400.0, ok=True)  # the stub answers instantly; keep CPU realistic
+    assert router.snapshot()["llm"]["GPU_SERVER"]["failures"] == threshold
+    assert router.rank("llm", [GPU, CPU]) == [CPU, GPU]
+    assert router.snapshot()["llm"]["GPU_SERVER"]["available"] is False
+
+    clock.now += get_config().backend_routing.cooldown_s + 1
+    assert router.snapshot()["llm"]["GPU_SERVER"]["available"] is True
+
+    with pytest.raises(ConnectionError):
+        router.call("llm", {GPU: broken})
+
+
+def test_llm_stream_fails_over_before_the_first_token(monkeypatch):
+    router = BackendRouter()
+    backends = ComputeBackends(router)
+    backends.gpu_server_available = True
+    monkeypatch.setattr(get_config(), "profile", "HYBRID")
+    monkeypatch.setattr(backends_module, "compute_backends", backends)
+    monkeypatch.setattr("pocket_ai.ai.local_llm.compute_backends", backends)
+
+    def failing_remote(prompt):
+        raise ConnectionError("gpu server reset")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(local_llm, "_remote_stream", failing_remote)
+    text = "".join(local_llm.generate_stream("hello there"))
+    assert text.startswith("Local Phi-2 Response")
+    stats = router.snapshot()["llm"]
+    assert stats["GPU_SERVER"]["failures"] == 1 and stats["PI_CPU"]["calls"] == 1
+
+
+def test_local_weights_cap_the_llm_batch_even_when_the_gpu_is_preferred(monkeypatch):
+    backends = ComputeBackends(BackendRouter())
+    backends.gpu_server_available = True
+    monkeypatch.setattr(get_config(), "profile", "HYBRID")
+    monkeypatch.setattr("pocket_ai.ai.local_llm.compute_backends", backends)
+    monkeypatch.setattr(local_llm, "_has_llama_cpp", True)
+    monkeypatch.setattr(model_manager, "is_available", lambda name: True)
+    assert backends.get_backend_for_task("llm") == GPU
+    # A sequence may still fail over onto the single local llama.cpp context.
+    assert local_llm._batch_limit() == 1
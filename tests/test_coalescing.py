@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from pocket_ai.ai.nlu import nlu_engine
+from pocket_ai.ai.orchestrator import orchestrator
+from pocket_ai.core.coalescing import SingleFlight, request_key
+from pocket_ai.tools.dev_plugins.plugin_base import PluginBase
+from pocket_ai.tools.dev_plugins.todoist_plugin import TodoistPlugin
+from pocket_ai.tools.tool_registry import tool_registry
+
+
+def test_payload_key_ignores_dict_order():
+    assert request_key("p", {"a": 1, "b": 2}) == request_key("p", {"b": 2, "a": 1})
+    assert request_key("p", {"a": 1}) != request_key("p", {"a": 2})
+
+
+def test_shared_run_survives_one_caller_cancelling():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.run("k", work))
+        second = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "result"
+    assert len(calls) == 1
+    assert flight.stats() == {"inflight": 0, "executed": 1, "coalesced": 1}
+
+
+def test_last_caller_leaving_cancels_work():
+    flight = SingleFlight("test")
+
+    async def scenario():
+        state = {"cancelled": False}
+
+        async def work():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+
+        caller = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        return state["cancelled"]
+
+    assert asyncio.run(scenario())
+
+
+class CountingPlugin(PluginBase):
+    name = "counting_test_plugin"
+    description = "Counts executions"
+    side_effect_actions = frozenset({"write"})
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, input_data, context):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return {"status": "success", "calls": self.calls}
+
+
+def test_registry_coalesces_reads_but_not_writes():
+    plugin = CountingPlugin()
+    tool_registry.dev_plugins[plugin.name] = plugin
+    try:
+        async def burst(action):
+            return await asyncio.gather(
+                *(tool_registry.execute_dev_plugin(plugin.name, {"action": action}) for _ in range(3))
+            )
+
+        reads = asyncio.run(burst("read"))
+        assert plugin.calls == 1
+        assert all(result == reads[0] for result in reads)
+
+        asyncio.run(burst("write"))
+        assert plugin.calls == 4
+    finally:
+        tool_registry.dev_plugins.pop(plugin.name, None)
+
+
+def test_registry_never_coalesces_actionless_writes(monkeypatch):
+    plugin = CountingPlugin()
+    tool_registry.dev_plugins[plugin.name] = plugin
+    try:
+        async def burst(payload):
+            return await asyncio.gather(*(tool_registry.execute_dev_plugin(plugin.name, payload) for _ in range(2)))
+
+        asyncio.run(burst({"content": "buy milk"}))
+        assert plugin.calls == 2
+
+        # Resolved through the plugin's default, as Todoist does for "create".
+        monkeypatch.setattr(plugin, "default_action", "write", raising=False)
+        asyncio.run(burst({"content": "buy milk"}))
+        assert plugin.calls == 4
+        monkeypatch.setattr(plugin, "default_action", "read", raising=False)
+        asyncio.run(burst({"content": "buy milk"}))
+        assert plugin.calls == 5
+    finally:
+        tool_registry.dev_plugins.pop(plugin.name, None)
+
+    todoist = TodoistPlugin()
+    assert not tool_registry._coalescable(todoist, {"content": "buy milk"})
+    assert tool_registry._coalescable(todoist, {"action": "list"})
+
+
+def test_duplicate_queries_share_one_pipeline_run(monkeypatch):
+    runs = []
+    original = orchestrator._run_text_command
+
+    parses = []
+    parse_intents = nlu_engine.parse_intents
+
+    async def counted(text, intents=None):
+        runs.append(text)
+        await asyncio.sleep(0.02)
+        return await original(text, intents)
+
+    monkeypatch.setattr(orchestrator, "_run_text_command", counted)
+    monkeypatch.setattr(nlu_engine, "parse_intents", lambda text: parses.append(text) or parse_intents(text))
+
+    async def scenario(*texts):
+        return await asyncio.gather(*(orchestrator.process_text_command(text) for text in texts))
+
+    asyncio.run(scenario("Tell me a joke", "tell me  a joke"))
+    assert len(runs) == 1
+    asyncio.run(scenario("add a task to buy milk", "add a task to buy milk"))
+    assert len(runs) == 3
+    assert len(parses) == 4  # once per command, never again inside the pipeline
@@ -0,0 +1,47 @@
+from pocket_ai.ai.context_manager import ContextManager, estimate_tokens
+
+
+def _fill(manager, count, size=40):
+    for index in range(count):
+        manager.add_turn(f"question {index} " + "x" * size, f"answer {index}", {"type": "unknown"})
+
+
+def test_token_budget_evicts_into_summary():
+    manager = ContextManager(max_turns=50, max_tokens=100)
+    _fill(manager, 12)
+    assert manager.total_tokens <= 100
+    assert len(manager.get_context()) < 12
+    assert "unknown: question 0" in manager.summary
+    assert manager.get_context()[-1]["user"].startswith("question 11")
+
+
+def test_context_window_fits_budget_newest_first():
+    manager = ContextManager(max_turns=5)
+    _fill(manager, 8)
+    window = manager.context_window(budget_tokens=60)
+    used = sum(estimate_tokens(message["content"]) for message in window)
+    assert used <= 60
+    assert window[-1] == {"role": "assistant", "content": "answer 7"}
+    assert all(message["role"] != "system" or "question 0" in message["content"] for message in window)
+
+    roomy = manager.context_window(budget_tokens=1000)
+    assert roomy[0]["role"] == "system"
+    assert [m["content"] for m in roomy if m["role"] == "assistant"] == [f"answer {i}" for i in range(3, 8)]
+
+
+def test_last_intent_and_turn_limit():
+    manager = ContextManager(max_turns=2)
+    manager.add_turn("a", "b", {"type": "create_task"})
+    manager.add_turn("c", "d", {"type": "block_time"})
+    manager.add_turn("e", "f", {"type": "log_meal"})
+    assert len(manager.get_context()) == 2
+    assert manager.get_last_intent()["type"] == "log_meal"
+
+
+def test_turns_and_summary_are_scrubbed_before_reuse():
+    manager = ContextManager(max_turns=1)
+    manager.add_turn("email jane@example.com about it", "Sure, I'll email jane@example.com.", {"type": "unknown"})
+    manager.add_turn("call me on 9876543210", "Calling 9876543210.", {"type": "unknown"})
+    window = " ".join(message["content"] for message in manager.context_window(budget_tokens=1000))
+    assert "Earlier in this conversation" in window
+    assert "jane@example.com" not in window and "9876543210" not in window
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from pocket_ai.ai.orchestrator import orchestrator
+from pocket_ai.core.config import get_config
+from pocket_ai.core.deadlines import DeadlineExceeded, current_deadline, deadline_scope
+from pocket_ai.core.secrets_manager import secrets_manager
+from pocket_ai.mcp.server import mcp_server
+from pocket_ai.tools.dev_plugins.plugin_base import PluginBase, ToolContext
+from pocket_ai.tools.tool_registry import tool_registry
+
+
+class SlowPlugin(PluginBase):
+    name = "slow_test_plugin"
+    description = "Sleeps past any reasonable deadline"
+
+    def __init__(self):
+        self.cancelled = False
+        self.seen_timeout = None
+
+    async def execute(self, input_data, context):
+        self.seen_timeout = context.timeout(10.0)
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"status": "success"}
+
+
+@pytest.fixture
+def slow_plugin():
+    plugin = SlowPlugin()
+    tool_registry.dev_plugins[plugin.name] = plugin
+    yield plugin
+    tool_registry.dev_plugins.pop(plugin.name, None)
+
+
+def test_tighter_deadline_wins():
+    with deadline_scope(0.5):
+        outer = current_deadline()
+        with deadline_scope(10):
+            assert current_deadline() is outer
+        with deadline_scope(0.1):
+            assert current_deadline().remaining() <= 0.1
+        assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+def test_plugin_inherits_and_honours_request_deadline(slow_plugin):
+    async def scenario():
+        with deadline_scope(0.05):
+            context = ToolContext()
+            with pytest.raises(DeadlineExceeded):
+                await tool_registry.execute_dev_plugin(slow_plugin.name, {}, context)
+
+    asyncio.run(scenario())
+    assert slow_plugin.cancelled
+    assert slow_plugin.seen_timeout <= 0.05
+
+
+def test_slow_dispatch_returns_timeout_response(monkeypatch):
+    timeouts = get_config().timeouts
+    monkeypatch.setattr(timeouts, "request_s", 0.05)
+
+    async def slow_intent(intent):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(orchestrator, "_execute_intent", slow_intent)
+    payload = asyncio.run(orchestrator.process_text_command("tell me a joke"))
+    assert payload["result"]["status"] == "error"
+    assert "too long" in payload["response_text"]
+
+
+def test_mcp_cancellation_stops_tool(slow_plugin):
+    get_config().mcp.require_auth = False
+
+    async def scenario():
+        call = asyncio.ensure_future(
+            mcp_server.handle_request(
+                "tools/call",
+                {"name": "run_dev_tool", "arguments": {"plugin": slow_plugin.name, "payload": {}}},
+                request_id=7,
+            )
+        )
+        await asyncio.sleep(0.01)
+        await mcp_server.handle_request("notifications/cancelled", {"requestId": 7})
+        return await call
+
+    response = asyncio.run(scenario())
+    assert response["isError"] is True
+    assert slow_plugin.cancelled
+
+
+def test_mcp_cancellation_is_authorized_and_scoped_to_session(slow_plugin, monkeypatch):
+    monkeypatch.setattr(get_config().mcp, "require_auth", True)
+    secrets_manager._secrets["mcp_auth_token"] = "mcp-token"  # type: ignore[attr-defined]
+
+    async def scenario():
+        call = asyncio.ensure_future(
+            mcp_server.handle_request(
+                "tools/call",
+                {
+                    "name": "run_dev_tool",
+                    "arguments": {"plugin": slow_plugin.name, "payload": {}},
+                    "auth_token": "mcp-token",
+                },
+                request_id=1,
+                session="owner",
+            )
+        )
+        await asyncio.sleep(0.01)
+        with pytest.raises(PermissionError):
+            await mcp_server.handle_request("notifications/cancelled", {"requestId": 1}, session="owner")
+        await mcp_server.handle_request(
+            "notifications/cancelled", {"requestId": 1, "auth_token": "mcp-token"}, session="other"
+        )
+        await asyncio.sleep(0.01)
+        assert not call.done()
+        await mcp_server.handle_request(
+            "notifications/cancelled", {"requestId": 1, "auth_token": "mcp-token"}, session="owner"
+        )
+        return await call
+
+    response = asyncio.run(scenario())
+    assert response["isError"] is True
+    assert slow_plugin.cancelled
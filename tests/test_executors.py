@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pocket_ai.ai.orchestrator import orchestrator
+from pocket_ai.audio.speech_offline import speech_offline
+from pocket_ai.core.compute_backends import compute_backends
+from pocket_ai.core.executors import ComputeExecutors
+
+
+def test_blocking_work_leaves_event_loop_responsive():
+    executors = ComputeExecutors()
+
+    async def scenario():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.ensure_future(heartbeat())
+        result = await executors.run("llm", lambda: time.sleep(0.2) or "done")
+        beat.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    executors.shutdown()
+    assert result == "done"
+    assert ticks >= 5
+
+
+def test_pools_are_bounded_and_sized_from_backends(monkeypatch):
+    monkeypatch.setenv("POCKET_ASR_WORKERS", "2")
+    executors = ComputeExecutors()
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    async def scenario():
+        await asyncio.gather(*(executors.run("asr", work) for _ in range(6)))
+
+    asyncio.run(scenario())
+    assert executors.stats()["asr"] == compute_backends.max_workers("asr") == 2
+    assert peak == 2
+    executors.shutdown()
+    with pytest.raises(ValueError):
+        asyncio.run(executors.run("gpu", work))
+
+
+def test_voice_command_transcribes_off_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    seen = {}
+
+    def transcribe(audio_data):
+        seen["thread"] = threading.get_ident()
+        return "tell me a joke"
+
+    monkeypatch.setattr(speech_offline, "transcribe", transcribe)
+    payload = asyncio.run(orchestrator.process_voice_command(b"\x00" * 32))
+    assert payload["transcript"] == "tell me a joke"
+    assert seen["thread"] != loop_thread
+
+
+def test_stream_yields_items_and_stops_generator_when_closed():
+    produced = []
+    closed = threading.Event()
+
+    def numbers():
+        try:
+            for number in range(1000):
+                produced.append(number)
+                time.sleep(0.001)
+                yield number
+        finally:
+            closed.set()
+
+    async def first_three():
+        executors = ComputeExecutors()
+        stream = executors.stream("llm", numbers)
+        items = [await stream.__anext__() for _ in range(3)]
+        await stream.aclose()
+        return items
+
+    assert asyncio.run(first_three()) == [0, 1, 2]
+    assert closed.wait(1) and len(produced) < 1000
+
+
+def test_stream_raises_when_callable_fails_before_yielding():
+    executors = ComputeExecutors()
+
+    def broken():
+        raise RuntimeError("model failed to load")
+
+    async def scenario():
+        async for _ in executors.stream("llm", broken):
+            pass
+
+    with pytest.raises(RuntimeError, match="failed to load"):
+        asyncio.run(asyncio.wait_for(scenario(), timeout=2))
@@ -0,0 +1,28 @@
+from pocket_ai.ai.intent_classifier import IntentClassifier
+from pocket_ai.ai.nlu import nlu_engine
+from pocket_ai.core.config import get_config
+
+
+def test_paraphrases_reach_known_intents():
+    assert nlu_engine.parse("remember to buy eggs")["type"] == "create_task"
+    intent = nlu_engine.parse("keep two hours free tomorrow morning")
+    assert intent["type"] == "block_time"
+    assert 0.6 <= intent["confidence"] <= 1.0
+    # Chit-chat and fragments stay with the LLM / clause merging.
+    assert nlu_engine.parse("what is the population of india")["type"] == "unknown"
+    assert nlu_engine.parse_intents("remind me to call mom and dad")[0]["content"] == "call mom and dad"
+
+
+def test_batch_scoring_matches_single_and_respects_threshold():
+    classifier = IntentClassifier()
+    classifier.fit({"greet": ["hello there", "hi friend", "good morning"], "food": ["get me pizza", "order biryani"]})
+    texts = ["hello friend", "get me biryani"]
+    batch = classifier.predict(texts, threshold=0.0)
+    assert [label for label, _ in batch] == ["greet", "food"]
+    assert batch[1] == classifier.predict(texts[1:], threshold=0.0)[0]
+    assert classifier.predict(texts, threshold=1.01)[0][0] == "unknown"
+
+
+def test_classifier_tier_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(get_config().intent_classifier, "enabled", False)
+    assert nlu_engine.parse("remember to buy eggs")["type"] == "unknown"
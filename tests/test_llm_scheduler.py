@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+import pytest
+
+from pocket_ai.ai.llm_scheduler import DecodeBackend, GeneratorBackend, LLMScheduler
+from pocket_ai.core.admission import AdmissionRejected
+from pocket_ai.core.config import get_config
+from pocket_ai.core.executors import ComputeExecutors
+
+
+class CountingBackend(DecodeBackend):
+    """Emits ``<prompt>-<n>`` tokens and records every step's batch size."""
+
+    def __init__(self, length: int = 5):
+        self.length = length
+        self.batches = []
+        self.stopped = []
+
+    def start(self, prompt):
+        return {"prompt": prompt, "n": 0}
+
+    def step(self, sequences):
+        self.batches.append(len(sequences))
+        outputs = []
+        for sequence in sequences:
+            if sequence["n"] >= self.length:
+                outputs.append(None)
+                continue
+            sequence["n"] += 1
+            outputs.append(f"{sequence['prompt']}-{sequence['n']} ")
+        return outputs
+
+    def stop(self, sequence):
+        self.stopped.append(sequence["prompt"])
+
+
+def _run(coro_factory):
+    executors = ComputeExecutors()
+    try:
+        return asyncio.run(coro_factory(executors))
+    finally:
+        executors.shutdown()
+
+
+def test_concurrent_requests_share_decode_steps():
+    backend = CountingBackend(length=5)
+
+    async def scenario(executors):
+        scheduler = LLMScheduler(backend, executors)
+        results = await asyncio.gather(*(scheduler.generate(f"p{i}") for i in range(4)))
+        return scheduler, results
+
+    scheduler, results = _run(scenario)
+    assert results == [" ".join(f"p{i}-{n}" for n in range(1, 6)) + " " for i in range(4)]
+    stats = scheduler.stats()
+    assert stats["peak_batch_size"] > 1 and stats["steps"] < 4 * 6
+    assert stats["completed"] == 4 and stats["tokens"] == 20 and stats["pending"] == 0
+
+
+def test_max_tokens_and_batch_limit_are_respected():
+    backend = GeneratorBackend(lambda prompt: iter(["a", "b", "c", "d"]), batch_limit=lambda: 1)
+    peak = []
+
+    async def scenario(executors):
+        scheduler = LLMScheduler(backend, executors)
+        results = await asyncio.gather(scheduler.generate("x", max_tokens=2), scheduler.generate("y"))
+        peak.append(scheduler.stats()["peak_batch_size"])
+        return results
+
+    assert _run(scenario) == ["ab", "abcd"]
+    assert peak == [1]
+
+
+def test_closing_stream_frees_its_slot():
+    release = threading.Event()
+
+    class SlowBackend(CountingBackend):
+        def step(self, sequences):
+            release.wait(1)
+            return super().step(sequences)
+
+    backend = SlowBackend(length=1000)
+
+    async def scenario(executors):
+        scheduler = LLMScheduler(backend, executors)
+        tokens = scheduler.stream("gone")
+        first = await tokens.__anext__()
+        await tokens.aclose()
+        release.set()
+        for _ in range(100):
+            if scheduler.stats()["active"] == 0 and not scheduler._running:
+                break
+            await asyncio.sleep(0.01)
+        return first, scheduler.stats()
+
+    first, stats = _run(scenario)
+    assert first == "gone-1 "
+    assert backend.stopped == ["gone"] and stats["cancelled"] == 1 and stats["tokens"] < 1000
+
+
+def test_full_queue_is_rejected(monkeypatch):
+    monkeypatch.setattr(get_config().llm_scheduler, "max_pending", 0)
+
+    async def scenario(executors):
+        scheduler = LLMScheduler(CountingBackend(), executors)
+        with pytest.raises(AdmissionRejected):
+            await scheduler.generate("too many")
+
+    _run(scenario)
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from pocket_ai.ai import memory_index as memory_module
+from pocket_ai.ai.memory_index import HashingEmbedder, MemoryIndex
+from pocket_ai.tools.dev_plugins.notes_plugin import NotesPlugin
+from pocket_ai.tools.dev_plugins.plugin_base import ToolContext
+
+
+NOTES = {
+    "user_notes/groceries": "buy milk, eggs and bread from the market",
+    "user_notes/trip": "book train tickets to mysore for the long weekend",
+    "user_notes/invoice": "send the quarterly invoice to the accounting team",
+    "transcripts_temp/t1": "remind me to buy milk on the way home",
+}
+
+
+def test_hashing_embedder_is_deterministic_and_normalised():
+    embedder = HashingEmbedder(dim=64)
+    first = embedder.embed(["buy milk", ""])
+    assert np.allclose(first, embedder.embed(["buy milk", ""]))
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert not first[1].any()
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_search_update_delete_and_reload(tmp_path, dtype):
+    index = MemoryIndex(tmp_path, HashingEmbedder(), dtype=dtype)
+    index.add_many(NOTES.items())
+
+    assert index.search("milk from the market", k=1)[0][0] == "user_notes/groceries"
+    only_notes = index.search("buy milk", k=5, prefix="user_notes/")
+    assert all(doc_id.startswith("user_notes/") for doc_id, _ in only_notes)
+
+    index.add("user_notes/trip", "renew passport before the trip abroad")
+    assert index.search("passport renewal", k=1)[0][0] == "user_notes/trip"
+    assert index.delete("user_notes/groceries")
+
+    reloaded = MemoryIndex(tmp_path, HashingEmbedder(), dtype=dtype)
+    assert len(reloaded) == 3
+    assert not reloaded.needs_backfill
+    assert "user_notes/groceries" not in [doc_id for doc_id, _ in reloaded.search("milk market", k=3)]
+
+
+def test_ivf_search_finds_exact_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory_module, "IVF_MIN_ROWS", 64)
+    index = MemoryIndex(tmp_path, HashingEmbedder())
+    index.add_many((f"user_notes/n{i}", f"note number {i} about topic {i % 17} and item {i * 7}") for i in range(300))
+    index.add("user_notes/target", "quarterly invoice for the accounting team")
+    assert index.search("quarterly invoice accounting", k=3)[0][0] == "user_notes/target"
+    assert index._ivf is not None
+
+
+def test_storage_events_keep_index_in_sync(tmp_path):
+    index = MemoryIndex(tmp_path, HashingEmbedder())
+    index.on_storage_event("store", "user_notes", "a", {"content": "water the plants"})
+    index.on_storage_event("store", "wellness_logs", "b", {"description": "ignored"})
+    index.flush()
+    assert len(index) == 1
+    index.on_storage_event("clear", "user_notes", "", None)
+    index.flush()
+    assert len(index) == 0
+
+
+def test_storage_events_are_batched_into_one_meta_write(tmp_path, monkeypatch):
+    index = MemoryIndex(tmp_path, HashingEmbedder())
+    writes = []
+    save_meta = index._save_meta
+    monkeypatch.setattr(index, "_save_meta", lambda: writes.append(len(index)) or save_meta())
+    index._apply([("store", f"transcripts_temp/t{i}", f"transcript number {i}") for i in range(10)])
+    assert len(index) == 10
+    assert writes == [10]
+
+
+def test_notes_search_runs_off_the_event_loop(monkeypatch):
+    threads = []
+    monkeypatch.setattr(memory_module.memory_index, "flush", lambda: threads.append(threading.current_thread()))
+    monkeypatch.setattr(memory_module.memory_index, "needs_backfill", False)
+    monkeypatch.setattr(memory_module.memory_index, "search", lambda query, k, prefix: [])
+
+    result = asyncio.run(NotesPlugin().execute({"action": "search", "query": "milk"}, ToolContext()))
+    assert result == {"status": "success", "results": []}
+    assert threads and threads[0] is not threading.main_thread()
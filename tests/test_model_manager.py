@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from pocket_ai.core.config import get_config
+from pocket_ai.core.model_manager import MB, MappedModel, ModelManager, ModelSpec, ModelUnavailable
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_config().models, "memory_budget_mb", 2)
+    monkeypatch.setattr(get_config().models, "idle_unload_s", 0)
+    manager = ModelManager()
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.bin"
+        path.write_bytes(name.encode() * 1024)
+        manager.register(ModelSpec(name, str(path), size_bytes=MB))
+    yield manager
+    manager.shutdown()
+
+
+def test_lazy_memory_mapped_load_and_state(manager):
+    assert not manager.is_loaded("a")
+    with manager.use("a") as model:
+        assert isinstance(model, MappedModel) and model.buffer[:1] == b"a"
+        assert manager.snapshot()["models"]["a"]["in_use"] == 1
+    state = manager.snapshot()
+    assert state["models"]["a"]["state"] == "loaded" and state["models"]["a"]["loads"] == 1
+    assert manager.load("a") == 0.0
+
+    manager.register(ModelSpec("missing", "/nonexistent/model.gguf"))
+    assert manager.snapshot()["models"]["missing"]["state"] == "missing"
+    with pytest.raises(ModelUnavailable):
+        manager.load("missing")
+
+
+def test_budget_unloads_least_recently_used_idle_model(manager):
+    manager.load("a")
+    manager.load("b")
+    with manager.use("a"):
+        manager.load("c")  # over budget: "a" is in use, so "b" goes
+    assert manager.is_loaded("a") and manager.is_loaded("c") and not manager.is_loaded("b")
+    assert manager.snapshot()["models"]["b"]["last_unload_reason"] == "memory budget"
+    assert manager.resident_bytes() == 2 * MB
+
+
+def test_idle_models_are_unloaded_but_busy_ones_stay(manager):
+    manager.register(ModelSpec("a", manager._specs["a"].path, size_bytes=MB, idle_timeout_s=5))
+    manager.register(ModelSpec("b", manager._specs["b"].path, size_bytes=MB, idle_timeout_s=5))
+    manager.load("a")
+    with manager.use("b"):
+        assert manager.evict_idle(now=time.monotonic() + 60) == ["a"]
+    assert manager.is_loaded("b")
+
+
+def test_concurrent_first_use_loads_once(manager):
+    calls = []
+
+    def slow_loader(path):
+        calls.append(path)
+        time.sleep(0.05)
+        return MappedModel(path)
+
+    manager.register(ModelSpec("slow", manager._specs["a"].path, loader=slow_loader, size_bytes=MB))
+    threads = [threading.Thread(target=manager.load, args=("slow",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from pocket_ai.ai.nlu import nlu_engine
+from pocket_ai.ai.orchestrator import orchestrator
+from pocket_ai.tools.dev_plugins.plugin_base import PluginBase
+from pocket_ai.tools.tool_registry import tool_registry
+
+
+def test_compound_command_splits_only_on_real_commands():
+    intents = nlu_engine.parse_intents("Add a task to call mom and block 2 hours for deep work")
+    assert [intent["type"] for intent in intents] == ["create_task", "block_time"]
+    assert intents[1]["raw"] == "block 2 hours for deep work"
+
+    single = nlu_engine.parse_intents("remind me to call mom and dad")
+    assert [intent["type"] for intent in single] == ["create_task"]
+    assert single[0]["raw"] == "remind me to call mom and dad"
+
+
+def test_conjunctions_inside_note_and_task_bodies_stay_in_the_content():
+    note = nlu_engine.parse_intents("save a note: buy lunch and dinner")
+    assert [intent["type"] for intent in note] == ["create_note"]
+    assert note[0]["content"] == "buy lunch and dinner"
+
+    task = nlu_engine.parse_intents("add a task to plan lunch and dinner for the team")
+    assert [intent["type"] for intent in task] == ["create_task"]
+    assert task[0]["content"] == "plan lunch and dinner for the team"
+
+    both = nlu_engine.parse_intents("add a task to call mom and order lunch under 200")
+    assert [intent["type"] for intent in both] == ["create_task", "order_food"]
+
+
+def test_compound_command_runs_clauses_concurrently(monkeypatch):
+    async def slow_task(intent):
+        await asyncio.sleep(0.2)
+        return {"status": "success", "response_text": "Task added."}
+
+    async def slow_block(intent):
+        await asyncio.sleep(0.2)
+        return {"status": "error", "response_text": "No calendar integration configured."}
+
+    monkeypatch.setattr(orchestrator, "_handle_task", slow_task)
+    monkeypatch.setattr(orchestrator, "_handle_time_block", slow_block)
+
+    start = time.perf_counter()
+    payload = asyncio.run(
+        orchestrator.process_text_command("add a task to call mom and block 2 hours for deep work")
+    )
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+    assert payload["intent"]["type"] == "multi"
+    assert payload["result"]["status"] == "partial"
+    assert [item["intent"] for item in payload["result"]["results"]] == ["create_task", "block_time"]
+    assert payload["response_text"] == "Task added. No calendar integration configured."
+
+
+def test_plugin_concurrency_limit_is_respected():
+    class SerialPlugin(PluginBase):
+        name = "serial_test_plugin"
+        description = "Allows one call at a time"
+        max_concurrency = 1
+        running = 0
+        peak = 0
+
+        async def execute(self, input_data, context):
+            SerialPlugin.running += 1
+            SerialPlugin.peak = max(SerialPlugin.peak, SerialPlugin.running)
+            await asyncio.sleep(0.01)
+            SerialPlugin.running -= 1
+            return {"status": "success"}
+
+    tool_registry.dev_plugins[SerialPlugin.name] = SerialPlugin()
+    try:
+        async def scenario():
+            await asyncio.gather(*(tool_registry.execute_dev_plugin(SerialPlugin.name, {}) for _ in range(3)))
+
+        asyncio.run(scenario())
+    finally:
+        tool_registry.dev_plugins.pop(SerialPlugin.name, None)
+    assert SerialPlugin.peak == 1
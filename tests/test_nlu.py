@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from pocket_ai.ai.nlu import IntentGrammar, LocalNLU, nlu_engine
+
+
+def test_slots_are_extracted():
+    assert nlu_engine.parse("Add a task to call mom")["content"] == "call mom"
+    assert nlu_engine.parse("buy milk todo")["content"] == "buy milk"
+    assert nlu_engine.parse("Save a note: ideas for project")["content"] == "ideas for project"
+    assert nlu_engine.parse("Block 90 minutes for deep work")["duration_minutes"] == 90
+    assert nlu_engine.parse("order dinner under ₹300")["budget"] == 300
+    assert nlu_engine.parse("order lunch for 2")["budget"] is None
+
+
+def test_precedence_and_word_boundaries():
+    assert nlu_engine.parse("I ate a late lunch")["type"] == "log_meal"
+    assert nlu_engine.parse("log lunch")["type"] == "log_meal"
+    assert nlu_engine.parse("order lunch")["type"] == "order_food"
+    # "create"/"update" contain "ate" but are not meals
+    assert nlu_engine.parse("update the calendar")["type"] == "unknown"
+    assert nlu_engine.parse("Draft email to boss") == {"type": "draft_email", "raw": "draft email to boss"}
+
+
+def test_grammar_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        IntentGrammar(rules=[{"type": "x", "requires": ("missing",)}])
+
+
+def test_parse_batch_matches_single_parses_and_caches():
+    nlu = LocalNLU(cache_size=3)
+    texts = ["Order dinner under 300", "  order DINNER under 300 ", "remember to buy eggs", "hello there"]
+    batch = nlu.parse_batch(texts)
+    assert batch[0] == batch[1] == LocalNLU().parse_intent("order dinner under 300")
+    assert [intent["type"] for intent in batch[2:]] == ["create_task", "unknown"]
+    assert nlu.cache_stats()["hits"] == 1 and nlu.cache_stats()["entries"] == 3
+
+    batch[0]["type"] = "mutated"
+    assert nlu.parse_intent("order dinner under 300")["type"] == "order_food"
+    assert nlu.cache_stats()["hits"] == 2
+
+    nlu.parse_intent("block 2 hours")
+    assert nlu.cache_stats()["entries"] == 3
+
+
+def test_labelled_corpus_accuracy_floor():
+    from bench_nlu_corpus import run
+
+    report = run()
+    json.dumps(report)
+    tiers = report["tiers"]
+    # Keyword rules rarely misfire; the classifier tier must recover most paraphrases.
+    assert tiers["grammar"]["per_intent"]["create_task"]["precision"] == 1.0
+    assert tiers["grammar+classifier"]["accuracy"] >= 0.85
+    assert tiers["grammar+classifier"]["llm_fallback_rate"] < tiers["grammar"]["llm_fallback_rate"]
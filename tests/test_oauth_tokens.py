@@ -0,0 +1,90 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from pocket_ai.tools.dev_plugins.oauth_tokens import OAuthTokenManager
+
+
+class _Secrets:
+    def __init__(self, values):
+        self.values = dict(values)
+        self.writes = 0
+
+    def get_secret(self, key):
+        return self.values.get(key)
+
+    def set_secret(self, key, value):
+        self.writes += 1
+        self.values[key] = value
+
+
+class _Context:
+    def __init__(self, secrets):
+        self.secrets = secrets
+
+
+def _blob(expires_in: int) -> str:
+    return json.dumps(
+        {
+            "access_token": "old",
+            "refresh_token": "refresh",
+            "client_id": "id",
+            "client_secret": "secret",
+            "expires_at": (datetime.now(timezone.utc) + timedelta(seconds=expires_in)).isoformat(),
+        }
+    )
+
+
+def _manager(calls):
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"access_token": "new", "expires_in": 3600})
+
+    return OAuthTokenManager(transport=httpx.MockTransport(handler))
+
+
+def test_concurrent_refresh_is_single_flight():
+    calls = []
+    manager = _manager(calls)
+    secrets = _Secrets({"google_token": _blob(-10)})
+    context = _Context(secrets)
+
+    async def run():
+        return await asyncio.gather(*(manager.get_access_token("google_token", context) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["new"] * 5
+    assert len(calls) == 1
+    assert secrets.writes == 1
+    assert json.loads(secrets.values["google_token"])["access_token"] == "new"
+
+
+def test_near_expiry_token_served_and_refreshed_in_background():
+    calls = []
+    manager = _manager(calls)
+    context = _Context(_Secrets({"google_token": _blob(120)}))
+
+    async def run():
+        first = await manager.get_access_token("google_token", context)
+        await asyncio.sleep(0.05)
+        return first, await manager.get_access_token("google_token", context)
+
+    assert asyncio.run(run()) == ("old", "new")
+    assert len(calls) == 1
+
+
+def test_static_api_token_is_cached():
+    manager = OAuthTokenManager()
+    context = _Context(_Secrets({"todoist_token": "plain-token"}))
+    headers = asyncio.run(manager.auth_headers("todoist_token", context))
+    assert headers == {"Authorization": "Bearer plain-token"}
+    assert manager._cached("todoist_token", context, lambda blob: None).access_token == "plain-token"
+
+
+def test_offline_mock_plugins_work_without_a_token():
+    from pocket_ai.tools.dev_plugins.todoist_plugin import TodoistPlugin
+
+    result = asyncio.run(TodoistPlugin().execute({"content": "buy milk"}, _Context(_Secrets({}))))
+    assert result["status"] == "success"
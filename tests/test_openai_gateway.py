@@ -0,0 +1,81 @@
+import asyncio
+
+from pocket_ai.ai.openai_gateway import openai_gateway
+from pocket_ai.core.config import get_config
+from pocket_ai.core.policy_engine import policy_engine
+from pocket_ai.core.rate_limiter import Lease
+
+
+def _allow_cloud(monkeypatch):
+    monkeypatch.setattr(policy_engine, "can_use_cloud", lambda *_: True)
+
+
+def test_streamed_chat_and_vision_reuse_one_connection(openai_standin, monkeypatch):
+    _allow_cloud(monkeypatch)
+
+    async def scenario():
+        tokens = [t async for t in openai_gateway.chat_completion_stream([{"role": "user", "content": "hi"}])]
+        answers = [await openai_gateway.chat_completion([{"role": "user", "content": f"q{i}"}]) for i in range(3)]
+        vision = await openai_gateway.vision_query(b"\xff\xd8jpeg", "what is this?")
+        return tokens, answers, vision
+
+    tokens, answers, vision = asyncio.run(scenario())
+    assert len(tokens) > 1 and "".join(tokens).strip() == "Stand-in gpt-4 reply to: hi"
+    assert answers == [f"Stand-in gpt-4 reply to: q{i}" for i in range(3)]
+    assert vision == "Stand-in gpt-4o-mini reply to: what is this?"
+    assert openai_standin.requests == 5 and len(openai_standin.connections) == 1
+
+
+def test_retries_429_and_5xx_then_gives_up(openai_standin, monkeypatch):
+    _allow_cloud(monkeypatch)
+    retries_before = openai_gateway.http.retries
+    openai_standin.script.extend([429, 503])
+    assert asyncio.run(openai_gateway.chat_completion([{"role": "user", "content": "x"}])).endswith("x")
+    assert openai_gateway.http.retries - retries_before == 2
+
+    attempts = get_config().openai.http.max_retries + 1
+    openai_standin.script.extend([500] * attempts)
+
+    async def stream():
+        return [t async for t in openai_gateway.chat_completion_stream([{"role": "user", "content": "y"}])]
+
+    assert asyncio.run(stream()) == []  # caller falls back to the local model
+    assert openai_standin.requests == 3 + attempts
+
+
+def test_hedged_request_returns_the_faster_copy(openai_standin, monkeypatch):
+    _allow_cloud(monkeypatch)
+    monkeypatch.setattr(get_config().openai.http, "hedge_after_s", 0.05)
+    wins_before = openai_gateway.http.hedge_wins
+    openai_standin.script.append(1.0)  # the first copy stalls
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        answer = await openai_gateway.chat_completion([{"role": "user", "content": "fast"}])
+        return answer, loop.time() - start
+
+    answer, elapsed = asyncio.run(timed())
+    assert answer.endswith("fast") and elapsed < 0.5
+    assert openai_gateway.http.hedge_wins - wins_before == 1
+
+
+def test_closed_stream_settles_tokens_streamed_so_far(openai_standin, monkeypatch):
+    _allow_cloud(monkeypatch)
+    settled = []
+    monkeypatch.setattr(Lease, "settle", lambda self, actual: settled.append(actual))
+
+    async def first_token():
+        stream = openai_gateway.chat_completion_stream([{"role": "user", "content": "hi"}])
+        token = await stream.__anext__()
+        await stream.aclose()
+        return token
+
+    assert asyncio.run(first_token())
+    assert len(settled) == 1
+
+
+def test_vision_prompt_is_scrubbed_before_upload(openai_standin, monkeypatch):
+    _allow_cloud(monkeypatch)
+    answer = asyncio.run(openai_gateway.vision_query(b"\xff\xd8jpeg", "who is jane@example.com?"))
+    assert "jane@example.com" not in answer
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+from pocket_ai.ai.local_llm import local_llm
+from pocket_ai.ai.prefix_cache import PrefixCache, prefix_cache, static_prefix
+from pocket_ai.core.config import get_config
+from pocket_ai.tools.easy_tools_runtime import easy_tools
+
+SYSTEM = "You are a careful planning assistant. Answer briefly.\n"
+
+
+class FakeLlama:
+    def __init__(self):
+        self.evaluated = []
+        self.loaded = []
+
+    def reset(self):
+        self.evaluated = []
+
+    def tokenize(self, data):
+        return data.split()
+
+    def eval(self, tokens):
+        self.evaluated.extend(tokens)
+
+    def save_state(self):
+        return SimpleNamespace(tokens=list(self.evaluated), llama_state_size=1024)
+
+    def load_state(self, state):
+        self.loaded.append(state)
+        self.evaluated = list(state.tokens)
+
+
+def test_static_prefix_and_longest_match():
+    cache = PrefixCache()
+    assert static_prefix(SYSTEM + "Tasks: {{tasks}} then {{more}}") == SYSTEM + "Tasks: "
+    assert not cache.register("too short")
+    assert cache.register(SYSTEM) and cache.register(SYSTEM + "Tasks: ")
+    assert cache.match(SYSTEM + "Tasks: []") == SYSTEM + "Tasks: "
+    assert cache.match(SYSTEM + "Notes") == SYSTEM
+    assert cache.match("unrelated prompt") is None
+
+
+def test_states_are_bounded_and_counted(monkeypatch):
+    monkeypatch.setattr(get_config().prefix_cache, "max_entries", 2)
+    cache = PrefixCache()
+    builds = []
+
+    def build(name):
+        builds.append(name)
+        return SimpleNamespace(llama_state_size=10)
+
+    assert cache.get_or_build("phi-2", "a", lambda: build("a")) == (SimpleNamespace(llama_state_size=10), False)
+    assert cache.get_or_build("phi-2", "a", lambda: build("a"))[1] is True
+    cache.get_or_build("phi-2", "b", lambda: build("b"))
+    cache.get_or_build("phi-2", "c", lambda: build("c"))  # evicts "a"
+    cache.get_or_build("phi-2", "a", lambda: build("a"))
+    assert builds == ["a", "b", "c", "a"]
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4 and stats["evictions"] == 2
+    assert stats["entries"] == 2 and stats["bytes"] == 20
+
+    cache.invalidate("phi-2")
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_local_llm_resumes_from_saved_prefix(monkeypatch):
+    monkeypatch.setattr(prefix_cache, "_prefixes", [])
+    monkeypatch.setattr(prefix_cache, "_states", type(prefix_cache._states)())
+    prefix_cache.register(SYSTEM)
+    llm = FakeLlama()
+
+    local_llm._resume_prefix(llm, SYSTEM + "first question")
+    assert llm.evaluated == SYSTEM.encode().split() and llm.loaded == []
+
+    llm.reset()
+    local_llm._resume_prefix(llm, SYSTEM + "second question")
+    assert llm.evaluated == SYSTEM.encode().split() and len(llm.loaded) == 1
+
+    local_llm._unload(llm)
+    assert prefix_cache.stats()["entries"] == 0
+
+
+def test_easy_tool_templates_register_their_static_prefix():
+    template = easy_tools.loaded_tools["daily_review"]["prompt_template"]
+    rendered = template.replace("{{tasks_snapshot}}", "[]").replace("{{calendar_view}}", "[]")
+    assert prefix_cache.match(rendered) == static_prefix(template)
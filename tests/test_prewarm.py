@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pytest
+
+from pocket_ai.core.config import get_config
+from pocket_ai.core.executors import ComputeExecutors
+from pocket_ai.core.model_manager import MB, MappedModel, ModelManager, ModelSpec
+from pocket_ai.core.prewarm import ModelPrewarmer
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_config().models, "memory_budget_mb", 2)
+    monkeypatch.setattr(get_config().models, "idle_unload_s", 0)
+    for name in ("asr", "llm", "big"):
+        (tmp_path / f"{name}.bin").write_bytes(b"\0" * 4096)
+    manager = ModelManager()
+    yield manager
+    manager.shutdown()
+
+
+def test_prewarm_runs_in_background_in_priority_order(manager, tmp_path):
+    order = []
+    warmed_on = []
+
+    def slow_loader(path):
+        time.sleep(0.1)
+        order.append(path.rsplit("/", 1)[-1])
+        return MappedModel(path)
+
+    manager.register(ModelSpec("asr", str(tmp_path / "asr.bin"), loader=slow_loader, size_bytes=MB, workload="asr"))
+    manager.register(
+        ModelSpec(
+            "llm",
+            str(tmp_path / "llm.bin"),
+            loader=slow_loader,
+            size_bytes=MB,
+            workload="llm",
+            warmup=lambda handle: warmed_on.append(threading.current_thread().name),
+        )
+    )
+    manager.register(ModelSpec("big", str(tmp_path / "big.bin"), size_bytes=MB))
+    manager.register(ModelSpec("gone", str(tmp_path / "gone.bin")))
+    prewarmer = ModelPrewarmer(manager, ComputeExecutors())
+
+    assert prewarmer.start(["asr", "llm", "big", "gone", "unregistered"])
+    assert prewarmer.readiness()["phase"] == "running"  # start() did not wait for the loads
+    assert prewarmer.wait(5)
+
+    readiness = prewarmer.readiness()
+    states = {name: info["state"] for name, info in readiness["models"].items()}
+    assert states == {"asr": "ready", "llm": "ready", "big": "skipped", "gone": "unavailable", "unregistered": "unavailable"}
+    assert readiness["ready"] and readiness["phase"] == "done"
+    assert order == ["asr.bin", "llm.bin"]
+    assert warmed_on and warmed_on[0].startswith("pocket-llm")
+    assert readiness["models"]["llm"]["load_ms"] >= 100
+
+    manager.unload("asr")
+    assert prewarmer.readiness()["models"]["asr"]["state"] == "unloaded"
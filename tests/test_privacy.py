@@ -0,0 +1,79 @@
+import random
+
+from pocket_ai.core.privacy import (
+    EMAIL_RE,
+    MAX_HOLDBACK,
+    PHONE_RE,
+    StreamingScrubber,
+    scrub_stream,
+    scrub_text,
+    summarize_for_log,
+)
+
+
+def _two_pass(payload: str) -> str:
+    sanitized = EMAIL_RE.sub("[EMAIL]", payload)
+    return PHONE_RE.sub("[PHONE]", sanitized).strip()
+
+
+def _random_document(rng: random.Random, words: int) -> str:
+    vocab = [
+        "meeting", "call", "notes", "  ", "\n", "ping", "ravi.k@example.com",
+        "+91 98450 12345", "(080) 2345-6789", "a@b.co", "12", "x@y", "555-0100",
+    ]
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+def test_single_pass_matches_two_pass():
+    rng = random.Random(7)
+    for _ in range(200):
+        doc = _random_document(rng, rng.randint(0, 120))
+        assert scrub_text(doc) == _two_pass(doc)
+
+
+def test_bounded_summary_matches_full_scrub():
+    rng = random.Random(11)
+    for _ in range(200):
+        doc = _random_document(rng, rng.randint(0, 400))
+        limit = rng.choice([0, 5, 40, 160])
+        full = _two_pass(doc)
+        expected = full if len(full) <= limit else f"{full[:limit]}..."
+        assert summarize_for_log(doc, limit) == expected
+        assert scrub_text(doc, max_chars=limit) == full[:limit]
+
+
+def test_email_straddling_log_window_is_redacted():
+    doc = "x" * 150 + " " + "someone.with.a.long.name@example.com" + " tail" * 1000
+    summary = summarize_for_log(doc)
+    assert "someone" not in summary
+    assert "[EMAIL]" in summary
+    assert summary.endswith("...")
+
+
+def test_phone_glued_to_email_is_fully_redacted():
+    assert scrub_text("call 555 123 4567abc@x.com now") == "call [PHONE][EMAIL] now"
+
+
+def test_stream_matches_whole_payload():
+    rng = random.Random(3)
+    for _ in range(50):
+        doc = _random_document(rng, 200)
+        chunks, pos = [], 0
+        while pos < len(doc):
+            step = rng.randint(1, 17)
+            chunks.append(doc[pos:pos + step])
+            pos += step
+        assert "".join(scrub_stream(chunks)).strip() == _two_pass(doc)
+
+
+def test_stream_bounds_holdback_on_long_runs_without_whitespace():
+    run = "a1." * 100_000 + " mail ravi.k@example.com"
+    scrubber = StreamingScrubber()
+    out = []
+    for pos in range(0, len(run), 64):
+        out.append(scrubber.feed(run[pos:pos + 64]))
+        assert len(scrubber._pending) <= MAX_HOLDBACK
+    out.append(scrubber.flush())
+    text = "".join(out)
+    assert text.startswith("a1.a1.") and text.endswith(" mail [EMAIL]")
+    assert len(text) == len(run) - len("ravi.k@example.com") + len("[EMAIL]")
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from pocket_ai.ai.openai_gateway import openai_gateway
+from pocket_ai.core.config import RateLimit
+from pocket_ai.core.policy_engine import policy_engine
+from pocket_ai.core.rate_limiter import CloudLimiter, TokenBucket, cloud_rate_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_queues_callers_in_arrival_order():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)  # one per second, burst of 60
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    clock.now = 2.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    bucket.refund(1)  # e.g. a cancelled caller
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_concurrency_cap_queues_instead_of_failing():
+    limiter = CloudLimiter("test:model", RateLimit(requests_per_min=6000, max_concurrent=2))
+    peak = 0
+
+    async def call(i):
+        nonlocal peak
+        async with limiter.acquire():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.02)
+            return i
+
+    async def burst():
+        return await asyncio.gather(*(call(i) for i in range(6)))
+
+    assert asyncio.run(burst()) == list(range(6))
+    stats = limiter.stats()
+    assert peak == 2 and stats["calls"] == 6 and stats["delayed"] >= 4 and stats["max_wait_ms"] >= 20
+
+
+def test_token_budget_delays_then_settles_actual_usage():
+    limiter = CloudLimiter("test:model", RateLimit(requests_per_min=6000, tokens_per_min=600))
+
+    async def scenario():
+        async with limiter.acquire(600) as lease:
+            lease.settle(540)  # the provider reported less than estimated
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async with limiter.acquire(60):
+            return loop.time() - start
+
+    assert asyncio.run(scenario()) < 0.05
+    assert limiter.tokens.reserve(60) > 0
+
+
+def test_gateway_calls_share_the_model_limiter(openai_standin, monkeypatch):
+    monkeypatch.setattr(policy_engine, "can_use_cloud", lambda *_: True)
+    limiter = cloud_rate_limiter.limiter("openai", "gpt-4")
+    monkeypatch.setattr(limiter.limit, "max_concurrent", 1)
+    monkeypatch.setattr(limiter, "_semaphore", None)
+    calls_before = limiter.calls
+    openai_standin.script.extend([0.05, 0.05, 0.05])
+
+    async def burst():
+        return await asyncio.gather(
+            *(openai_gateway.chat_completion([{"role": "user", "content": f"q{i}"}]) for i in range(3))
+        )
+
+    answers = asyncio.run(burst())
+    assert all(answer.endswith(f"q{i}") for i, answer in enumerate(answers))
+    assert limiter.calls - calls_before == 3 and limiter.max_wait_ms >= 50
+    assert "openai:gpt-4" in cloud_rate_limiter.stats()
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from pocket_ai.ai.openai_gateway import openai_gateway
+from pocket_ai.ai.response_cache import ResponseCache
+from pocket_ai.core.config import get_config
+from pocket_ai.core.policy_engine import policy_engine
+from pocket_ai.core.storage import storage
+
+
+@pytest.fixture
+def cache_settings():
+    settings = get_config().llm_cache
+    saved = settings.model_copy()
+    yield settings
+    for field in ("enabled", "max_entries", "ttl_seconds", "persist"):
+        setattr(settings, field, getattr(saved, field))
+
+
+def _generate_counter():
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return f"answer {len(calls)}"
+
+    return calls, generate
+
+
+def test_normalised_prompt_hits_and_profile_partitions(cache_settings, monkeypatch):
+    cache = ResponseCache()
+    calls, generate = _generate_counter()
+
+    first = asyncio.run(cache.get_or_generate("phi-2", "Plan my  day", generate))
+    again = asyncio.run(cache.get_or_generate("phi-2", "Plan my day\n", generate))
+    assert first == again == "answer 1"
+
+    asyncio.run(cache.get_or_generate("gpt-4", "Plan my day", generate))
+    monkeypatch.setattr(get_config(), "profile", "HYBRID")
+    asyncio.run(cache.get_or_generate("phi-2", "Plan my day", generate))
+    assert len(calls) == 3
+
+
+def test_lru_bound_and_ttl(cache_settings):
+    cache_settings.max_entries = 2
+    cache = ResponseCache()
+    for prompt in ("a", "b", "c"):
+        cache.put("phi-2", prompt, f"resp {prompt}")
+    assert cache.get("phi-2", "a") is None
+    assert cache.get("phi-2", "c") == "resp c"
+
+    cache.put("phi-2", "short", "gone soon", ttl_seconds=-1)
+    assert cache.get("phi-2", "short") is None
+
+
+def test_persistent_tier_survives_restart(cache_settings):
+    cache_settings.persist = True
+    cache = ResponseCache()
+    cache.put("phi-2", "daily review", "cached review")
+
+    restarted = ResponseCache()
+    assert restarted.get("phi-2", "daily review") == "cached review"
+    assert "daily review" not in str(storage.list_keys("llm_cache"))
+    restarted.clear()
+    assert ResponseCache().get("phi-2", "daily review") is None
+
+
+def test_failed_generations_are_not_cached(cache_settings, monkeypatch):
+    cache = ResponseCache()
+    monkeypatch.setattr(openai_gateway, "api_key", None)  # the gateway used to answer "Error: No API key."
+
+    async def chat():
+        return await openai_gateway.chat_completion([{"role": "user", "content": "hi"}])
+
+    async def stream():
+        tokens = cache.stream_or_generate(
+            "gpt-4", "hi", lambda: openai_gateway.chat_completion_stream([{"role": "user", "content": "hi"}])
+        )
+        return [token async for token in tokens]
+
+    monkeypatch.setattr(policy_engine, "can_use_cloud", lambda *_: True)
+    assert asyncio.run(cache.get_or_generate("gpt-4", "hi", chat)) is None
+    assert asyncio.run(stream()) == []
+
+    async def broken():
+        raise RuntimeError("model crashed")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.get_or_generate("gpt-4", "hi", broken))
+    assert cache.stats()["entries"] == 0
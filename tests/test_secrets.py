@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from pocket_ai.core import config as config_module
+from pocket_ai.core.secrets_manager import SecretsManager
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("POCKET_STORAGE_PATH", str(tmp_path))
+    config_module._config_instance = None
+    config_module.load_config()
+    yield tmp_path
+    config_module._config_instance = None
+
+
+def test_batch_persists_once(store_dir, monkeypatch):
+    manager = SecretsManager()
+    writes = []
+    original = manager._persist
+    monkeypatch.setattr(manager, "_persist", lambda: (writes.append(1), original()))
+
+    with manager.batch():
+        manager.set_secret("a", "1")
+        manager.set_secret("b", "2")
+        manager.delete_secret("a")
+    assert len(writes) == 1
+    assert SecretsManager().list_secrets() == {"b": True}
+
+
+def test_batch_rolls_back_on_error(store_dir):
+    manager = SecretsManager()
+    manager.set_secret("keep", "yes")
+    with pytest.raises(RuntimeError):
+        with manager.batch():
+            manager.set_secret("keep", "no")
+            raise RuntimeError("boom")
+    assert manager.get_secret("keep") == "yes"
+
+
+def test_reload_picks_up_other_process_writes(store_dir):
+    server = SecretsManager()
+    server.reload_check_interval = 0
+    server.set_secret("local", "x")
+
+    cli = SecretsManager()
+    cli.set_secret("gmail_token", "fresh")
+    assert server.get_secret("gmail_token") == "fresh"
+    assert server.get_secret("local") == "x"
+
+
+def test_debounced_flush(store_dir):
+    manager = SecretsManager()
+    manager.set_flush_delay(0.05)
+    manager.set_secret("token", "v1")
+    manager.set_secret("token", "v2")
+    assert not (store_dir / "system" / "secrets.enc").exists()
+    time.sleep(0.2)
+    assert SecretsManager().get_secret("token") == "v2"
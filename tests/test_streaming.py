@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from pocket_ai.ai.local_llm import local_llm
+from pocket_ai.ai.openai_gateway import openai_gateway
+from pocket_ai.ai.orchestrator import emit_event, orchestrator
+from pocket_ai.core.config import get_config
+from pocket_ai.core.policy_engine import policy_engine
+from pocket_ai.tools.easy_tools_runtime import easy_tools
+from pocket_ai.ui.api import app
+
+
+def test_stream_yields_intent_before_result():
+    async def collect():
+        return [event async for event in orchestrator.stream_text_command("tell me a joke")]
+
+    events = asyncio.run(collect())
+    names = [event["event"] for event in events]
+    assert names[:2] == ["transcript", "intent"] and names[-1] == "result"
+    tokens = [event["token"] for event in events if event["event"] == "llm_token"]
+    assert len(tokens) > 1 and len(tokens) == len(names) - 3
+    assert events[-1]["response_text"] == "".join(tokens)
+    assert events[-1]["result"]["first_token_ms"] is not None
+
+
+def test_closing_stream_cancels_command(monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def slow_command(text):
+        emit_event("intent", intent={"type": "unknown"})
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(orchestrator, "_run_text_command", slow_command)
+
+    async def run():
+        events = orchestrator.stream_text_command("anything")
+        first = await events.__anext__()
+        await events.aclose()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return first
+
+    assert asyncio.run(run())["event"] == "intent"
+
+
+async def _fake_stream(text):
+    yield {"event": "intent", "intent": {"type": "unknown"}}
+    yield {"event": "result", "response_text": f"echo {text}"}
+
+
+def test_sse_and_websocket_endpoints(monkeypatch):
+    monkeypatch.setattr(get_config().api, "require_auth", False)
+    monkeypatch.setattr(orchestrator, "stream_text_command", _fake_stream)
+    client = TestClient(app)
+
+    resp = client.post("/command/stream", json={"text": "hi"})
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    frames = [line for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert json.loads(frames[-1][6:])["response_text"] == "echo hi"
+
+    with client.websocket_connect("/ws/command") as ws:
+        ws.send_json({"text": "hi"})
+        assert ws.receive_json()["event"] == "intent"
+        assert ws.receive_json()["response_text"] == "echo hi"
+
+
+def test_llm_streams_are_deterministic_and_join_to_the_completion(openai_standin):
+    async def collect():
+        local = [token async for token in local_llm.stream("plan my day please")]
+        cloud = [token async for token in openai_gateway._stream_chat([], "gpt-4")]
+        return local, cloud
+
+    local, cloud = asyncio.run(collect())
+    assert "".join(local) == local_llm.generate("plan my day please")
+    assert len(local) > 1 and asyncio.run(collect())[0] == local
+    assert "".join(cloud).strip() == "Stand-in gpt-4 reply to:"
+
+
+def test_easy_tool_reports_tokens_and_first_token_latency():
+    tokens = []
+    result = asyncio.run(easy_tools.execute_tool("summarize_text", {"user_text": "streaming"}, on_token=tokens.append))
+    assert result["status"] == "success"
+    assert "".join(tokens).strip() == result["result"]
+    assert result["first_token_ms"] is not None
+
+
+def test_cloud_stream_cut_off_midway_falls_back_and_is_not_cached(openai_standin, monkeypatch):
+    monkeypatch.setattr(policy_engine, "can_use_cloud", lambda *_: True)
+    openai_standin.script.extend(["cut", "cut"])
+    text = "what is the capital of peru"
+
+    async def collect():
+        return [event async for event in orchestrator.stream_text_command(text)]
+
+    for attempt in (1, 2):
+        events = asyncio.run(collect())
+        names = [event["event"] for event in events]
+        assert "llm_reset" in names
+        after_reset = names.index("llm_reset")
+        local_tokens = [event["token"] for event in events[after_reset:] if event["event"] == "llm_token"]
+        assert events[-1]["response_text"] == "".join(local_tokens).strip()
+        assert events[-1]["response_text"].startswith("Local Phi-2 Response")
+        assert openai_standin.requests == attempt  # the partial answer was never served from cache
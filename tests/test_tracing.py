@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+from pocket_ai.ai.orchestrator import orchestrator
+from pocket_ai.core.config import get_config
+from pocket_ai.core.tracing import Tracer, tracer
+from pocket_ai.mcp.server import mcp_server
+
+
+def test_spans_attach_to_active_trace_only():
+    local = Tracer()
+    with local.span("orphan"):
+        pass
+    with local.trace("request"):
+        with local.span("stage_a"):
+            pass
+    snapshot = local.snapshot()
+    assert set(snapshot["stages"]) == {"request", "stage_a"}
+    assert [span["stage"] for span in snapshot["recent"][0]["spans"]] == ["stage_a"]
+
+
+def test_disabled_tracer_records_nothing():
+    local = Tracer()
+    local.enabled = False
+    with local.trace("request"):
+        with local.span("stage_a"):
+            pass
+    assert local.snapshot()["stages"] == {}
+
+
+def test_orchestrator_stages_exposed_over_mcp():
+    get_config().mcp.require_auth = False
+    tracer.reset()
+    asyncio.run(orchestrator.process_text_command("tell me a joke"))
+    response = asyncio.run(
+        mcp_server.handle_request("tools/call", {"name": "assistant_latency", "arguments": {"limit": 1}})
+    )
+    payload = json.loads(response["content"][0]["text"])
+    for stage in ("text_command", "nlu_parse", "dispatch", "llm_fallback", "context_update", "tts"):
+        assert payload["stages"][stage]["count"] == 1
+    assert payload["recent"][0]["name"] == "text_command"